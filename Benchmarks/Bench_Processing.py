@@ -0,0 +1,633 @@
+import os
+import math
+import cv2
+import numpy as np
+import pandas as pd
+from functools import partial
+
+from Benchmarks.Synthetic import write_synthetic_avi, write_synthetic_session, synthetic_keyboard_events, SESSION_TIME_FORMAT, \
+    synthetic_openface_frame, synthetic_mouse_events
+from Benchmarks.Timing import Stopwatch, throughput
+
+
+def bench_decode(workdir, scale=1.0):
+    """
+    Decode throughput of a synthetic screen capture.
+
+    Measures plain sequential reading, sequential reading that only decodes
+    every 10th frame, and the reopen-and-seek pattern Screen_Process uses
+    for each OCR sample.
+    """
+    frames = max(int(600 * scale), 30)
+    frame_interval = 10
+    path = write_synthetic_avi(os.path.join(workdir, 'decode', 'screen_capture.avi'), frames)
+    results = {}
+
+    with Stopwatch() as watch:
+        capture = cv2.VideoCapture(path)
+        decoded = 0
+        while capture.read()[0]:
+            decoded += 1
+        capture.release()
+    results['sequential'] = throughput(decoded, watch.elapsed, 'frames')
+
+    with Stopwatch() as watch:
+        capture = cv2.VideoCapture(path)
+        decoded = 0
+        frame_idx = 0
+        while capture.grab():
+            if frame_idx % frame_interval == 0:
+                capture.retrieve()
+                decoded += 1
+            frame_idx += 1
+        capture.release()
+    results['sequential_sampled'] = throughput(decoded, watch.elapsed, 'frames')
+
+    with Stopwatch() as watch:
+        decoded = 0
+        for frame_idx in range(0, frames, frame_interval):
+            capture = cv2.VideoCapture(path)
+            capture.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+            if capture.read()[0]:
+                decoded += 1
+            capture.release()
+    results['reopen_seek_sampled'] = throughput(decoded, watch.elapsed, 'frames')
+
+    return results
+
+
+def bench_ocr(workdir, scale=1.0):
+    """
+    End-to-end Screen_Process throughput in OCR-sampled frames per second.
+
+    Skipped when EasyOCR and its models are not available.
+    """
+    try:
+        import easyocr  # noqa: F401
+    except Exception as e:
+        return {'skipped': f'easyocr unavailable: {e}'}
+
+    from Model_Files.Processing_Module.Screen_Process import Screen_Process
+    from Model_Files.Session_Catalog import Session_Catalog
+
+    duration_s = max(20 * scale, 2)
+    data_folder = os.path.join(workdir, 'ocr', 'Data')
+    write_synthetic_session(data_folder, duration_s=duration_s, keyboard=False, mouse=False, screen=True)
+    # Written straight to disk rather than saved by the recorder, so the catalog is told here
+    with Session_Catalog(data_folder) as catalog:
+        catalog.rescan()
+
+    frames = int(duration_s * 28.8)
+    sampled = math.ceil(frames / 10)
+    processor = Screen_Process()
+    with Stopwatch() as watch:
+        processor.process_screen_capture(data_folder)
+    return throughput(sampled, watch.elapsed, 'frames')
+
+
+def bench_ocr_inference(workdir, scale=1.0):
+    """
+    OCR speed and accuracy of each inference mode on the fixed text corpus.
+
+    Reports seconds per frame and character error rate for the fp32,
+    standard and int8 readers, with speedups relative to fp32. The int8
+    reader converts and caches its detector under workdir on first use.
+
+    Skipped when EasyOCR and its models are not available.
+    """
+    try:
+        import easyocr  # noqa: F401
+    except Exception as e:
+        return {'skipped': f'easyocr unavailable: {e}'}
+
+    from Model_Files.Processing_Module import OCR_Quantization
+
+    corpus = OCR_Quantization.text_corpus(max(int(8 * scale), 2), seed=1)
+    results = {'frames': len(corpus)}
+    for mode in ('fp32', 'standard', 'int8'):
+        if mode == 'int8':
+            reader = easyocr.Reader(['en'], gpu=False)
+            try:
+                reader.detector = OCR_Quantization.load_int8_detector(reader, os.path.join(workdir, 'quantized'))
+            except Exception as e:
+                results[mode] = {'error': f'{type(e).__name__}: {e}'}
+                continue
+        else:
+            reader = easyocr.Reader(['en'], gpu=False, quantize=mode == 'standard')
+
+        reader.readtext(corpus[0][0])  # Warm up
+        with Stopwatch() as watch:
+            cer = OCR_Quantization.character_error_rate(reader, corpus)
+        results[mode] = {'s_per_frame': watch.elapsed / len(corpus), 'cer': cer}
+
+    for mode in ('standard', 'int8'):
+        if 's_per_frame' in results.get(mode, {}):
+            results[mode]['speedup_vs_fp32'] = results['fp32']['s_per_frame'] / results[mode]['s_per_frame']
+    return results
+
+
+def bench_openface_sampling(workdir, scale=1.0):
+    """
+    Cost and fidelity of running OpenFace on every k-th webcam frame.
+
+    Measures writing the subsampled input with each method and mapping
+    sparse results back onto the original frames. Fidelity is the error of
+    the interpolated pose, gaze and AU intensity against full-rate synthetic
+    OpenFace rows. When the OpenFace binary is built, its wall time on the
+    full and subsampled video is measured too.
+    """
+    import subprocess
+    from Model_Files.Processing_Module.OpenFace_Sampling import write_subsampled_input, remap_openface_csv
+    from Model_Files.Processing_Module.Webcam_Process import Webcam_Process
+
+    fps = 28.8
+    frames = max(int(600 * scale), 60)
+    video = write_synthetic_avi(os.path.join(workdir, 'webcam_capture.avi'), frames, (640, 480), fps)
+    truth = synthetic_openface_frame(frames, fps)
+    features = [c for c in truth.columns if c.startswith(('pose_R', 'gaze_angle', 'AU')) and c.endswith(('_r', '_x', '_y', '_z'))]
+    results = {'frames': frames}
+
+    for stride in (3, 5):
+        entry = {}
+        for method in ('proxy_video', 'image_sequence'):
+            with Stopwatch() as watch:
+                write_subsampled_input(video, os.path.join(workdir, f'{method}_{stride}'), stride, method)
+            entry[f'{method}_write'] = throughput(frames, watch.elapsed, 'frames')
+
+        # OpenFace output for the kept frames, numbered as OpenFace numbers its input
+        csv_path = os.path.join(workdir, f'remap_{stride}', 'webcam_capture.csv')
+        sparse = truth.iloc[::stride].copy()
+        sparse['frame'] = np.arange(1, len(sparse) + 1)
+        os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+        with open(csv_path, 'w', newline='') as f:
+            f.write(', '.join(sparse.columns) + '\n')
+            sparse.to_csv(f, header=False, index=False, float_format='%.6g')
+        with Stopwatch() as watch:
+            remap_openface_csv(csv_path, stride, fps, frames, interpolate=True)
+        entry['remap'] = throughput(frames, watch.elapsed, 'frames')
+
+        dense = pd.read_csv(csv_path, skipinitialspace=True)
+        dense.columns = [c.strip() for c in dense.columns]
+        tracked = (truth['success'] == 1).to_numpy()
+        errors = np.abs(dense[features].to_numpy() - truth[features].to_numpy())[tracked]
+        spread = truth[features].to_numpy()[tracked].std(axis=0)
+        entry['interpolation_mae_over_std'] = float(np.mean(errors.mean(axis=0) / np.where(spread > 0, spread, 1)))
+        results[f'stride_{stride}'] = entry
+
+    executable = Webcam_Process().openface_exe_path
+    if os.path.exists(executable):
+        for label, stride in (('openface_full_s', 1), ('openface_stride_5_s', 5)):
+            arguments = ['-f', video]
+            if stride > 1:
+                arguments, _, _ = write_subsampled_input(video, os.path.join(workdir, 'openface_input'), stride)
+            with Stopwatch() as watch:
+                subprocess.run([executable, *arguments, '-out_dir', os.path.join(workdir, f'openface_{stride}'),
+                                '-2Dfp', '-3Dfp', '-pose', '-gaze', '-aus', '-pdmparams'], capture_output=True)
+            results[label] = watch.elapsed
+    else:
+        results['openface'] = f'skipped: {executable} not built'
+    return results
+
+
+def _state_coverage(samples, changes, frame_count, fps, min_duration_s=0.0):
+    # Fraction of screen states (the stretches between changes) seen by at least one sample,
+    # and the mean delay from a change to the first sample of the new state
+    bounds = np.concatenate([[0], changes, [frame_count]])
+    keep = np.diff(bounds) >= min_duration_s * fps
+    starts, stops = bounds[:-1][keep], bounds[1:][keep]
+    first = np.searchsorted(samples, starts)
+    seen = first < np.searchsorted(samples, stops)
+    delays = (samples[first[seen]] - starts[seen]) / fps
+    return float(seen.mean()), float(delays.mean()) if delays.size else None
+
+
+def _ocr_sampling_session(workdir, duration_s, seed):
+    # A session of typing bursts, clicks and scrolls between idle stretches, and the frames its screen changes at
+    from Model_Files.Processing_Module.OCR_Sampler import VIDEO_FPS
+
+    rng = np.random.default_rng(seed)
+    frame_count = int(duration_s * VIDEO_FPS)
+    start = pd.Timestamp('2025-01-01 09:00:00')
+    session = os.path.join(workdir, f'seed_{seed}', f"{start.strftime(SESSION_TIME_FORMAT)}_--_"
+                                    f"{(start + pd.Timedelta(seconds=duration_s)).strftime(SESSION_TIME_FORMAT)}")
+    os.makedirs(session, exist_ok=True)
+
+    keyboard, mouse, changes = [], [], []
+    t = rng.exponential(20)
+    while t < duration_s:
+        burst_s = rng.uniform(2, 8)
+        mouse.append({'time': start + pd.Timedelta(seconds=t), 'event': 'press'})
+        changes.append(t + 0.15)
+        if rng.random() < 0.6:
+            presses = synthetic_keyboard_events(int(burst_s * 8), start + pd.Timedelta(seconds=t + 0.5), rate_hz=8.0,
+                                                seed=int(rng.integers(1 << 31)))
+            keyboard.append(presses)
+            press_s = (presses.loc[presses['event'] == 'press', 'time'] - start).dt.total_seconds().to_numpy()
+            changes.extend(press_s[rng.random(press_s.size) < 0.3] + 0.1)
+        else:
+            for scroll_s in t + 0.5 + np.sort(rng.uniform(0, burst_s, int(burst_s * 3))):
+                mouse.append({'time': start + pd.Timedelta(seconds=scroll_s), 'event': 'scroll'})
+                changes.append(scroll_s + 0.1)
+        t += burst_s + rng.exponential(20)
+    changes.extend(rng.uniform(0, duration_s, int(duration_s / 90)))
+
+    # Short sessions may hold no typing burst, or no input at all
+    keyboard = pd.concat(keyboard) if keyboard else pd.DataFrame(columns=['time', 'key', 'event'])
+    mouse = pd.DataFrame(mouse, columns=['time', 'event'])
+    keyboard.sort_values('time').to_csv(os.path.join(session, 'keyboard_log.csv'), index=False)
+    mouse.sort_values('time').to_csv(os.path.join(session, 'mouse_log.csv'), index=False)
+    changes = np.unique(np.clip((np.asarray(changes) * VIDEO_FPS).astype(np.int64), 1, frame_count - 1))
+    return session, frame_count, changes
+
+
+def bench_ocr_sampling(workdir, scale=1.0, seeds=(0, 1, 2, 3, 4)):
+    """
+    Screen-change coverage of event-driven OCR sampling against every 10th frame.
+
+    Builds a session of typing bursts, clicks and scrolls separated by idle
+    stretches, where input causes screen changes shortly after and a few
+    changes happen while idle. Reports OCR calls, the fraction of screen
+    states sampled at least once (all, and those lasting a second or more)
+    and the mean delay from a change to its first sample, with the settings
+    of config.json. The coverage margin of 'events' over 'fixed' is also
+    reported for sessions drawn from several seeds. It depends on how the
+    session's changes line up with its input, so it is not guaranteed to be
+    positive; 'fixed' stays the default mode for that reason.
+    """
+    from Model_Files.Processing_Module.OCR_Sampler import ocr_sample_frames, VIDEO_FPS
+    import json
+    import Model_Files.Processing_Module as processing_module
+
+    with open(os.path.join(os.path.dirname(processing_module.__file__), 'config.json'), 'r') as f:
+        settings = {key: value for key, value in json.load(f).get('ocr_sampling', {}).items() if key != 'mode'}
+    duration_s = max(600 * scale, 60)
+    results = {'duration_s': duration_s}
+    margins = []
+    for seed in seeds:
+        session, frame_count, changes = _ocr_sampling_session(workdir, duration_s, seed)
+        coverage = {}
+        for mode in ('fixed', 'events'):
+            with Stopwatch() as watch:
+                samples = ocr_sample_frames(session, frame_count, mode=mode, **settings)
+            coverage[mode], delay = _state_coverage(samples, changes, frame_count, VIDEO_FPS)
+            coverage_1s, delay_1s = _state_coverage(samples, changes, frame_count, VIDEO_FPS, min_duration_s=1.0)
+            if seed == seeds[0]:
+                results['screen_changes'] = int(changes.size)
+                results[mode] = {
+                    'ocr_calls': int(samples.size),
+                    'state_coverage': coverage[mode],
+                    'state_coverage_over_1s': coverage_1s,
+                    'mean_change_delay_s': delay,
+                    'mean_change_delay_over_1s_s': delay_1s,
+                    'planning_s': watch.elapsed,
+                }
+        margins.append(coverage['events'] - coverage['fixed'])
+    results['ocr_call_ratio'] = results['events']['ocr_calls'] / results['fixed']['ocr_calls']
+    results['coverage_margin_per_seed'] = margins
+    results['min_coverage_margin'] = min(margins)
+    return results
+
+
+def bench_ocr_output_write(workdir, scale=1.0):
+    """
+    Write throughput of the indexed OCR output format.
+    """
+    from Model_Files.Processing_Module.OCR_Store import OCR_Writer
+
+    frames = max(int(20000 * scale), 100)
+    detections = 20
+    bbox = [[10, 10], [200, 10], [200, 40], [10, 40]]
+    with Stopwatch() as watch:
+        with OCR_Writer(os.path.join(workdir, 'ocr_write')) as writer:
+            for frame_idx in range(frames):
+                timestamp = frame_idx * 10 / 28.8
+                writer.write_frame(timestamp, [
+                    {'timestamp': timestamp, 'text': f'line {i}', 'confidence': 0.9, 'bbox': bbox}
+                    for i in range(detections)
+                ])
+    return throughput(frames * detections, watch.elapsed, 'records')
+
+
+def _stand_in_stage(units, session, threads=None):
+    # CPU-bound stand-in for a pipeline stage whose thread pool defaults to every core,
+    # using torch like EasyOCR when installed and OpenCV's parallel filters otherwise
+    try:
+        import torch
+    except ImportError:
+        torch = None
+
+    current = None
+    if torch is not None:
+        a = torch.rand(512, 512)
+    else:
+        frame = np.random.default_rng(0).integers(0, 256, (1080, 1920, 3), dtype=np.uint8)
+
+    for _ in range(units):
+        if threads is not None and threads.value != current:
+            current = threads.value
+            if torch is not None:
+                torch.set_num_threads(current)
+            else:
+                cv2.setNumThreads(current)
+        if torch is not None:
+            for _ in range(8):
+                a = torch.tanh(a @ a)
+        else:
+            cv2.GaussianBlur(frame, (31, 31), 0)
+
+
+def bench_cpu_governor(workdir, scale=1.0):
+    """
+    Total pipeline wall time with and without the CPU budget governor.
+
+    Runs an OCR-like and an OpenFace-like stand-in stage over synthetic
+    sessions through Stage_Scheduler. The free-for-all run matches the
+    pipeline without a governor: one task per stage at a time, each sizing
+    its thread pool to every core. The governed run splits the machine's
+    cores between the stages and rebalances as they finish.
+    """
+    from Model_Files.Stage_Scheduler import Stage, Stage_Scheduler
+    from Model_Files.Resource_Governor import Resource_Governor
+
+    sessions = []
+    for i in range(max(int(4 * scale), 2)):
+        sessions.append(os.path.join(workdir, f'session_{i}'))
+        os.makedirs(sessions[-1], exist_ok=True)
+    units = max(int(20 * scale), 4)
+
+    def stages(max_concurrency):
+        return [
+            Stage('ocr', partial(_stand_in_stage, units * 3), max_concurrency=max_concurrency, takes_threads=True),
+            Stage('openface', partial(_stand_in_stage, units), max_concurrency=max_concurrency, takes_threads=True),
+        ]
+
+    results = {'cores': os.cpu_count(), 'sessions': len(sessions)}
+
+    with Stopwatch() as watch:
+        Stage_Scheduler(stages(1), os.path.join(workdir, 'free_state.json')).run(sessions)
+    results['free_for_all_s'] = watch.elapsed
+
+    governor = Resource_Governor(weights={'ocr': 3, 'openface': 1}, min_threads={'ocr': 2, 'openface': 1})
+    with Stopwatch() as watch:
+        Stage_Scheduler(stages(governor.total_cores), os.path.join(workdir, 'governed_state.json'),
+                        max_workers=governor.total_cores, governor=governor).run(sessions)
+    results['governed_s'] = watch.elapsed
+
+    results['speedup'] = results['free_for_all_s'] / results['governed_s'] if results['governed_s'] > 0 else None
+    return results
+
+
+def bench_fusion(workdir, scale=1.0):
+    """
+    Time to fuse a long synthetic session onto the fixed-rate feature timeline.
+
+    The session has keyboard and mouse logs, frame-level OCR output and
+    OpenFace output for its whole length. Fusion is timed reading OpenFace
+    from its CSV and from the columnar store, and the rows per second count
+    every record of every stream.
+    """
+    from Model_Files.Processing_Module.OCR_Store import OCR_Writer
+    from Model_Files.Processing_Module.OpenFace_Store import convert_openface_csv
+    from Model_Files.Processing_Module.Feature_Fusion import fuse_session, load_features
+    from Benchmarks.Synthetic import write_synthetic_openface_csv
+
+    duration_s = max(int(3600 * scale), 120)
+    fps = 28.8
+    session = write_synthetic_session(os.path.join(workdir, 'fusion'), duration_s=duration_s)
+    name = os.path.basename(session)
+    csv_path = write_synthetic_openface_csv(os.path.join(workdir, 'fusion', 'Openface', name, 'webcam_capture.csv'),
+                                            int(duration_s * fps), fps)
+    ocr_frames = 0
+    with OCR_Writer(os.path.join(workdir, 'fusion', 'EasyOCR', name)) as writer:
+        for timestamp in np.arange(0, duration_s, 10 / fps):
+            writer.write_frame(float(timestamp), [
+                {'timestamp': float(timestamp), 'text': f'line {i}', 'confidence': 0.9, 'bbox': [[0, 0]]}
+                for i in range(5)
+            ])
+            ocr_frames += 1
+
+    rows = sum(len(pd.read_csv(os.path.join(session, log), usecols=['time']))
+               for log in ('keyboard_log.csv', 'mouse_log.csv')) + int(duration_s * fps) + ocr_frames * 5
+    results = {'duration_s': duration_s}
+
+    with Stopwatch() as watch:
+        output_dir = fuse_session(session)
+    results['openface_csv'] = throughput(rows, watch.elapsed, 'rows')
+
+    convert_openface_csv(csv_path)
+    with Stopwatch() as watch:
+        output_dir = fuse_session(session)
+    results['openface_store'] = throughput(rows, watch.elapsed, 'rows')
+
+    features = load_features(output_dir)
+    results['bins'], results['features'] = features.shape
+    results['output_bytes'] = os.path.getsize(os.path.join(output_dir, 'features.npy'))
+    return results
+
+
+def bench_mouse_kinematics(workdir, scale=1.0):
+    """
+    Rows per second of the mouse kinematics engine on a synthetic 1 kHz log.
+
+    Times the engine alone on in-memory chunks, with the per-second window
+    summary, and end to end from the CSV. Also checks that splitting the log
+    into chunks does not change the results.
+    """
+    from Model_Files.Processing_Module.Mouse_Kinematics import Mouse_Kinematics, Kinematic_Windows, \
+        mouse_kinematics, KINEMATICS_CHUNK_ROWS
+    from Model_Files.Processing_Module.Feature_Fusion import Timeline
+
+    rows = max(int(2000000 * scale), 20000)
+    events = synthetic_mouse_events(rows, pd.Timestamp('2025-01-01 09:00:00'), rate_hz=1000.0)
+    time_ns = events['time'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+    x = events['x'].to_numpy(dtype=np.float64)
+    y = events['y'].to_numpy(dtype=np.float64)
+    event = events['event'].to_numpy()
+    timeline = Timeline(int(time_ns[0]), int(time_ns[-1]) + 10**9, 1.0)
+    results = {'rows': len(events)}
+
+    def run(chunk_rows, windows=None):
+        kinematics = Mouse_Kinematics()
+        motion = []
+        for lo in range(0, len(time_ns), chunk_rows):
+            hi = lo + chunk_rows
+            result = kinematics.update(time_ns[lo:hi], x[lo:hi], y[lo:hi], event[lo:hi])
+            motion.append(result['motion'])
+            if windows is not None:
+                windows.add(result)
+        return pd.concat(motion, ignore_index=True)
+
+    with Stopwatch() as watch:
+        whole = run(len(time_ns))
+    results['engine'] = throughput(len(events), watch.elapsed, 'rows')
+
+    with Stopwatch() as watch:
+        chunked = run(KINEMATICS_CHUNK_ROWS // 5, Kinematic_Windows(timeline))
+    results['engine_chunked_windows'] = throughput(len(events), watch.elapsed, 'rows')
+    results['chunking_changes_results'] = not whole.equals(chunked)
+
+    csv_rows = min(len(events), max(int(500000 * scale), 20000))
+    path = os.path.join(workdir, 'mouse_log.csv')
+    os.makedirs(workdir, exist_ok=True)
+    events.iloc[:csv_rows].to_csv(path, index=False)
+    with Stopwatch() as watch:
+        for _ in mouse_kinematics(path):
+            pass
+    results['from_csv'] = throughput(csv_rows, watch.elapsed, 'rows')
+    return results
+
+
+def bench_keystroke_dynamics(workdir, scale=1.0):
+    """
+    Seconds per million events of the keystroke dynamics engine on a day-long synthetic log.
+
+    Times pairing and the per-keystroke measures alone on in-memory chunks,
+    with the per-second window summary, and end to end from the CSV. Also
+    checks that splitting the log into chunks does not change the results.
+    """
+    from Model_Files.Processing_Module.Keystroke_Dynamics import Keystroke_Dynamics, Keystroke_Windows, \
+        keystroke_dynamics, KEYSTROKE_CHUNK_ROWS
+    from Model_Files.Processing_Module.Feature_Fusion import Timeline
+
+    presses = max(int(500000 * scale), 10000)
+    events = synthetic_keyboard_events(presses, pd.Timestamp('2025-01-01 00:00:00'))
+    time_ns = events['time'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+    key = events['key'].to_numpy(dtype=object)
+    event = events['event'].to_numpy(dtype=object)
+    timeline = Timeline(int(time_ns[0]), int(time_ns[-1]) + 10**9, 1.0)
+    results = {'events': len(events), 'log_hours': (time_ns[-1] - time_ns[0]) / 3.6e12}
+
+    def run(chunk_rows, windows=None):
+        dynamics = Keystroke_Dynamics()
+        keystrokes = []
+        for lo in range(0, len(time_ns), chunk_rows):
+            keystrokes.append(dynamics.update(time_ns[lo:lo + chunk_rows], key[lo:lo + chunk_rows],
+                                              event[lo:lo + chunk_rows]))
+        keystrokes.append(dynamics.finish())
+        if windows is not None:
+            for chunk in keystrokes:
+                windows.add(chunk)
+            windows.columns()
+        return pd.concat(keystrokes, ignore_index=True)
+
+    with Stopwatch() as watch:
+        whole = run(len(time_ns))
+    results['engine'] = throughput(len(events), watch.elapsed, 'events')
+    results['engine']['s_per_million'] = watch.elapsed / len(events) * 1e6
+
+    with Stopwatch() as watch:
+        chunked = run(KEYSTROKE_CHUNK_ROWS // 5, Keystroke_Windows(timeline))
+    results['engine_chunked_windows'] = throughput(len(events), watch.elapsed, 'events')
+    results['engine_chunked_windows']['s_per_million'] = watch.elapsed / len(events) * 1e6
+    results['chunking_changes_results'] = not whole.equals(chunked)
+    results['keystrokes'] = len(whole)
+
+    path = os.path.join(workdir, 'keyboard_log.csv')
+    os.makedirs(workdir, exist_ok=True)
+    events.to_csv(path, index=False)
+    with Stopwatch() as watch:
+        for _ in keystroke_dynamics(path):
+            pass
+    results['from_csv'] = throughput(len(events), watch.elapsed, 'events')
+    return results
+
+
+def bench_openface_windows(workdir, scale=1.0):
+    """
+    Frames per second of the windowed OpenFace aggregation over a long synthetic session.
+
+    Times the single streamed pass from the CSV and from the columnar store,
+    checks that the chunk size does not change the windows, and records the
+    peak memory traced while streaming a session at two lengths, which should
+    stay flat as the session grows.
+    """
+    import tracemalloc
+    from Model_Files.Processing_Module.OpenFace_Store import convert_openface_csv
+    from Model_Files.Processing_Module.OpenFace_Windows import OpenFace_Windows, openface_windows, \
+        OPENFACE_CHUNK_ROWS
+    from Benchmarks.Synthetic import write_synthetic_openface_csv
+
+    fps = 28.8
+    frames = max(int(3600 * fps * scale), 20000)
+    results = {'frames': frames}
+
+    def stream(openface_dir):
+        return sum(len(windows) for windows in openface_windows(openface_dir))
+
+    peaks = {}
+    for share in (0.5, 1.0):
+        openface_dir = os.path.join(workdir, f'openface_{share:g}')
+        write_synthetic_openface_csv(os.path.join(openface_dir, 'webcam_capture.csv'), int(frames * share), fps)
+        convert_openface_csv(os.path.join(openface_dir, 'webcam_capture.csv'))
+        tracemalloc.start()
+        stream(openface_dir)
+        peaks[share] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    results['peak_mb_half_session'] = peaks[0.5] / 2**20
+    results['peak_mb_full_session'] = peaks[1.0] / 2**20
+
+    with Stopwatch() as watch:
+        results['windows'] = stream(openface_dir)
+    results['from_store'] = throughput(frames, watch.elapsed, 'frames')
+
+    os.rename(os.path.join(openface_dir, 'Columnar'), os.path.join(openface_dir, 'Columnar_off'))
+    with Stopwatch() as watch:
+        stream(openface_dir)
+    results['from_csv'] = throughput(frames, watch.elapsed, 'frames')
+
+    frame = pd.read_csv(os.path.join(openface_dir, 'webcam_capture.csv'), skipinitialspace=True)
+    frame.columns = [c.strip() for c in frame.columns]
+
+    def run(chunk_rows):
+        windows = OpenFace_Windows()
+        parts = [windows.update(frame.iloc[lo:lo + chunk_rows]) for lo in range(0, len(frame), chunk_rows)]
+        return pd.concat(parts + [windows.finish()], ignore_index=True)
+
+    whole = run(len(frame))
+    chunked = run(OPENFACE_CHUNK_ROWS // 7)
+    results['chunking_max_relative_change'] = float(np.nanmax(
+        np.abs(whole.to_numpy() - chunked.to_numpy()) / np.maximum(np.abs(whole.to_numpy()), 1e-12)))
+    return results
+
+
+def bench_cognitive_state(workdir, scale=1.0):
+    """
+    Windows per second of the online cognitive state estimator on a fused synthetic session.
+
+    Replays the session's feature timeline as fast as possible and reports
+    the multiple of real time, then paces a slice of it at a fixed multiple
+    to check the replay keeps time. Also checks that scoring the timeline in
+    two calls, as a live feed would, gives the same estimates as one call.
+    """
+    from Model_Files.Processing_Module.Feature_Fusion import fuse_session, load_features
+    from Model_Files.Processing_Module.Cognitive_State import Cognitive_State_Estimator, replay_states
+    from Benchmarks.Synthetic import write_synthetic_openface_csv
+
+    duration_s = max(int(3600 * scale), 300)
+    fps = 28.8
+    session = write_synthetic_session(os.path.join(workdir, 'states'), duration_s=duration_s)
+    write_synthetic_openface_csv(os.path.join(workdir, 'states', 'Openface', os.path.basename(session),
+                                              'webcam_capture.csv'), int(duration_s * fps), fps)
+    features = load_features(fuse_session(session))
+    results = {'windows': len(features), 'features': features.shape[1]}
+
+    with Stopwatch() as watch:
+        whole = replay_states(features)
+    results['replay'] = throughput(len(features), watch.elapsed, 'windows')
+    results['replay']['times_real_time'] = duration_s / watch.elapsed
+    results['replay']['us_per_window'] = watch.elapsed / len(features) * 1e6
+
+    estimator = Cognitive_State_Estimator(features.columns)
+    half = len(features) // 2
+    split = pd.concat([replay_states(features.iloc[:half], estimator), replay_states(features.iloc[half:], estimator)])
+    results['incremental_matches_batch'] = bool(np.allclose(whole.to_numpy(), split.to_numpy(), equal_nan=True))
+
+    speed = 600.0
+    paced = features.iloc[:min(len(features), 1200)]
+    with Stopwatch() as watch:
+        replay_states(paced, speed=speed)
+    scheduled_s = (len(paced) - 1) / speed
+    results['paced'] = {'speed': speed, 'scheduled_s': scheduled_s, 'elapsed_s': watch.elapsed,
+                        'lag_s': watch.elapsed - scheduled_s}
+    results['mean_states'] = whole[['working_memory', 'stress', 'attention', 'emotion']].mean().round(3).to_dict()
+    return results
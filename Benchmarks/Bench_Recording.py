@@ -0,0 +1,240 @@
+import os
+import time
+import threading
+import cv2
+import numpy as np
+import pandas as pd
+
+from Benchmarks.Synthetic import Stand_In_Screen, Stand_In_Pointer, Stand_In_Listener, Stand_In_Pipe
+from Recording_Module.Recorders.Capture_Sources import Synthetic_Source
+from Benchmarks.Timing import Stopwatch, summarize_latencies, throughput
+
+
+def bench_screen_stages(workdir, scale=1.0):
+    """
+    Per-stage latency of the screen recording loop on synthetic 1080p frames.
+
+    Runs the same grab, color conversion, resize, cursor overlay and encode
+    steps as Screen_Handler and times each one separately.
+    """
+    from Recording_Module.Recorders.Screen_Handler import Screen_Handler
+
+    handler = Screen_Handler()
+    frames = max(int(300 * scale), 20)
+    screen = Stand_In_Screen((1920, 1080))
+    pointer = Stand_In_Pointer(handler.resolution)
+    path = os.path.join(workdir, 'screen_stages', 'screen_capture.avi')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    output = cv2.VideoWriter(path, handler.codec, handler.fps, handler.resolution)
+
+    stages = {name: [] for name in ('grab', 'convert', 'resize', 'cursor', 'encode', 'total')}
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        frame = np.array(screen.grab(screen.monitors[0]))
+        t1 = time.perf_counter()
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+        t2 = time.perf_counter()
+        resized_frame = cv2.resize(frame, handler.resolution, interpolation=cv2.INTER_AREA)
+        t3 = time.perf_counter()
+        cv2.circle(resized_frame, pointer.position(), 5, (0, 0, 255), -1)
+        t4 = time.perf_counter()
+        output.write(resized_frame)
+        t5 = time.perf_counter()
+        for name, start, end in (('grab', t0, t1), ('convert', t1, t2), ('resize', t2, t3),
+                                 ('cursor', t3, t4), ('encode', t4, t5), ('total', t0, t5)):
+            stages[name].append(end - start)
+    output.release()
+
+    return {name: summarize_latencies(values) for name, values in stages.items()}
+
+
+def _record_for(handler, duration_s, save_dir):
+    """
+    Run a video handler's recording loop in-process for a fixed duration.
+
+    Returns:
+        float: Elapsed wall time in seconds
+    """
+    # trigger_listener would normally pick the folder the recording is written to
+    handler.capture_dir = save_dir
+    os.makedirs(save_dir, exist_ok=True)
+    stop_event = threading.Event()
+    timer = threading.Timer(duration_s, stop_event.set)
+    timer.start()
+    try:
+        with Stopwatch() as watch:
+            handler._run_listener(stop_event, Stand_In_Pipe(save_dir))
+    finally:
+        timer.cancel()
+    return watch.elapsed
+
+
+def bench_screen_handler(workdir, scale=1.0):
+    """
+    Sustained frame rate of Screen_Handler's own recording loop, fed by an
+    unpaced synthetic 1080p source.
+    """
+    from Recording_Module.Recorders.Screen_Handler import Screen_Handler
+
+    source = Synthetic_Source((1920, 1080), fps=None)
+    handler = Screen_Handler(source=source)
+    elapsed = _record_for(handler, max(10 * scale, 1), os.path.join(workdir, 'screen_handler'))
+    return {**throughput(source.frames_read, elapsed, 'frames'),
+            'listener_errors': handler.poll_metrics().get('counters', {}).get('listener_errors', 0)}
+
+
+def bench_capture_stress(workdir, scale=1.0):
+    """
+    Sustained fps and dropped frames of both video handlers fed by a paced
+    synthetic 4K/60 source, the worst case for the encode path.
+    """
+    from Recording_Module.Recorders.Screen_Handler import Screen_Handler
+    from Recording_Module.Recorders.Webcam_Handler import Webcam_Handler
+
+    duration_s = max(10 * scale, 1)
+    results = {}
+    for name, handler_class in (('screen', Screen_Handler), ('webcam', Webcam_Handler)):
+        source = Synthetic_Source((3840, 2160), fps=60)
+        handler = handler_class(source=source)
+        elapsed = _record_for(handler, duration_s, os.path.join(workdir, name))
+        offered = source.frames_read + source.dropped
+        results[name] = {
+            'target_fps': source.fps,
+            'resolution': list(source.resolution),
+            **throughput(source.frames_read, elapsed, 'frames'),
+            'dropped': source.dropped,
+            'drop_rate': source.dropped / offered if offered else None,
+            'latencies': handler.poll_metrics().get('histograms', {}),
+            'listener_errors': handler.latest_metrics.get('counters', {}).get('listener_errors', 0),
+        }
+    return results
+
+
+def _replay_listener(events, stop_event):
+    return type('Replay_Listener', (Stand_In_Listener,), {'events': events, 'stop_event': stop_event})
+
+
+def bench_input_handlers(workdir, scale=1.0):
+    """
+    Callback cost and log write throughput of the keyboard and mouse handlers.
+
+    Synthetic events are replayed through each handler's real callbacks by a
+    stand-in listener; the handler then saves its CSV as it would on stop.
+    """
+    from Recording_Module.Recorders import Keyboard_Mouse_Handler as input_module
+
+    count = max(int(200000 * scale), 1000)
+    key = type('Key', (), {'char': 'a'})()
+    keyboard_events = [('on_press' if i % 2 == 0 else 'on_release', (key,)) for i in range(count)]
+    mouse_events = [('on_move', (i % 1920, i % 1080)) for i in range(count)]
+
+    results = {}
+    for name, handler, module_attr, events in (
+            ('keyboard', input_module.Keyboard_Handler(), 'keyboard', keyboard_events),
+            ('mouse', input_module.Mouse_Handler(), 'mouse', mouse_events)):
+        stop_event = threading.Event()
+        save_dir = os.path.join(workdir, f'{name}_handler')
+        original = getattr(input_module, module_attr)
+        setattr(input_module, module_attr, type('Stand_In', (), {'Listener': _replay_listener(events, stop_event)}))
+        try:
+            with Stopwatch() as watch:
+                handler._run_listener(stop_event, Stand_In_Pipe(save_dir))
+        finally:
+            setattr(input_module, module_attr, original)
+        results[name] = throughput(len(events), watch.elapsed, 'events')
+
+    return results
+
+
+def bench_log_write(workdir, scale=1.0):
+    """
+    CSV write throughput of the input handlers' _save_log.
+    """
+    from Recording_Module.Recorders.Keyboard_Mouse_Handler import Mouse_Handler
+
+    rows = max(int(500000 * scale), 1000)
+    now = pd.Timestamp.now()
+    log_data = [{'time': now, 'x': i % 1920, 'y': i % 1080, 'event': 'move'} for i in range(rows)]
+    with Stopwatch() as watch:
+        Mouse_Handler()._save_log(log_data, os.path.join(workdir, 'log_write'), 'mouse_log.csv')
+    return throughput(rows, watch.elapsed, 'rows')
+
+
+def bench_handler_start(workdir, scale=1.0):
+    """
+    Latency from Screen_Handler.trigger_listener('start') to the first captured
+    frame, over back-to-back sessions, for each available process start method.
+
+    The first session of each method includes any one-off cost such as
+    booting the fork server; later sessions show the steady state.
+    """
+    import multiprocessing
+    from Recording_Module.Recorders.Screen_Handler import Screen_Handler
+    from Common_Module.Process_Context import handler_context, warm_up
+
+    sessions = max(int(5 * scale), 3)
+    results = {}
+    default_method = handler_context().get_start_method()
+    try:
+        for method in multiprocessing.get_all_start_methods():
+            handler_context(method)
+            warm_start = time.perf_counter()
+            warm_up()
+            warm_up_s = time.perf_counter() - warm_start
+
+            handler = Screen_Handler(source=Synthetic_Source((320, 240), fps=None))
+            # Publish on every frame so the first one is seen as soon as it is captured
+            handler.metrics_interval = 0.0
+            latencies = []
+            for session in range(sessions):
+                start = time.perf_counter()
+                handler.trigger_listener('start', os.path.join(workdir, method, str(session)))
+                while not handler.poll_metrics().get('counters', {}).get('frames_captured'):
+                    if time.perf_counter() - start > 30:
+                        handler.shutdown()
+                        raise RuntimeError(f"No frame captured within 30s using '{method}'")
+                    time.sleep(0.001)
+                latencies.append(time.perf_counter() - start)
+                handler.trigger_listener('stop', os.path.join(workdir, method, str(session)))
+
+            results[method] = {
+                'warm_up_s': warm_up_s,
+                'first_session_ms': latencies[0] * 1e3,
+                'later_sessions': summarize_latencies(latencies[1:]),
+            }
+    finally:
+        handler_context(default_method)
+    return results
+
+
+def bench_session_replay(workdir, scale=1.0):
+    """
+    Maximum event rate and timing error of the session replay engine.
+
+    A synthetic session is replayed as fast as possible into the in-process
+    sink, which gives the highest sustainable event rate, then paced at 1x
+    over a slice of it and at higher multiples over all of it, reporting how
+    late events were delivered and how far each replay ended from schedule.
+    The replayed logs are saved and read back to check nothing was lost.
+    """
+    from Benchmarks.Synthetic import write_synthetic_session
+    from Recording_Module.Session_Replay import Session_Replay, In_Process_Sink, iter_replay_events
+
+    duration_s = max(int(600 * scale), 20)
+    session = write_synthetic_session(os.path.join(workdir, 'replay'), duration_s=duration_s)
+    events = list(iter_replay_events(session))
+    results = {'events': len(events), 'recorded_span_s': duration_s}
+
+    sink = In_Process_Sink()
+    results['max'] = Session_Replay([sink], speed=None).run(events)
+    sink.save(os.path.join(workdir, 'replayed'))
+    replayed = sum(len(pd.read_csv(os.path.join(workdir, 'replayed', log)))
+                   for log in ('keyboard_log.csv', 'mouse_log.csv'))
+    results['events_lost'] = len(events) - replayed
+
+    # Real time over a few seconds, then the whole session at multiples that keep each run short
+    cutoff = events[0].time_ns + int(5e9)
+    results['1x'] = Session_Replay([In_Process_Sink()], speed=1.0).run([e for e in events if e.time_ns <= cutoff])
+    for speed in (duration_s / 5.0, duration_s / 1.0):
+        results[f'{speed:g}x'] = Session_Replay([In_Process_Sink()], speed=speed).run(events)
+    return results
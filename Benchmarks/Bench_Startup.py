@@ -0,0 +1,81 @@
+import os
+import sys
+import json
+import time
+import subprocess
+
+from Profiling_Module.Import_Report import measure_imports, REPO_DIR, UI_DIR, HEAVY_MODULES
+
+
+# Time from launching the interpreter to the first drawn window that the app must stay under
+STARTUP_BUDGET_S = 1.5
+
+# Runs in a fresh interpreter; prints one JSON line with its wall-clock milestones
+STARTUP_SCRIPT = '''
+import sys, time, json
+imported = None
+window = None
+error = None
+try:
+    import Main_App
+    imported = time.time()
+    import tkinter as tk
+    root = tk.Tk()
+    Main_App.AppUI(root)
+    root.update()
+    window = time.time()
+    root.destroy()
+except Exception as e:
+    error = f"{type(e).__name__}: {e}"
+print(json.dumps({"imported": imported, "window": window, "error": error,
+                  "heavy_loaded": [m for m in HEAVY if m in sys.modules]}))
+'''
+
+
+def bench_startup(workdir, scale=1.0):
+    """
+    Time to the first Main_App window on a cold interpreter.
+
+    Each run launches a new interpreter, imports Main_App, builds the window
+    and draws it once. Times are measured from just before launch, so they
+    include interpreter startup. Without a display the window cannot be
+    created and only the import time is reported. Fails when the median
+    exceeds STARTUP_BUDGET_S or any of HEAVY_MODULES is loaded at startup.
+    """
+    runs = max(int(5 * scale), 3)
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [UI_DIR, REPO_DIR, env.get('PYTHONPATH')]))
+    script = f'HEAVY = {list(HEAVY_MODULES)!r}\n' + STARTUP_SCRIPT
+
+    imports, windows, heavy, error = [], [], set(), None
+    for _ in range(runs):
+        launched = time.time()
+        result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                                cwd=REPO_DIR, env=env)
+        if result.returncode != 0 or not result.stdout.strip():
+            raise RuntimeError(f"Startup run failed:\n{result.stderr[-2000:]}")
+        milestones = json.loads(result.stdout.strip().splitlines()[-1])
+        heavy.update(milestones['heavy_loaded'])
+        error = milestones['error']
+        if milestones['imported'] is not None:
+            imports.append(milestones['imported'] - launched)
+        if milestones['window'] is not None:
+            windows.append(milestones['window'] - launched)
+
+    median = lambda values: float(sorted(values)[len(values) // 2]) if values else None
+    slowest = sorted(measure_imports('Main_App'), key=lambda entry: entry['cumulative_us'], reverse=True)
+    report = {
+        'runs': runs,
+        'budget_s': STARTUP_BUDGET_S,
+        'import_s': median(imports),
+        'first_window_s': median(windows),
+        'window_error': error if not windows else None,
+        'heavy_modules_loaded': sorted(heavy),
+        'slowest_imports_ms': {entry['module']: entry['cumulative_us'] / 1e3 for entry in slowest[1:11]},
+    }
+
+    measured = report['first_window_s'] if windows else report['import_s']
+    assert not heavy, f"Heavy modules imported before the first window: {sorted(heavy)}"
+    assert measured is not None and measured <= STARTUP_BUDGET_S, \
+        f"Startup took {measured:.2f}s, over the {STARTUP_BUDGET_S}s budget"
+    return report
@@ -0,0 +1,115 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import datetime
+import subprocess
+import traceback
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Benchmarks.Synthetic import install_stand_in_modules
+
+# Headless boxes have no display for pyautogui or pynput, so stand-ins are registered before any recorder import
+STAND_INS = install_stand_in_modules()
+
+from Benchmarks import Bench_Processing, Bench_Recording, Bench_Startup
+
+
+BENCHMARKS = {
+    'decode': Bench_Processing.bench_decode,
+    'ocr': Bench_Processing.bench_ocr,
+    'ocr_inference': Bench_Processing.bench_ocr_inference,
+    'openface_sampling': Bench_Processing.bench_openface_sampling,
+    'ocr_sampling': Bench_Processing.bench_ocr_sampling,
+    'ocr_output_write': Bench_Processing.bench_ocr_output_write,
+    'cpu_governor': Bench_Processing.bench_cpu_governor,
+    'fusion': Bench_Processing.bench_fusion,
+    'mouse_kinematics': Bench_Processing.bench_mouse_kinematics,
+    'keystroke_dynamics': Bench_Processing.bench_keystroke_dynamics,
+    'openface_windows': Bench_Processing.bench_openface_windows,
+    'cognitive_state': Bench_Processing.bench_cognitive_state,
+    'screen_stages': Bench_Recording.bench_screen_stages,
+    'screen_handler': Bench_Recording.bench_screen_handler,
+    'capture_stress': Bench_Recording.bench_capture_stress,
+    'handler_start': Bench_Recording.bench_handler_start,
+    'input_handlers': Bench_Recording.bench_input_handlers,
+    'log_write': Bench_Recording.bench_log_write,
+    'session_replay': Bench_Recording.bench_session_replay,
+    'startup': Bench_Startup.bench_startup,
+}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_benchmarks(names=None, scale=1.0):
+    """
+    Run benchmarks in a scratch folder and collect their results.
+
+    Args:
+        names (list, optional): Benchmarks to run; all of them by default
+        scale (float): Multiplier for the amount of synthetic work
+
+    Returns:
+        dict: 'meta' describing the run and 'results' keyed by benchmark name
+    """
+    names = names or list(BENCHMARKS)
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'scale': scale,
+            'stand_ins': STAND_INS,
+        },
+        'results': {},
+    }
+
+    workdir = tempfile.mkdtemp(prefix='cognitive_modeler_bench_')
+    try:
+        for name in names:
+            print(f"⏱  Running benchmark: {name}", file=sys.stderr)
+            start = time.perf_counter()
+            try:
+                result = BENCHMARKS[name](os.path.join(workdir, name), scale)
+            except Exception as e:
+                result = {'error': f'{type(e).__name__}: {e}', 'traceback': traceback.format_exc()}
+            result['wall_s'] = time.perf_counter() - start
+            report['results'][name] = result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run component microbenchmarks on synthetic inputs.')
+    parser.add_argument('-only', nargs='+', choices=list(BENCHMARKS), help='Benchmarks to run (default: all)')
+    parser.add_argument('-scale', type=float, default=1.0, help='Multiplier for the amount of synthetic work')
+    parser.add_argument('-output', help='Write the JSON report to this file instead of stdout')
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.only, args.scale)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+        print(f"💾 Saved benchmark report to: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+import os
+import sys
+import types
+import threading
+import cv2
+import numpy as np
+import pandas as pd
+
+
+SESSION_TIME_FORMAT = '%Y-%m-%d_%H-%M-%S'
+
+SAMPLE_WORDS = [
+    'attention', 'memory', 'stress', 'emotion', 'keyboard', 'cursor', 'session',
+    'window', 'editor', 'terminal', 'browser', 'document', 'model', 'capture',
+]
+
+
+def synthetic_text_frame(frame_idx, resolution, lines=12, change_every=90):
+    """
+    Render a frame of dark text on a light background.
+
+    The text block changes every change_every frames and one line scrolls
+    every frame, so OCR and change detection both have work to do.
+
+    Args:
+        frame_idx (int): Index of the frame in the video
+        resolution (tuple): (width, height)
+        lines (int): Number of text lines to draw
+        change_every (int): Frames between changes of the text block
+
+    Returns:
+        numpy.ndarray: BGR frame
+    """
+    width, height = resolution
+    frame = np.full((height, width, 3), 235, dtype=np.uint8)
+    rng = np.random.default_rng(frame_idx // change_every)
+    line_height = max(height // (lines + 1), 12)
+    scale = line_height / 30
+    for line in range(lines):
+        words = rng.choice(SAMPLE_WORDS, size=4)
+        y = (line + 1) * line_height
+        x = 10 + (frame_idx * 3 % 40 if line == 0 else 0)
+        cv2.putText(frame, ' '.join(words), (x, y), cv2.FONT_HERSHEY_SIMPLEX, scale, (20, 20, 20), 1, cv2.LINE_AA)
+    return frame
+
+
+def write_synthetic_avi(path, frames, resolution=(1280, 720), fps=28.8):
+    """
+    Write a synthetic XVID screen capture like the one Screen_Handler produces.
+
+    Args:
+        path (str): Output .avi path
+        frames (int): Number of frames to write
+        resolution (tuple): (width, height)
+        fps (float): Nominal frame rate stored in the container
+
+    Returns:
+        str: The output path
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"XVID"), fps, resolution)
+    if not writer.isOpened():
+        raise RuntimeError(f'Could not open VideoWriter for {path}')
+    for frame_idx in range(frames):
+        writer.write(synthetic_text_frame(frame_idx, resolution))
+    writer.release()
+    return path
+
+
+def synthetic_keyboard_events(count, start, rate_hz=8.0, seed=0):
+    """
+    Generate keyboard_log rows: press/release pairs at a typing-like rate.
+
+    Args:
+        count (int): Number of key presses (rows are twice this)
+        start (pandas.Timestamp): Time of the first press
+        rate_hz (float): Mean presses per second
+        seed (int): Random seed
+
+    Returns:
+        pandas.DataFrame: Columns time, key, event, as Keyboard_Handler writes them
+    """
+    rng = np.random.default_rng(seed)
+    gaps = rng.exponential(1.0 / rate_hz, size=count)
+    press_times = start + pd.to_timedelta(np.cumsum(gaps), unit='s')
+    dwell = pd.to_timedelta(np.clip(rng.normal(0.09, 0.03, size=count), 0.02, None), unit='s')
+    keys = rng.choice(list('etaoinshrdlu ') + ['Key.backspace', 'Key.space'], size=count)
+
+    presses = pd.DataFrame({'time': press_times, 'key': keys, 'event': 'press'})
+    releases = pd.DataFrame({'time': press_times + dwell, 'key': keys, 'event': 'release'})
+    return pd.concat([presses, releases]).sort_values('time', kind='stable').reset_index(drop=True)
+
+
+def synthetic_mouse_events(count, start, rate_hz=120.0, resolution=(1920, 1080), seed=0):
+    """
+    Generate mouse_log rows: a smooth random walk with occasional clicks and scrolls.
+
+    Args:
+        count (int): Number of rows
+        start (pandas.Timestamp): Time of the first event
+        rate_hz (float): Mean events per second
+        resolution (tuple): Screen size bounding the cursor
+        seed (int): Random seed
+
+    Returns:
+        pandas.DataFrame: Columns time, x, y, event, button, scroll_dx, scroll_dy,
+                          as Mouse_Handler writes them
+    """
+    rng = np.random.default_rng(seed)
+    times = start + pd.to_timedelta(np.cumsum(rng.exponential(1.0 / rate_hz, size=count)), unit='s')
+    velocity = np.cumsum(rng.normal(0, 2.0, size=(count, 2)), axis=0) * 0.1
+    position = np.cumsum(velocity, axis=0) + np.array(resolution) / 2
+    # Reflect the walk back inside the screen
+    span = np.array(resolution) - 1
+    folded = position % (2 * span)
+    position = np.where(folded > span, 2 * span - folded, folded)
+
+    kind = rng.choice(['move', 'press', 'scroll'], size=count, p=[0.97, 0.02, 0.01])
+    frame = pd.DataFrame({
+        'time': times,
+        'x': position[:, 0].astype(int),
+        'y': position[:, 1].astype(int),
+        'event': kind,
+        'button': np.where(kind == 'press', 'Button.left', None),
+        'scroll_dx': np.where(kind == 'scroll', 0, np.nan),
+        'scroll_dy': np.where(kind == 'scroll', rng.choice([-1, 1], size=count), np.nan),
+    })
+
+    # Every press is followed shortly by its release
+    releases = frame[frame['event'] == 'press'].copy()
+    releases['event'] = 'release'
+    releases['time'] = releases['time'] + pd.Timedelta(milliseconds=80)
+    return pd.concat([frame, releases]).sort_values('time', kind='stable').reset_index(drop=True)
+
+
+OPENFACE_AUS = ['01', '02', '04', '05', '06', '07', '09', '10', '12', '14', '15', '17', '20', '23', '25', '26', '45']
+
+
+def synthetic_openface_frame(frames, fps=28.8, seed=0):
+    """
+    Generate FeatureExtraction-style rows with smooth head, gaze and AU signals.
+
+    Covers the meta, gaze, pose, 2D landmark and AU columns, with occasional
+    tracking failures, so consumers of OpenFace output have realistic input.
+
+    Args:
+        frames (int): Number of rows, one per video frame
+        fps (float): Video frame rate used for the timestamps
+        seed (int): Random seed
+
+    Returns:
+        pandas.DataFrame: OpenFace columns without the leading spaces
+    """
+    rng = np.random.default_rng(seed)
+
+    def smooth(columns, scale, offset=0.0):
+        # Random walk low-pass filtered to about a second
+        walk = np.cumsum(rng.normal(0, scale, size=(frames, columns)), axis=0)
+        kernel = np.ones(int(fps)) / int(fps)
+        return np.stack([np.convolve(walk[:, i], kernel, mode='same') for i in range(columns)], axis=1) + offset
+
+    success = (rng.random(frames) > 0.02).astype(int)
+    columns = {
+        'frame': np.arange(1, frames + 1),
+        'face_id': np.zeros(frames, dtype=int),
+        'timestamp': np.round(np.arange(frames) / fps, 3),
+        'confidence': np.where(success == 1, np.clip(rng.normal(0.95, 0.03, frames), 0, 1), 0.0),
+        'success': success,
+    }
+    gaze = smooth(8, 0.01)
+    for i, name in enumerate(['gaze_0_x', 'gaze_0_y', 'gaze_0_z', 'gaze_1_x', 'gaze_1_y', 'gaze_1_z',
+                              'gaze_angle_x', 'gaze_angle_y']):
+        columns[name] = gaze[:, i]
+    pose = smooth(6, 0.2, np.array([0, 0, 500, 0, 0, 0]))
+    for i, name in enumerate(['pose_Tx', 'pose_Ty', 'pose_Tz', 'pose_Rx', 'pose_Ry', 'pose_Rz']):
+        columns[name] = pose[:, i] * (0.01 if i >= 3 else 1)
+    landmarks = smooth(136, 0.3) + np.tile(rng.uniform(200, 400, 136), (frames, 1))
+    for i in range(68):
+        columns[f'x_{i}'] = landmarks[:, i]
+    for i in range(68):
+        columns[f'y_{i}'] = landmarks[:, 68 + i]
+    intensity = np.clip(smooth(len(OPENFACE_AUS), 0.05), 0, 5)
+    for i, au in enumerate(OPENFACE_AUS):
+        columns[f'AU{au}_r'] = intensity[:, i]
+    for i, au in enumerate(OPENFACE_AUS):
+        columns[f'AU{au}_c'] = (intensity[:, i] > 1).astype(int)
+
+    frame = pd.DataFrame(columns)
+    features = frame.columns[5:]
+    frame.loc[success == 0, features] = 0
+    return frame
+
+
+def write_synthetic_openface_csv(path, frames, fps=28.8, seed=0):
+    """
+    Write synthetic rows as OpenFace does, with ', ' separated columns.
+
+    Returns:
+        str: The output path
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    frame = synthetic_openface_frame(frames, fps, seed)
+    with open(path, 'w', newline='') as f:
+        f.write(', '.join(frame.columns) + '\n')
+        frame.to_csv(f, header=False, index=False, float_format='%.6g')
+    return path
+
+
+def write_synthetic_session(data_folder, duration_s=60, start='2025-01-01 09:00:00',
+                            keyboard=True, mouse=True, screen=False, webcam=False,
+                            resolution=(1280, 720), fps=28.8, seed=0):
+    """
+    Create a recording session folder with synthetic streams.
+
+    Args:
+        data_folder (str): Data folder that receives the 'start_--_stop' session folder
+        duration_s (float): Session length in seconds
+        start (str): Session start time
+        keyboard, mouse, screen, webcam (bool): Which streams to write
+        resolution (tuple): Video resolution for screen and webcam captures
+        fps (float): Video frame rate
+        seed (int): Random seed
+
+    Returns:
+        str: Path to the session folder
+    """
+    start = pd.Timestamp(start)
+    stop = start + pd.Timedelta(seconds=duration_s)
+    session = os.path.join(data_folder, f'{start.strftime(SESSION_TIME_FORMAT)}_--_{stop.strftime(SESSION_TIME_FORMAT)}')
+    os.makedirs(session, exist_ok=True)
+
+    if keyboard:
+        events = synthetic_keyboard_events(int(duration_s * 5), start, seed=seed)
+        events[events['time'] < stop].to_csv(os.path.join(session, 'keyboard_log.csv'), index=False)
+    if mouse:
+        events = synthetic_mouse_events(int(duration_s * 60), start, rate_hz=60.0, seed=seed)
+        events[events['time'] < stop].to_csv(os.path.join(session, 'mouse_log.csv'), index=False)
+    if screen:
+        write_synthetic_avi(os.path.join(session, 'screen_capture.avi'), int(duration_s * fps), resolution, fps)
+    if webcam:
+        write_synthetic_avi(os.path.join(session, 'webcam_capture.avi'), int(duration_s * fps), resolution, fps)
+    return session
+
+
+class Stand_In_Screen:
+    """
+    Stand-in for an mss screenshot context: grab() returns a synthetic BGRA frame.
+
+    After max_frames grabs the given stop event is set, which ends a handler's
+    recording loop after a fixed amount of work.
+    """
+
+    def __init__(self, resolution=(1920, 1080), max_frames=None, stop_event=None):
+        width, height = resolution
+        self.monitors = [{'left': 0, 'top': 0, 'width': width, 'height': height}]
+        self.max_frames = max_frames
+        self.stop_event = stop_event
+        self.grabs = 0
+        bgr = synthetic_text_frame(0, resolution)
+        self._frame = cv2.cvtColor(bgr, cv2.COLOR_BGR2BGRA)
+
+    def __call__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def grab(self, monitor):
+        self.grabs += 1
+        if self.max_frames is not None and self.grabs >= self.max_frames and self.stop_event is not None:
+            self.stop_event.set()
+        return self._frame
+
+
+class Stand_In_Pointer:
+    """
+    Stand-in for pyautogui: position() sweeps the cursor across the screen.
+    """
+
+    def __init__(self, resolution=(1280, 720)):
+        self.resolution = resolution
+        self._step = 0
+
+    def position(self):
+        self._step += 1
+        return self._step * 7 % self.resolution[0], self._step * 3 % self.resolution[1]
+
+
+class Stand_In_Listener:
+    """
+    Stand-in for a pynput Listener that replays a fixed list of events.
+
+    start() delivers every event to the registered callbacks on a background
+    thread, as pynput does, then sets the stop event so the handler's polling
+    loop ends and it proceeds to save its log.
+    """
+
+    events = []
+    stop_event = None
+
+    def __init__(self, **callbacks):
+        self.callbacks = callbacks
+        self._thread = threading.Thread(target=self._replay, daemon=True)
+
+    def _replay(self):
+        for name, args in self.events:
+            callback = self.callbacks.get(name)
+            if callback:
+                callback(*args)
+        if self.stop_event is not None:
+            self.stop_event.set()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        pass
+
+    def join(self):
+        self._thread.join()
+
+
+class Stand_In_Pipe:
+    """
+    Stand-in for the handler's pipe: recv() returns the save directory.
+    """
+
+    def __init__(self, save_dir):
+        self.save_dir = save_dir
+
+    def recv(self):
+        return self.save_dir
+
+    def send(self, value):
+        pass
+
+
+def install_stand_in_modules():
+    """
+    Register stand-in mss, pyautogui and pynput modules for any that cannot be imported.
+
+    On a headless Linux box pyautogui and pynput fail at import time because
+    there is no display. The stand-ins let the recorder modules import so
+    their code paths can be driven by the synthetic sources above.
+
+    Returns:
+        list: Names of the modules that were replaced
+    """
+    replaced = []
+
+    try:
+        import mss  # noqa: F401
+    except Exception:
+        module = types.ModuleType('mss')
+        module.mss = Stand_In_Screen
+        sys.modules['mss'] = module
+        replaced.append('mss')
+
+    try:
+        import pyautogui  # noqa: F401
+    except Exception:
+        module = types.ModuleType('pyautogui')
+        module.position = Stand_In_Pointer().position
+        sys.modules['pyautogui'] = module
+        replaced.append('pyautogui')
+
+    try:
+        from pynput import keyboard, mouse  # noqa: F401
+    except Exception:
+        module = types.ModuleType('pynput')
+        module.keyboard = types.SimpleNamespace(Listener=Stand_In_Listener)
+        module.mouse = types.SimpleNamespace(Listener=Stand_In_Listener)
+        sys.modules['pynput'] = module
+        replaced.append('pynput')
+
+    return replaced
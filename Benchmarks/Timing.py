@@ -0,0 +1,58 @@
+import time
+import numpy as np
+
+
+def summarize_latencies(seconds):
+    """
+    Summarize a list of per-call latencies.
+
+    Args:
+        seconds (list): Latencies in seconds
+
+    Returns:
+        dict: count, mean, p50, p99 and max, in milliseconds
+    """
+    values = np.asarray(seconds, dtype=np.float64) * 1e3
+    if values.size == 0:
+        return {'count': 0}
+    return {
+        'count': int(values.size),
+        'mean_ms': float(values.mean()),
+        'p50_ms': float(np.percentile(values, 50)),
+        'p99_ms': float(np.percentile(values, 99)),
+        'max_ms': float(values.max()),
+    }
+
+
+def throughput(items, elapsed, unit):
+    """
+    Build a result entry for a throughput measurement.
+
+    Args:
+        items (int): Work items processed
+        elapsed (float): Wall time in seconds
+        unit (str): Name of the work item, e.g. 'frames' or 'rows'
+
+    Returns:
+        dict: Item count, elapsed seconds and items per second
+    """
+    return {
+        unit: int(items),
+        'elapsed_s': float(elapsed),
+        f'{unit}_per_s': float(items / elapsed) if elapsed > 0 else None,
+    }
+
+
+class Stopwatch:
+    """
+    Context manager measuring wall time with perf_counter.
+    """
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.elapsed = time.perf_counter() - self.start
+        return False
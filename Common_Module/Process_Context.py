@@ -0,0 +1,59 @@
+import multiprocessing
+
+
+# Imported once by the fork server, so handler processes forked from it start with them loaded.
+# Modules that fail to import, e.g. pynput without a display, are skipped by the server. Only
+# the server imports them; this module does not depend on the packages named here.
+PRELOAD_MODULES = [
+    'numpy',
+    'pandas',
+    'cv2',
+    'mss',
+    'pyautogui',
+    'pynput',
+    'Recording_Module.Recorders.Screen_Handler',
+    'Recording_Module.Recorders.Webcam_Handler',
+    'Recording_Module.Recorders.Keyboard_Mouse_Handler',
+]
+
+_context = None
+
+
+def handler_context(start_method=None):
+    """
+    Multiprocessing context for handler processes and their events, queues and pipes.
+
+    Live segment processing and the model pipeline's stage processes are
+    started from it as well. Defaults to a fork server that has preloaded
+    PRELOAD_MODULES, so each recording forks an already-initialized process
+    instead of importing the module graph again, and nothing is forked from
+    the UI's threads. Where no fork server exists (Windows) processes are
+    spawned.
+
+    Args:
+        start_method (str, optional): 'forkserver', 'spawn' or 'fork' to override the
+                                      default; changing it only affects handlers
+                                      created afterwards
+
+    Returns:
+        multiprocessing.context.BaseContext: The shared context
+    """
+    global _context
+    if _context is None or (start_method and start_method != _context.get_start_method()):
+        if start_method is None:
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        _context = multiprocessing.get_context(start_method)
+        if start_method == 'forkserver':
+            _context.set_forkserver_preload(PRELOAD_MODULES)
+    return _context
+
+
+def warm_up():
+    """
+    Start the fork server ahead of the first recording, so its imports are not paid at start.
+
+    Does nothing for other start methods. Safe to call from a background thread.
+    """
+    if handler_context().get_start_method() == 'forkserver':
+        from multiprocessing import forkserver
+        forkserver.ensure_running()
@@ -0,0 +1,50 @@
+import os
+import json
+
+
+# Session folders are named '<start>_--_<stop>' with both times in this format
+SESSION_TIME_FORMAT = '%Y-%m-%d_%H-%M-%S'
+
+# A session is recorded into WORKING_FOLDER_PREFIX + '<start>' and renamed to '<start>_--_<stop>'
+# at stop; the leading dot keeps it out of the model's searches while recording, and a folder
+# still named like this is a recording in progress or one interrupted by a crash
+WORKING_FOLDER_PREFIX = '.recording_'
+
+# Segmented video is listed in '<stem>_segments.json'; per-segment results go in PROCESSED_FOLDER_NAME
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = '_segments.json'
+PROCESSED_FOLDER_NAME = 'Processed'
+
+
+def manifest_path(directory, stem):
+    return os.path.join(directory, f'{stem}{MANIFEST_SUFFIX}')
+
+
+def load_manifest(directory, stem):
+    """
+    Read the segment manifest of a segmented recording.
+
+    Args:
+        directory (str): Folder holding the segments
+        stem (str): Recording name, e.g. 'screen_capture'
+
+    Returns:
+        dict: The manifest, or None if the recording is not segmented
+    """
+    path = manifest_path(directory, stem)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def segment_fps(segment):
+    """
+    Frame rate a segment was actually captured at, from its first and last frame times.
+
+    Returns:
+        float: Frames per second, or None for segments with fewer than two frames
+    """
+    if segment['frames'] < 2 or segment['end_ns'] <= segment['start_ns']:
+        return None
+    return (segment['frames'] - 1) / ((segment['end_ns'] - segment['start_ns']) / 1e9)
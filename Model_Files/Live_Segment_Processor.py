@@ -0,0 +1,122 @@
+import os
+import json
+import time
+from collections import deque
+from Common_Module.Session_Layout import segment_fps
+from Common_Module.Process_Context import handler_context
+
+
+# Recording name prefix to the kind of processing a segment needs
+SEGMENT_KINDS = {'screen_capture': 'ocr', 'webcam_capture': 'openface'}
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Processing_Module', 'config.json')
+
+
+def recording_config():
+    """
+    The "recording" section of config.json, for the app to configure the recorder with.
+
+    Returns:
+        dict: segment_seconds, live_processing and start_method as set; empty if
+              there is no such section or the config cannot be read
+    """
+    try:
+        with open(CONFIG_PATH, 'r') as f:
+            return json.load(f).get("recording") or {}
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _process_segment(kind, segment_path, fps):
+    # Imported here so recording does not load the models until a segment is ready
+    if kind == 'ocr':
+        from .Processing_Module.Screen_Process import Screen_Process
+        Screen_Process().process_segment(segment_path, fps=fps)
+    else:
+        from .Processing_Module.Webcam_Process import Webcam_Process
+        Webcam_Process().process_segment(segment_path)
+
+
+class Live_Segment_Processor:
+    """
+    Processes completed recording segments while the recording continues.
+
+    Each submitted segment is processed in its own process, with at most
+    max_jobs running at once so processing does not starve the recorders.
+    Processes come from handler_context(), like the recorders', so none is
+    forked from the threads of the UI.
+    Results go to the segment's output folder and are marked complete, so
+    the model pipeline only processes what is left when recording stops.
+
+    Attributes:
+        max_jobs (int): Most segments processed at once
+        pending (deque): Segments waiting for a free job slot
+        running (list): (process, segment) per segment being processed
+        failed (list): Segments whose processing exited with an error
+    """
+
+    def __init__(self, max_jobs=1):
+        self.max_jobs = max_jobs
+        self.pending = deque()
+        self.running = []
+        self.failed = []
+
+    def submit(self, segment):
+        """
+        Queue a completed segment for processing.
+
+        Args:
+            segment (dict): Manifest entry with its 'path', as published by the recorder
+        """
+        stem = os.path.basename(segment['path']).rsplit('_', 1)[0]
+        if stem not in SEGMENT_KINDS:
+            raise ValueError(f"No live processing for segments of '{stem}'")
+        self.pending.append(segment)
+        self.poll()
+
+    def poll(self):
+        """
+        Reap finished jobs and start pending ones, without blocking.
+
+        Returns:
+            int: Segments still pending or running
+        """
+        for process, segment in list(self.running):
+            if not process.is_alive():
+                process.join()
+                if process.exitcode != 0:
+                    print(f"⚠️ Live processing failed for {segment['path']}, it is processed again later")
+                    self.failed.append(segment)
+                self.running.remove((process, segment))
+
+        while self.pending and len(self.running) < self.max_jobs:
+            segment = self.pending.popleft()
+            stem = os.path.basename(segment['path']).rsplit('_', 1)[0]
+            process = handler_context().Process(target=_process_segment, args=(
+                SEGMENT_KINDS[stem], segment['path'], segment_fps(segment) or 28.8
+            ), daemon=True)
+            process.start()
+            self.running.append((process, segment))
+
+        return len(self.pending) + len(self.running)
+
+    def wait(self, interval=0.2):
+        """
+        Block until every submitted segment has been processed.
+        """
+        while self.poll():
+            time.sleep(interval)
+
+    def cancel(self):
+        """
+        Drop pending segments and stop the ones being processed.
+
+        Their results are never marked complete, so they are processed
+        again by model generation.
+        """
+        self.pending.clear()
+        for process, _ in self.running:
+            process.terminate()
+        for process, _ in self.running:
+            process.join()
+        self.running = []
@@ -1,22 +1,116 @@
 from .Processing_Module.Webcam_Process import Webcam_Process
 from .Processing_Module.Screen_Process import Screen_Process
-from multiprocessing import Process
+from .Processing_Module.Feature_Fusion import Feature_Fusion
+from .Processing_Module.Cognitive_State import Cognitive_State
+from .Stage_Scheduler import Stage, Stage_Scheduler, STATE_FILENAME
+from .Resource_Governor import Resource_Governor
+from .Session_Catalog import Session_Catalog
+from Common_Module.Session_Layout import MANIFEST_SUFFIX
+from Profiling_Module.Process_Profiler import profiling_modes, run_profiled, PROFILE_FOLDER_NAME
+from functools import partial
+import datetime
+import os
+
+
+# Recorded modality each processing stage works on; fusion and state scoring work on whatever a session has
+STAGE_MODALITIES = {'ocr': 'screen', 'openface': 'webcam', 'fusion': None, 'states': None}
+
 
 class Model:
     def __init__(self):
         self.data_folder = str()
+        self.progress_queue = None  # Optional multiprocessing queue receiving stage progress events
         self.webcam_processor = Webcam_Process()
         self.screen_processor = Screen_Process()
+        self.feature_fusion = Feature_Fusion()
+        self.cognitive_state = Cognitive_State()
 
     def generate_model(self):
         # First step is processing data
-        self.process_data()
+        timings = self.process_data()
+
+        failed = [stage for stage, timing in timings.items() if timing['failed']]
+        if failed:
+            raise RuntimeError(f"Model generation failed in stages: {', '.join(failed)}")
+
+    def _sessions(self):
+        # Sessions with a stage not completed yet, where OCR and OpenFace only count for
+        # sessions holding their video, whole or in segments. The catalog is reconciled with the disk first, which only re-reads changed sessions.
+        with Session_Catalog(self.data_folder) as catalog:
+            catalog.rescan()
+            sessions = set()
+            for stage, modality in STAGE_MODALITIES.items():
+                sessions.update(catalog.sessions(modalities=[modality] if modality else [], pending_stage=stage))
+        return sorted(sessions)
+
+    def _governor(self):
+        # A null "cpu_budget" in config.json lets every stage use all cores, as before
+        budget = self.screen_processor.config.get("cpu_budget", {})
+        return Resource_Governor(**budget) if budget is not None else None
+
+    def _stages(self, governor):
+        modes = profiling_modes(self.screen_processor.config)
+        profile_dir = os.path.join(self.data_folder, PROFILE_FOLDER_NAME, datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S'))
+
+        def entry_point(target, name):
+            # Wrap the entry point in the profiler when profiling is switched on
+            return partial(run_profiled, target, profile_dir, name, modes) if modes else target
+
+        # Under a governor, stage concurrency follows its split of the core budget
+        max_concurrency = governor.total_cores if governor else 1
+
+        # Decoding is streamed straight into OCR within the 'ocr' stage rather than cached to disk
+        return [
+            Stage('ocr', entry_point(self.screen_processor.process_screen_capture, 'screen_process'),
+                  max_concurrency=max_concurrency, applies_to=partial(_has_file, _capture_files('screen_capture')),
+                  takes_threads=True),
+            Stage('openface', entry_point(self.webcam_processor.process_webcam_video, 'webcam_process'),
+                  max_concurrency=max_concurrency, applies_to=partial(_has_file, _capture_files('webcam_capture')),
+                  takes_threads=True),
+            # Resamples every stream onto one timeline once the video outputs it uses exist
+            Stage('fusion', entry_point(self.feature_fusion.fuse_session, 'feature_fusion'),
+                  depends_on=['ocr', 'openface'], max_concurrency=max_concurrency),
+            # Replays the fused features through the online estimator as fast as they can be scored
+            Stage('states', entry_point(self.cognitive_state.score_session, 'cognitive_state'),
+                  depends_on=['fusion'], max_concurrency=max_concurrency),
+        ]
+
+    def _report_progress(self, event):
+        message = f"[{event['time']}] {event['stage']} {event['status']}: {event['session']}"
+        if 'elapsed_s' in event:
+            message += f" ({event['elapsed_s']:.1f}s)"
+        print(message)
+        if event['status'] in ('completed', 'failed', 'resumed'):
+            # Resumed tasks completed in an earlier run the catalog may not know about
+            status = 'failed' if event['status'] == 'failed' else 'completed'
+            with Session_Catalog(self.data_folder) as catalog:
+                catalog.set_stage(event['session'], event['stage'], status, event.get('elapsed_s'))
+        if self.progress_queue is not None:
+            self.progress_queue.put(event)
 
     def process_data(self):
-        webcam_process = Process(target=self.webcam_processor.process_webcam_video, args=(self.data_folder,))
-        screen_Process = Process(target=self.screen_processor.process_screen_capture, args=(self.data_folder,))
-        
-        # Process all the different modalities of data to be meaningful in model generation
-        webcam_process.start()
-        screen_Process.start()
+        # Process all the different modalities of data to be meaningful in model generation.
+        # Stages run in parallel where independent and this call returns once all are done.
+        governor = self._governor()
+        scheduler = Stage_Scheduler(
+            self._stages(governor),
+            os.path.join(self.data_folder, STATE_FILENAME),
+            max_workers=governor.total_cores if governor else None,
+            progress_callback=self._report_progress,
+            governor=governor,
+        )
+        timings = scheduler.run(self._sessions())
+
+        for stage, timing in timings.items():
+            print(f"⏱  {stage}: {timing['completed']} completed, {timing['failed']} failed, "
+                  f"{timing['skipped']} skipped, {timing['total_s']:.1f}s total")
+        return timings
+
+
+def _capture_files(stem):
+    # A recording is either one video or a manifest of its segments
+    return (f'{stem}.avi', f'{stem}{MANIFEST_SUFFIX}')
+
 
+def _has_file(filenames, session):
+    return any(os.path.exists(os.path.join(session, filename)) for filename in filenames)
@@ -0,0 +1,265 @@
+import os
+import json
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from .Feature_Fusion import load_features, features_dir, SCHEMA_FILENAME as FEATURES_SCHEMA_FILENAME
+
+
+STATES_FILENAME = 'cognitive_states.csv'
+STATES = ('working_memory', 'stress', 'attention', 'emotion')
+
+# Used for any setting missing from the "estimator" section of config.json
+DEFAULT_ESTIMATOR = {
+    'normalization_half_life_s': 300.0,
+    'smoothing_half_life_s': 15.0,
+    'warmup_s': 60.0,
+}
+
+# Signed weight of each fused feature as an indicator of each state. These are
+# heuristics from the behavioural literature until the model is fitted on labelled sessions:
+#   working memory: brow lowering, suppressed blinking, fixed gaze, slower typing and pauses
+#   stress: lid and lip tightening, restless head and cursor, more corrections
+#   attention: face on screen, steady gaze and head, few pauses
+#   emotion (valence, 0.5 neutral): cheek raising and smiling against frowning
+STATE_INDICATORS = {
+    'working_memory': {'face_AU04_r': 1.0, 'face_blinks_per_min': -1.0, 'face_gaze_dispersion': -0.5,
+                       'keyboard_wpm': -0.5, 'keyboard_pause_s': 0.5, 'mouse_pause_s': 0.5},
+    'stress': {'face_AU04_r': 0.5, 'face_AU07_r': 0.5, 'face_AU23_r': 0.5, 'face_head_motion_energy': 1.0,
+               'mouse_jerk_abs_mean': 1.0, 'keyboard_correction_rate': 1.0},
+    'attention': {'face_tracked': 1.0, 'face_gaze_dispersion': -1.0, 'face_head_motion_energy': -0.5,
+                  'keyboard_pause_s': -0.5, 'mouse_pause_s': -0.5},
+    'emotion': {'face_AU06_r': 1.0, 'face_AU12_r': 1.0, 'face_AU04_r': -0.5, 'face_AU15_r': -1.0},
+}
+
+# Normalized features are clipped to this many deviations so one outlier cannot saturate a state
+Z_CLIP = 4.0
+
+
+def _decay(window_s, half_life_s):
+    # Weight of the newest window in an exponentially weighted statistic with this half-life
+    return 1.0 - 0.5 ** (window_s / half_life_s)
+
+
+class Online_Normalizer:
+    """
+    Exponentially weighted mean and variance of a vector of features.
+
+    Each update first standardizes the new values against the statistics of
+    the windows before it, then folds them in, so a value is never scored
+    against itself and nothing depends on windows still to come. Missing
+    (NaN) values leave their feature's statistics unchanged, and a feature
+    seen fewer than warmup times standardizes to NaN.
+
+    Attributes:
+        alpha (float): Weight of the newest window
+        warmup (int): Observations a feature needs before it is standardized
+    """
+
+    def __init__(self, size, alpha, warmup=1):
+        self.alpha = alpha
+        self.warmup = warmup
+        self.mean = np.zeros(size)
+        self.var = np.zeros(size)
+        self.count = np.zeros(size, dtype=np.int64)
+
+    def update(self, values):
+        """
+        Args:
+            values (numpy.ndarray): One window's features
+
+        Returns:
+            numpy.ndarray: The values standardized against the windows before
+        """
+        present = np.isfinite(values)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z = (values - self.mean) / np.sqrt(self.var)
+        z[~present | (self.count < self.warmup)] = np.nan
+        # A feature that has not varied yet sits at its mean
+        z[present & (self.count >= self.warmup) & (self.var == 0)] = 0.0
+
+        # West's incremental form of the weighted mean and variance
+        delta = np.where(present, values - self.mean, 0.0)
+        first = present & (self.count == 0)
+        alpha = np.where(first, 1.0, np.where(present, self.alpha, 0.0))
+        self.mean += alpha * delta
+        self.var = np.where(first, 0.0, (1.0 - alpha) * (self.var + alpha * delta ** 2))
+        self.count += present
+        return z
+
+
+class Cognitive_State_Estimator:
+    """
+    Online estimates of working memory load, stress, attention and emotion.
+
+    Windows of features are passed to update() one at a time, as the fused
+    feature timeline produces them, and each costs a fixed amount of work
+    however long the session has run: the indicator features are
+    standardized with an Online_Normalizer, combined with the signed weights
+    of STATE_INDICATORS into one score per state, squashed to 0..1 and
+    smoothed with an exponentially weighted mean. Nothing in the estimator
+    depends on how the windows arrive, so a producer of live windows can
+    feed it through update_features; the recorder has none yet, as features
+    are only fused once a session's OCR and OpenFace have run, so for now
+    it scores stored sessions, fed from their feature matrix by
+    replay_states.
+
+    A state whose indicators are all missing in a window keeps its last
+    estimate; 'coverage' is the share of the state's indicator weight that
+    was present, so it also falls for modalities a session did not record.
+
+    Attributes:
+        columns (list): Feature names, in the order of the values passed to update()
+        window_s (float): Spacing of the windows
+    """
+
+    def __init__(self, columns, window_s=1.0, normalization_half_life_s=DEFAULT_ESTIMATOR['normalization_half_life_s'],
+                 smoothing_half_life_s=DEFAULT_ESTIMATOR['smoothing_half_life_s'],
+                 warmup_s=DEFAULT_ESTIMATOR['warmup_s']):
+        self.columns = list(columns)
+        self.window_s = window_s
+        # Only the features some state uses are normalized
+        used = sorted({name for weights in STATE_INDICATORS.values() for name in weights} & set(self.columns))
+        self._positions = np.array([self.columns.index(name) for name in used], dtype=np.int64)
+        self._weights = np.array([[STATE_INDICATORS[state].get(name, 0.0) for name in used] for state in STATES])
+        # Coverage counts indicators of modalities the session lacks as missing
+        self._total_weight = np.array([sum(abs(w) for w in STATE_INDICATORS[state].values()) for state in STATES])
+        self._normalizer = Online_Normalizer(len(used), _decay(window_s, normalization_half_life_s),
+                                             warmup=max(1, int(round(warmup_s / window_s))))
+        self._smoothing = _decay(window_s, smoothing_half_life_s)
+        self.state = np.full(len(STATES), np.nan)
+        self.indicators = used
+
+    def update(self, values):
+        """
+        Advance the estimates by one window.
+
+        Args:
+            values (numpy.ndarray): The window's features, ordered as columns
+
+        Returns:
+            tuple: (states, coverage) arrays, ordered as STATES
+        """
+        z = np.clip(self._normalizer.update(np.asarray(values, dtype=np.float64)[self._positions]), -Z_CLIP, Z_CLIP)
+        present = np.isfinite(z)
+        magnitude = np.abs(self._weights)
+        coverage = magnitude @ present / self._total_weight
+        with np.errstate(invalid='ignore', divide='ignore'):
+            score = (self._weights @ np.where(present, z, 0.0)) / (magnitude @ present)
+        level = 1.0 / (1.0 + np.exp(-score))
+
+        scored = coverage > 0
+        fresh = scored & np.isnan(self.state)
+        self.state[fresh] = level[fresh]
+        smoothed = scored & ~fresh
+        self.state[smoothed] += self._smoothing * (level[smoothed] - self.state[smoothed])
+        return self.state.copy(), coverage
+
+    def update_features(self, features):
+        """
+        Advance the estimates by one window given as a mapping, e.g. from a live feature producer.
+
+        Args:
+            features (dict): Feature name to value; names the estimator does not know are ignored
+
+        Returns:
+            dict: State name to estimate, plus '<state>_coverage'
+        """
+        values = np.array([features.get(name, np.nan) for name in self.columns], dtype=np.float64)
+        states, coverage = self.update(values)
+        result = dict(zip(STATES, states.tolist()))
+        result.update({f'{state}_coverage': value for state, value in zip(STATES, coverage.tolist())})
+        return result
+
+
+def replay_states(features, estimator=None, speed=None, **settings):
+    """
+    Score a feature timeline window by window, as if it were arriving live.
+
+    Args:
+        features (pandas.DataFrame): Time-indexed features, as from load_features
+        estimator (Cognitive_State_Estimator, optional): Carries state from an earlier call; made from settings if None
+        speed (float, optional): Pace the windows at this multiple of real time; None replays as fast as possible
+        **settings: Cognitive_State_Estimator settings
+
+    Returns:
+        pandas.DataFrame: Estimates and coverage of every state, one row per window
+    """
+    window_s = (features.index[1] - features.index[0]).total_seconds() if len(features) > 1 else 1.0
+    estimator = estimator or Cognitive_State_Estimator(features.columns, window_s, **settings)
+    matrix = features.to_numpy(dtype=np.float64)
+    states = np.empty((len(matrix), len(STATES)))
+    coverage = np.empty((len(matrix), len(STATES)))
+
+    began = time.perf_counter()
+    for i, values in enumerate(matrix):
+        if speed:
+            # Sleep to the window's scheduled time from the start rather than per window, so delays do not add up
+            delay = began + i * window_s / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        states[i], coverage[i] = estimator.update(values)
+
+    frame = pd.DataFrame(states, index=features.index, columns=list(STATES))
+    frame[[f'{state}_coverage' for state in STATES]] = coverage
+    return frame
+
+
+def score_session(session_folder, output_dir=None, speed=None, **settings):
+    """
+    Replay a session's fused features through the estimator and save the estimates.
+
+    Args:
+        session_folder (str): A 'start_--_stop' recording folder with fused features
+        output_dir (str, optional): Folder with the fused features; defaults to features_dir(session_folder)
+        speed (float, optional): Replay pace as a multiple of real time; None is as fast as possible
+        **settings: Cognitive_State_Estimator settings
+
+    Returns:
+        Path: The saved states file
+    """
+    output_dir = Path(output_dir or features_dir(session_folder))
+    if not (output_dir / FEATURES_SCHEMA_FILENAME).exists():
+        raise FileNotFoundError(f'No fused features to score in {output_dir}')
+    states = replay_states(load_features(output_dir), speed=speed, **settings)
+
+    path = output_dir / STATES_FILENAME
+    tmp_path = path.with_name(path.name + '.tmp')
+    states.to_csv(tmp_path, float_format='%.6g')
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_states(output_dir):
+    """
+    Returns:
+        pandas.DataFrame: Saved estimates indexed by window start time
+    """
+    return pd.read_csv(Path(output_dir) / STATES_FILENAME, index_col='time', parse_dates=['time'])
+
+
+class Cognitive_State:
+    def __init__(self):
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        config_path = os.path.join(script_dir, "config.json")
+
+        if os.path.exists(config_path):
+            try:
+                with open(config_path, 'r') as f:
+                    config = json.load(f)
+            except (json.JSONDecodeError, Exception):
+                # If file is corrupted or empty, start fresh
+                raise ValueError("Config.json either corrupted or empty. Model generation failed")
+        else:
+            raise FileNotFoundError('config.json file not found. Model generation failed.')
+
+        self.config = config
+
+    def settings(self):
+        return {**DEFAULT_ESTIMATOR, **(self.config.get("estimator") or {})}
+
+    def score_session(self, session_folder):
+        # Batch-score a recorded session with the online estimator, one window at a time
+        path = score_session(session_folder, **self.settings())
+        print(f"💾 Saved cognitive state estimates to: {path}")
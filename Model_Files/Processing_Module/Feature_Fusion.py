@@ -0,0 +1,416 @@
+import os
+import json
+import math
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from .OCR_Store import records_path, index_path, INDEX_DTYPE, OUTPUT_NAME
+from .OCR_Span_Tracker import SPANS_NAME
+from .Keystroke_Dynamics import Keystroke_Dynamics, Keystroke_Windows, iter_keyboard_chunks
+from .Mouse_Kinematics import Mouse_Kinematics, Kinematic_Windows, iter_mouse_chunks
+from .OpenFace_Windows import openface_windows
+from ..Session_Catalog import parse_session_name
+
+
+FEATURES_FOLDER_NAME = 'Features'
+FEATURES_FILENAME = 'features.npy'
+SCHEMA_FILENAME = 'features.json'
+FUSION_VERSION = 1
+
+# Used for any setting missing from the "fusion" section of config.json
+DEFAULT_FUSION = {
+    'rate_hz': 1.0,
+    'chunk_rows': 200000,
+    'rolling_s': [10, 60],
+}
+
+# Count columns that also get rolling per-minute rates
+ROLLING_COLUMNS = ('keyboard_presses', 'keyboard_backspaces', 'mouse_clicks', 'mouse_distance_px', 'ocr_new_spans')
+
+
+def features_dir(session_folder):
+    """
+    Output folder of a session's features, 'Features/<session>' beside the session folder.
+    """
+    session_folder = Path(session_folder)
+    return session_folder.parent / FEATURES_FOLDER_NAME / session_folder.name
+
+
+class Timeline:
+    """
+    Fixed-rate bins covering a recording session.
+
+    Bin i holds the records with start_ns + i * bin_ns <= time < start_ns + (i + 1) * bin_ns.
+
+    Attributes:
+        start_ns (int): Start of the first bin on the session timeline
+        bin_ns (int): Bin width in nanoseconds
+        bins (int): Number of bins
+        edges (numpy.ndarray): bins + 1 bin boundaries in nanoseconds
+    """
+
+    def __init__(self, start_ns, stop_ns, rate_hz):
+        self.start_ns = int(start_ns)
+        self.bin_ns = int(round(1e9 / rate_hz))
+        self.bins = max(1, math.ceil((stop_ns - start_ns) / self.bin_ns))
+        self.edges = self.start_ns + np.arange(self.bins + 1, dtype=np.int64) * self.bin_ns
+
+    @property
+    def bin_s(self):
+        return self.bin_ns / 1e9
+
+    def assign(self, times_ns):
+        """
+        Bin of every time, by binary search over the bin edges.
+
+        Args:
+            times_ns (numpy.ndarray): int64 nanoseconds; NaT and times off the timeline are dropped
+
+        Returns:
+            tuple: (bin index of each kept time, boolean mask of the kept times)
+        """
+        index = np.searchsorted(self.edges, times_ns, side='right') - 1
+        kept = (index >= 0) & (index < self.bins)
+        return index[kept], kept
+
+    def overlap_s(self, start_ns, end_ns):
+        """
+        Seconds of the intervals [start_ns, end_ns) that fall in every bin.
+
+        Uses the total interval time before each bin edge, from prefix sums
+        over the sorted starts and ends, so it costs O((intervals + bins) log)
+        however long the intervals are.
+
+        Returns:
+            numpy.ndarray: Covered seconds per bin
+        """
+        edges_s = (self.edges - self.start_ns) / 1e9
+        before = np.zeros(len(edges_s))
+        for points, sign in ((start_ns, 1.0), (end_ns, -1.0)):
+            points = np.sort((np.asarray(points, dtype=np.int64) - self.start_ns) / 1e9)
+            count = np.searchsorted(points, edges_s, side='right')
+            prefix = np.concatenate([[0.0], np.cumsum(points)])
+            before += sign * (count * edges_s - prefix[count])
+        return np.diff(before)
+
+    def relative_ns(self, seconds):
+        # Seconds into a capture, which starts with the session, onto the session timeline
+        seconds = np.asarray(seconds, dtype=np.float64)
+        missing = np.isnan(seconds)
+        times = self.start_ns + np.round(np.where(missing, 0, seconds) * 1e9).astype(np.int64)
+        times[missing] = np.iinfo(np.int64).min
+        return times
+
+
+class _Bin_Totals:
+    """
+    Per-bin sums that chunks of a stream are added into.
+    """
+
+    def __init__(self, bins):
+        self.bins = bins
+        self.totals = {}
+
+    def add(self, name, index, weights=None):
+        total = self.totals.setdefault(name, np.zeros(self.bins, dtype=np.float64))
+        if len(index):
+            total += np.bincount(index, weights=weights, minlength=self.bins)
+
+    def mean(self, name, count_name):
+        # Bins without samples have no mean
+        counts = self.totals.get(count_name, np.zeros(self.bins))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, self.totals.get(name, np.zeros(self.bins)) / counts, np.nan)
+
+
+def keyboard_features(path, timeline, chunk_rows):
+    """
+    Key presses, backspaces and keystroke dynamics per bin from keyboard_log.csv, read in chunks.
+
+    Dwell, flight and digraph times, typing speed, correction rate, bursts
+    and pauses come from Keystroke_Dynamics over the same chunks.
+
+    Returns:
+        dict: Column name to per-bin array
+    """
+    totals = _Bin_Totals(timeline.bins)
+    dynamics = Keystroke_Dynamics()
+    windows = Keystroke_Windows(timeline)
+    for times, key, event in iter_keyboard_chunks(path, chunk_rows):
+        index, kept = timeline.assign(times)
+        press = (event == 'press')[kept]
+        backspace = press & (key == 'Key.backspace')[kept]
+        totals.add('keyboard_presses', index[press])
+        totals.add('keyboard_backspaces', index[backspace])
+        windows.add(dynamics.update(times, key, event))
+    windows.add(dynamics.finish())
+
+    columns = {name: totals.totals.get(name, np.zeros(timeline.bins))
+               for name in ('keyboard_presses', 'keyboard_backspaces')}
+    columns.update(windows.columns())
+    return columns
+
+
+def mouse_features(path, timeline, chunk_rows):
+    """
+    Cursor activity and kinematics per bin from mouse_log.csv, read in chunks.
+
+    The distance between consecutive positions is credited to the bin of the
+    later one; the last position of a chunk carries over to the next.
+    Speed, acceleration, jerk, curvature, pauses and click timing come from
+    Mouse_Kinematics over the same chunks.
+
+    Returns:
+        dict: Column name to per-bin array
+    """
+    totals = _Bin_Totals(timeline.bins)
+    kinematics = Mouse_Kinematics()
+    windows = Kinematic_Windows(timeline)
+    previous = np.array([np.nan, np.nan])
+    for times, x, y, event in iter_mouse_chunks(path, chunk_rows):
+        position = np.column_stack([x, y])
+        step = np.diff(np.vstack([previous, position]), axis=0)
+        distance = np.nan_to_num(np.hypot(step[:, 0], step[:, 1]))
+        valid = ~np.isnan(position).any(axis=1)
+        if valid.any():
+            previous = position[np.flatnonzero(valid)[-1]]
+
+        index, kept = timeline.assign(times)
+        kept_event = event[kept]
+        totals.add('mouse_moves', index[kept_event == 'move'])
+        totals.add('mouse_clicks', index[kept_event == 'press'])
+        totals.add('mouse_scrolls', index[kept_event == 'scroll'])
+        totals.add('mouse_distance_px', index, distance[kept])
+        windows.add(kinematics.update(times, x, y, event))
+
+    columns = {name: totals.totals.get(name, np.zeros(timeline.bins))
+               for name in ('mouse_moves', 'mouse_clicks', 'mouse_scrolls', 'mouse_distance_px')}
+    columns['mouse_speed_px_s'] = columns['mouse_distance_px'] / timeline.bin_s
+    columns.update(windows.columns())
+    return columns
+
+
+def ocr_features(ocr_dir, timeline, chunk_rows):
+    """
+    Screen text activity per bin from the indexed OCR output.
+
+    Frame-level output gives the sampled frames, detections, characters and
+    mean confidence per bin; span output gives how many new pieces of text
+    appeared. Either may be missing, depending on "ocr_output_mode".
+
+    Returns:
+        dict: Column name to per-bin array
+    """
+    totals = _Bin_Totals(timeline.bins)
+    columns = {}
+
+    frames_path = records_path(ocr_dir, OUTPUT_NAME)
+    if frames_path.exists() and index_path(ocr_dir, OUTPUT_NAME).exists():
+        # The index lists every sampled frame, with or without text
+        sampled = np.fromfile(index_path(ocr_dir, OUTPUT_NAME), dtype=INDEX_DTYPE)['timestamp']
+        index, _ = timeline.assign(timeline.relative_ns(sampled))
+        totals.add('ocr_frames', index)
+
+        if frames_path.stat().st_size > 0:
+            for chunk in pd.read_json(frames_path, lines=True, chunksize=chunk_rows, dtype=False):
+                index, kept = timeline.assign(timeline.relative_ns(pd.to_numeric(chunk['timestamp'], errors='coerce')))
+                totals.add('ocr_detections', index)
+                totals.add('ocr_chars', index, chunk['text'].astype(str).str.len().to_numpy(dtype=np.float64)[kept])
+                confidence = pd.to_numeric(chunk['confidence'], errors='coerce').to_numpy(dtype=np.float64)[kept]
+                totals.add('ocr_confidence_sum', index, np.nan_to_num(confidence))
+
+        columns['ocr_frames'] = totals.totals['ocr_frames']
+        columns['ocr_detections'] = totals.totals.get('ocr_detections', np.zeros(timeline.bins))
+        columns['ocr_chars'] = totals.totals.get('ocr_chars', np.zeros(timeline.bins))
+        columns['ocr_confidence'] = totals.mean('ocr_confidence_sum', 'ocr_detections')
+
+    spans_path = records_path(ocr_dir, SPANS_NAME)
+    if spans_path.exists():
+        if spans_path.stat().st_size > 0:
+            for chunk in pd.read_json(spans_path, lines=True, chunksize=chunk_rows, dtype=False):
+                index, _ = timeline.assign(timeline.relative_ns(pd.to_numeric(chunk['t_start'], errors='coerce')))
+                totals.add('ocr_new_spans', index)
+        columns['ocr_new_spans'] = totals.totals.get('ocr_new_spans', np.zeros(timeline.bins))
+    return columns
+
+
+def openface_features(openface_dir, timeline, chunk_rows):
+    """
+    Face tracking, mean AU intensity, gaze angle and head rotation, gaze
+    dispersion, blink rate and head motion energy per bin.
+
+    Means are over the frames OpenFace tracked successfully; 'face_tracked'
+    is the share of frames in the bin that were. The bins are the windows of
+    OpenFace_Windows, streamed with one window open at a time.
+
+    Returns:
+        dict: Column name to per-bin array
+    """
+    columns = {}
+    for frame in openface_windows(openface_dir, timeline.bin_s, chunk_rows=chunk_rows):
+        index = np.round(frame['window_s'].to_numpy() / timeline.bin_s).astype(np.int64)
+        kept = (index >= 0) & (index < timeline.bins)
+        for name, source in _openface_columns(frame.columns):
+            if name not in columns:
+                columns[name] = np.full(timeline.bins, np.nan)
+            columns[name][index[kept]] = frame[source].to_numpy(dtype=np.float64)[kept]
+    return columns
+
+
+def _openface_columns(window_columns):
+    # Fused column name and OpenFace_Windows column of each OpenFace feature
+    yield 'face_tracked', 'face_tracked'
+    for source in window_columns:
+        if source.endswith('_mean'):
+            name = source[:-len('_mean')]
+            yield ('face_confidence' if name == 'confidence' else f'face_{name}'), source
+    for name in ('gaze_dispersion', 'blinks_per_min', 'head_motion_energy'):
+        yield f'face_{name}', name
+
+
+def rolling_rates(columns, timeline, windows_s):
+    """
+    Per-minute rates of the activity counts over trailing windows.
+
+    Returns:
+        dict: '<column>_per_min_<window>s' to per-bin array
+    """
+    counts = pd.DataFrame({name: columns[name] for name in ROLLING_COLUMNS if name in columns})
+    rates = {}
+    for window_s in windows_s:
+        window = max(1, int(round(window_s / timeline.bin_s)))
+        summed = counts.rolling(window, min_periods=1).sum() * (60.0 / (window * timeline.bin_s))
+        for name in summed.columns:
+            rates[f'{name}_per_min_{window_s:g}s'] = summed[name].to_numpy()
+    return rates
+
+
+def fuse_session(session_folder, output_dir=None, rate_hz=DEFAULT_FUSION['rate_hz'],
+                 chunk_rows=DEFAULT_FUSION['chunk_rows'], rolling_s=DEFAULT_FUSION['rolling_s']):
+    """
+    Resample every stream of a session onto one fixed-rate timeline.
+
+    Keyboard and mouse logs, OCR output and OpenFace output are each read in
+    chunks of chunk_rows and binned with a binary search over the bin edges,
+    so memory follows the number of bins rather than the number of records.
+    The result is one float32 (bins x features) matrix, written as .npy with
+    a features.json schema holding the column names and the timeline. Streams
+    a session lacks contribute no columns.
+
+    Args:
+        session_folder (str): A 'start_--_stop' recording folder
+        output_dir (str, optional): Defaults to features_dir(session_folder)
+        rate_hz (float): Bins per second
+        chunk_rows (int): Records read at a time from each stream
+        rolling_s (list): Trailing windows, in seconds, for the rolling activity rates
+
+    Returns:
+        Path: The output folder
+    """
+    session_folder = Path(session_folder)
+    times = parse_session_name(session_folder.name)
+    if times is None:
+        raise ValueError(f'Not a recording session folder: {session_folder}')
+    # Folder names are truncated to the second, so the timeline runs to the end of the stop second
+    timeline = Timeline(times[0], times[1] + 10**9, rate_hz)
+
+    columns = {}
+    streams = []
+    keyboard_log = session_folder / 'keyboard_log.csv'
+    if keyboard_log.exists():
+        columns.update(keyboard_features(keyboard_log, timeline, chunk_rows))
+        streams.append('keyboard')
+    mouse_log = session_folder / 'mouse_log.csv'
+    if mouse_log.exists():
+        columns.update(mouse_features(mouse_log, timeline, chunk_rows))
+        streams.append('mouse')
+    ocr_dir = session_folder.parent / 'EasyOCR' / session_folder.name
+    if ocr_dir.is_dir():
+        ocr_columns = ocr_features(ocr_dir, timeline, chunk_rows)
+        if ocr_columns:
+            columns.update(ocr_columns)
+            streams.append('ocr')
+    openface_dir = session_folder.parent / 'Openface' / session_folder.name
+    if openface_dir.is_dir():
+        openface_columns = openface_features(openface_dir, timeline, chunk_rows)
+        if openface_columns:
+            columns.update(openface_columns)
+            streams.append('openface')
+    columns.update(rolling_rates(columns, timeline, rolling_s))
+
+    output_dir = Path(output_dir) if output_dir is not None else features_dir(session_folder)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    names = list(columns)
+    matrix = np.lib.format.open_memmap(output_dir / f'{FEATURES_FILENAME}.tmp', mode='w+',
+                                       dtype=np.float32, shape=(timeline.bins, len(names)))
+    for j, name in enumerate(names):
+        matrix[:, j] = columns[name]
+    matrix.flush()
+    del matrix
+    os.replace(output_dir / f'{FEATURES_FILENAME}.tmp', output_dir / FEATURES_FILENAME)
+
+    # The schema is written last so features with a schema are always complete
+    schema = {
+        'version': FUSION_VERSION,
+        'session': session_folder.name,
+        'start_ns': timeline.start_ns,
+        'bin_ns': timeline.bin_ns,
+        'rate_hz': rate_hz,
+        'bins': timeline.bins,
+        'streams': streams,
+        'columns': names,
+    }
+    temp_schema = output_dir / f'{SCHEMA_FILENAME}.tmp'
+    with open(temp_schema, 'w') as f:
+        json.dump(schema, f, indent=2)
+    os.replace(temp_schema, output_dir / SCHEMA_FILENAME)
+    return output_dir
+
+
+def load_features(output_dir):
+    """
+    Memory-map fused features as a DataFrame indexed by bin start time.
+
+    Args:
+        output_dir (str): Folder written by fuse_session
+
+    Returns:
+        pandas.DataFrame: One row per bin, one column per feature
+    """
+    output_dir = Path(output_dir)
+    schema_path = output_dir / SCHEMA_FILENAME
+    if not schema_path.exists():
+        raise FileNotFoundError(f'No fused features found in {output_dir}')
+    with open(schema_path, 'r') as f:
+        schema = json.load(f)
+    if schema.get('version') != FUSION_VERSION:
+        raise ValueError(f'Unsupported features version in {output_dir}')
+
+    matrix = np.load(output_dir / FEATURES_FILENAME, mmap_mode='r')
+    times = pd.to_datetime(schema['start_ns'] + np.arange(schema['bins'], dtype=np.int64) * schema['bin_ns'])
+    return pd.DataFrame(matrix, index=pd.DatetimeIndex(times, name='time'), columns=schema['columns'], copy=False)
+
+
+class Feature_Fusion:
+    def __init__(self):
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        config_path = os.path.join(script_dir, "config.json")
+
+        if os.path.exists(config_path):
+            try:
+                with open(config_path, 'r') as f:
+                    config = json.load(f)
+            except (json.JSONDecodeError, Exception):
+                # If file is corrupted or empty, start fresh
+                raise ValueError("Config.json either corrupted or empty. Model generation failed")
+        else:
+            raise FileNotFoundError('config.json file not found. Model generation failed.')
+
+        self.config = config
+
+    def fuse_session(self, session_folder):
+        # Build the model-ready feature matrix of one session from its raw and processed streams
+        settings = {**DEFAULT_FUSION, **(self.config.get("fusion") or {})}
+        output_dir = fuse_session(session_folder, rate_hz=settings['rate_hz'], chunk_rows=settings['chunk_rows'],
+                                  rolling_s=settings['rolling_s'])
+        print(f"💾 Saved fused features to: {output_dir}")
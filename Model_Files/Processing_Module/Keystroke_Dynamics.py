@@ -0,0 +1,277 @@
+import numpy as np
+import pandas as pd
+
+
+# A gap between keystrokes at least this long ends a typing burst
+BURST_PAUSE_S = 2.0
+# Trailing window for typing speed and correction rate
+SLIDING_WINDOW_S = 60.0
+KEYSTROKE_CHUNK_ROWS = 500000
+# Keys held longer than this are taken to have lost their release
+MAX_HOLD_S = 10.0
+
+# Keys that undo typing
+CORRECTION_KEYS = ('Key.backspace', 'Key.delete')
+# Non-character keys that still count as typed text for typing speed
+TEXT_KEYS = ('Key.space', 'Key.enter', 'Key.tab')
+
+
+def _previous(values, carried):
+    # values shifted by one, with the value carried over from the previous chunk in front
+    return np.concatenate([np.array([carried], dtype=values.dtype), values[:-1]]) if len(values) else values
+
+
+def pair_keystrokes(time_ns, key, event):
+    """
+    Pair presses and releases of the same key into keystrokes.
+
+    Events are grouped by key with one stable sort. Within a key, a press
+    that does not follow another press starts a keystroke; further presses
+    before the release are the key repeating while held, and the release
+    ends it. A release not preceded by a press of its key (a key already
+    down when logging started, or a duplicate) belongs to no keystroke.
+
+    Args:
+        time_ns (numpy.ndarray): int64 event times, non-decreasing
+        key (numpy.ndarray): Key name per event, as Keyboard_Handler logs it
+        event (numpy.ndarray): 'press' or 'release' per event
+
+    Returns:
+        tuple: (keystrokes, membership). keystrokes is a DataFrame with
+               press_ns, release_ns (-1 while held), key and repeats, in order
+               of the first press; membership gives, for every input event,
+               the row of its keystroke or -1
+    """
+    codes, names = pd.factorize(pd.Series(key, dtype=object))
+    order = np.lexsort((np.arange(len(codes)), codes))
+    sorted_codes = codes[order]
+    press = (np.asarray(event) == 'press')[order]
+
+    first_of_key = np.ones(len(order), dtype=bool)
+    first_of_key[1:] = sorted_codes[1:] != sorted_codes[:-1]
+    after_press = np.zeros(len(order), dtype=bool)
+    after_press[1:] = press[:-1] & ~first_of_key[1:]
+
+    starts = press & ~after_press
+    closing = ~press & after_press
+    # Repeats and closing releases follow a press of their key, so they belong to the latest start
+    member = np.cumsum(starts) - 1
+    member[~press & ~after_press] = -1
+
+    times = np.asarray(time_ns, dtype=np.int64)[order]
+    count = int(starts.sum())
+    release_ns = np.full(count, -1, dtype=np.int64)
+    release_ns[member[closing]] = times[closing]
+    repeats = np.bincount(member[press & after_press], minlength=count)
+
+    # Renumber keystrokes by first press time
+    by_time = np.argsort(times[starts], kind='stable')
+    rank = np.empty(count, dtype=np.int64)
+    rank[by_time] = np.arange(count)
+    membership = np.full(len(order), -1, dtype=np.int64)
+    if count:
+        membership[order] = np.where(member >= 0, rank[np.maximum(member, 0)], -1)
+
+    keystrokes = pd.DataFrame({
+        'press_ns': times[starts][by_time],
+        'release_ns': release_ns[by_time],
+        'key': np.asarray(names, dtype=object)[sorted_codes[starts]][by_time],
+        'repeats': repeats[by_time],
+    })
+    return keystrokes, membership
+
+
+class Keystroke_Dynamics:
+    """
+    Streaming keystroke dynamics over the rows of a keyboard log.
+
+    Chunks of the log are passed to update() in time order. A keystroke is
+    only reported once it and every keystroke before it have been released,
+    so the events of keys still held at the end of a chunk are carried into
+    the next one, and the results do not depend on where the log is split.
+    finish() reports what is left when the log ends. A key held longer than
+    MAX_HOLD_S is reported without a release, which bounds what is carried
+    when a release was never logged.
+
+    Per keystroke:
+        dwell_s from press to release, flight_s from the previous release to
+        this press (negative when keys overlap), digraph_s from the previous
+        press to this press, with digraph naming the key pair, and burst_start
+        marking the first keystroke after a gap of burst_pause_s or more.
+
+    Attributes:
+        burst_pause_s (float): Shortest gap between keystrokes that ends a burst
+    """
+
+    def __init__(self, burst_pause_s=BURST_PAUSE_S):
+        self.burst_pause_s = burst_pause_s
+        self._carried = (np.empty(0, dtype=np.int64), np.empty(0, dtype=object), np.empty(0, dtype=object))
+        self._previous = None
+
+    def update(self, time_ns, key, event):
+        """
+        Add the next chunk of the log.
+
+        Args:
+            time_ns (numpy.ndarray): int64 event times on the session timeline, non-decreasing
+            key (numpy.ndarray): Key name per event
+            event (numpy.ndarray): 'press' or 'release' per event
+
+        Returns:
+            pandas.DataFrame: Keystrokes completed so far and not yet reported
+        """
+        time_ns = np.concatenate([self._carried[0], np.asarray(time_ns, dtype=np.int64)])
+        key = np.concatenate([self._carried[1], np.asarray(key, dtype=object)])
+        event = np.concatenate([self._carried[2], np.asarray(event, dtype=object)])
+        return self._emit(time_ns, key, event, final=False)
+
+    def finish(self):
+        """
+        Report the keystrokes still held when the log ended, without a release.
+        """
+        return self._emit(*self._carried, final=True)
+
+    def _emit(self, time_ns, key, event, final):
+        keystrokes, membership = pair_keystrokes(time_ns, key, event)
+        press_ns = keystrokes['press_ns'].to_numpy()
+        release_ns = keystrokes['release_ns'].to_numpy().copy()
+        held = release_ns < 0
+        # Keys held past MAX_HOLD_S lost their release, so they do not hold back the keystrokes after them
+        stuck = held | (release_ns - press_ns > MAX_HOLD_S * 1e9)
+        if len(time_ns) and not final:
+            stuck &= ~held | (press_ns < time_ns[-1] - MAX_HOLD_S * 1e9)
+        release_ns[stuck] = -1
+
+        waiting = np.flatnonzero(held & ~stuck)
+        ready = waiting[0] if len(waiting) else len(keystrokes)
+        # Events of the keystrokes not reported yet wait for the next chunk
+        carry = membership >= ready
+        self._carried = (time_ns[carry], key[carry], event[carry])
+
+        keystrokes = keystrokes.iloc[:ready].reset_index(drop=True)
+        press_ns = press_ns[:ready]
+        release_ns = release_ns[:ready]
+        names = keystrokes['key'].to_numpy(dtype=object)
+
+        previous = self._previous or (-1, -1, None)
+        previous_press = _previous(press_ns, previous[0])
+        previous_release = _previous(release_ns, previous[1])
+        previous_key = _previous(names, previous[2])
+        if ready:
+            self._previous = (press_ns[-1], release_ns[-1], names[-1])
+
+        keystrokes['release_ns'] = release_ns
+        keystrokes['dwell_s'] = np.where(release_ns >= 0, (release_ns - press_ns) / 1e9, np.nan)
+        keystrokes['flight_s'] = np.where(previous_release >= 0, (press_ns - previous_release) / 1e9, np.nan)
+        keystrokes['digraph_s'] = np.where(previous_press >= 0, (press_ns - previous_press) / 1e9, np.nan)
+        keystrokes['digraph'] = pd.Series(previous_key, dtype=object).str.cat(keystrokes['key'].astype(str), sep='>')
+        keystrokes['burst_start'] = ~(keystrokes['digraph_s'].to_numpy() < self.burst_pause_s)
+        keystrokes['correction'] = np.isin(names, CORRECTION_KEYS)
+        keystrokes['text'] = (keystrokes['key'].str.len().to_numpy() == 1) | np.isin(names, TEXT_KEYS)
+        return keystrokes
+
+
+def iter_keyboard_chunks(keyboard_log, chunk_rows=KEYSTROKE_CHUNK_ROWS):
+    """
+    Read a keyboard_log.csv in chunks as arrays on the session timeline.
+
+    Yields:
+        tuple: (time_ns, key, event) arrays of one chunk; rows without a
+               parseable time are dropped
+    """
+    for chunk in pd.read_csv(keyboard_log, usecols=['time', 'key', 'event'], dtype=str,
+                             keep_default_na=False, chunksize=chunk_rows):
+        times = pd.to_datetime(chunk['time'], errors='coerce', format='ISO8601')
+        valid = ~times.isna().to_numpy()
+        yield (times.to_numpy(dtype='datetime64[ns]').view(np.int64)[valid],
+               chunk['key'].to_numpy(dtype=object)[valid], chunk['event'].to_numpy(dtype=object)[valid])
+
+
+def keystroke_dynamics(keyboard_log, burst_pause_s=BURST_PAUSE_S, chunk_rows=KEYSTROKE_CHUNK_ROWS):
+    """
+    Keystrokes of a whole keyboard log, streamed in chunks.
+
+    Yields:
+        pandas.DataFrame: Keystrokes as returned by Keystroke_Dynamics.update, then finish
+    """
+    dynamics = Keystroke_Dynamics(burst_pause_s)
+    for chunk in iter_keyboard_chunks(keyboard_log, chunk_rows):
+        yield dynamics.update(*chunk)
+    yield dynamics.finish()
+
+
+class Keystroke_Windows:
+    """
+    Per-bin summary of keystroke dynamics on a fixed-rate timeline.
+
+    Keystrokes are added chunk by chunk and placed in the bin of their
+    press. Dwell, flight and digraph times are averaged per bin; typing
+    speed (words of five characters per minute) and correction rate
+    (corrections per keystroke) are over a trailing window_s ending with
+    each bin. Pause time is the part of every inter-burst gap in the bin.
+
+    Attributes:
+        timeline: Feature_Fusion.Timeline the bins come from
+        window_s (float): Trailing window for typing speed and correction rate
+    """
+
+    MEANS = ('dwell_s', 'flight_s', 'digraph_s')
+    COUNTS = ('keystrokes', 'text', 'correction', 'burst_start', 'repeats')
+
+    def __init__(self, timeline, window_s=SLIDING_WINDOW_S):
+        self.timeline = timeline
+        self.window_s = window_s
+        bins = timeline.bins
+        self._sums = {name: np.zeros(bins) for name in self.MEANS}
+        self._counts = {name: np.zeros(bins) for name in self.MEANS}
+        self._totals = {name: np.zeros(bins) for name in self.COUNTS}
+        self._pause_s = np.zeros(bins)
+
+    def add(self, keystrokes):
+        bins = self.timeline.bins
+        press_ns = keystrokes['press_ns'].to_numpy(dtype=np.int64)
+        index, kept = self.timeline.assign(press_ns)
+        for name in self.MEANS:
+            values = keystrokes[name].to_numpy(dtype=np.float64)[kept]
+            finite = np.isfinite(values)
+            self._sums[name] += np.bincount(index[finite], weights=values[finite], minlength=bins)
+            self._counts[name] += np.bincount(index[finite], minlength=bins)
+
+        self._totals['keystrokes'] += np.bincount(index, minlength=bins)
+        for name in self.COUNTS[1:]:
+            weights = keystrokes[name].to_numpy(dtype=np.float64)[kept]
+            self._totals[name] += np.bincount(index, weights=weights, minlength=bins)
+
+        # Gaps that end bursts, from the previous press to the one starting the burst
+        gaps = keystrokes['burst_start'].to_numpy() & np.isfinite(keystrokes['digraph_s'].to_numpy(dtype=np.float64))
+        if gaps.any():
+            end_ns = press_ns[gaps]
+            start_ns = end_ns - np.round(keystrokes['digraph_s'].to_numpy()[gaps] * 1e9).astype(np.int64)
+            self._pause_s += self.timeline.overlap_s(start_ns, end_ns)
+
+    def _trailing(self, values):
+        # Sum over the trailing window ending with each bin, from one cumulative sum
+        window = max(1, int(round(self.window_s / self.timeline.bin_s)))
+        cumulative = np.concatenate([[0.0], np.cumsum(values)])
+        lo = np.maximum(np.arange(1, len(values) + 1) - window, 0)
+        return cumulative[1:] - cumulative[lo], window * self.timeline.bin_s
+
+    def columns(self):
+        """
+        Returns:
+            dict: Column name to per-bin array
+        """
+        columns = {}
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for name in self.MEANS:
+                columns[f'keyboard_{name[:-2]}_mean'] = np.where(self._counts[name] > 0,
+                                                                 self._sums[name] / self._counts[name], np.nan)
+            text, window_s = self._trailing(self._totals['text'])
+            keystrokes, _ = self._trailing(self._totals['keystrokes'])
+            corrections, _ = self._trailing(self._totals['correction'])
+            columns['keyboard_wpm'] = text / 5.0 / (window_s / 60.0)
+            columns['keyboard_correction_rate'] = np.where(keystrokes > 0, corrections / keystrokes, np.nan)
+        columns['keyboard_bursts'] = self._totals['burst_start']
+        columns['keyboard_pause_s'] = self._pause_s
+        columns['keyboard_repeats'] = self._totals['repeats']
+        return columns
@@ -0,0 +1,225 @@
+import numpy as np
+import pandas as pd
+
+
+# Gaps between cursor moves at least this long are pauses rather than motion
+PAUSE_S = 0.25
+# Events are timestamped by the listener thread and can bunch up; derivatives use at least this time step
+MIN_STEP_S = 0.001
+KINEMATICS_CHUNK_ROWS = 500000
+
+
+def _previous(values, carried):
+    # values shifted by one, with the value carried over from the previous chunk in front
+    return np.concatenate([[carried], values[:-1]])
+
+
+class Mouse_Kinematics:
+    """
+    Streaming cursor kinematics over the rows of a mouse log.
+
+    Chunks of the log are passed to update() in time order. Every quantity
+    is computed with array operations over the whole chunk, and the few
+    values a chunk needs from the one before (the last move and its
+    derivatives, releases still waiting for a move) are carried over, so
+    the results do not depend on where the log is split.
+
+    Motion is measured between consecutive 'move' events:
+        speed (px/s), the tangential acceleration (px/s^2) and jerk (px/s^3)
+        as its time derivatives, and curvature (rad/px) as the change of
+        heading per pixel travelled. A gap of pause_s or more between moves
+        is a pause and breaks the motion, so the first move after it has no
+        derivatives. Time steps shorter than MIN_STEP_S count as MIN_STEP_S.
+
+    Clicks are measured around 'press' and 'release' events:
+        dwell_s is how long the cursor had been still before a press, and
+        move_latency_s how long after a release the cursor moved again.
+
+    Attributes:
+        pause_s (float): Shortest gap between moves counted as a pause
+    """
+
+    def __init__(self, pause_s=PAUSE_S):
+        self.pause_s = pause_s
+        self._time_ns = None
+        self._x = np.nan
+        self._y = np.nan
+        self._speed = np.nan
+        self._acceleration = np.nan
+        self._heading = np.nan
+        self._waiting_releases = np.empty(0, dtype=np.int64)
+
+    def update(self, time_ns, x, y, event):
+        """
+        Compute the kinematics of the next chunk of the log.
+
+        Args:
+            time_ns (numpy.ndarray): int64 event times on the session timeline, non-decreasing
+            x, y (numpy.ndarray): Cursor position of each event
+            event (numpy.ndarray): 'move', 'press', 'release' or 'scroll' per event
+
+        Returns:
+            dict: DataFrames 'motion' (time_ns, speed, acceleration, jerk, curvature)
+                  per move, 'pauses' (start_ns, end_ns, duration_s, x, y),
+                  'dwell' (time_ns, dwell_s) per press and 'click_to_move'
+                  (time_ns, move_latency_s) per release whose next move has been seen
+        """
+        time_ns = np.asarray(time_ns, dtype=np.int64)
+        event = np.asarray(event)
+        moves = event == 'move'
+        t = time_ns[moves]
+        mx = np.asarray(x, dtype=np.float64)[moves]
+        my = np.asarray(y, dtype=np.float64)[moves]
+
+        carried = self._time_ns is not None
+        previous_t = _previous(t, self._time_ns if carried else 0).astype(np.int64)
+        dt = (t - previous_t) / 1e9
+        if len(t) and not carried:
+            dt[0] = np.nan
+        dx = mx - _previous(mx, self._x)
+        dy = my - _previous(my, self._y)
+        step = np.hypot(dx, dy)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            continuous = (dt >= 0) & (dt < self.pause_s)
+            step_s = np.maximum(dt, MIN_STEP_S)
+            speed = np.where(continuous, step / step_s, np.nan)
+            acceleration = (speed - _previous(speed, self._speed)) / step_s
+            jerk = (acceleration - _previous(acceleration, self._acceleration)) / step_s
+
+            # Moves that stay on the same pixel have no heading; turns are measured from the last one
+            heading = np.where(step > 0, np.arctan2(dy, dx), np.nan)
+            last_heading = pd.Series(np.concatenate([[self._heading], heading])).ffill().to_numpy()
+            turn = np.angle(np.exp(1j * (heading - last_heading[:-1])))
+            curvature = np.where(continuous & (step > 0), np.abs(turn) / step, np.nan)
+
+        # Gaps long enough to be pauses, placed where the cursor rested
+        gap = np.flatnonzero(dt >= self.pause_s)
+        pauses = pd.DataFrame({
+            'start_ns': previous_t[gap],
+            'end_ns': t[gap],
+            'duration_s': dt[gap],
+            'x': _previous(mx, self._x)[gap],
+            'y': _previous(my, self._y)[gap],
+        })
+
+        # Moves known so far, including the last one of the previous chunk
+        known_moves = np.concatenate([[self._time_ns], t]) if carried else t
+
+        presses = time_ns[event == 'press']
+        last_move = np.searchsorted(known_moves, presses, side='right') - 1
+        dwell = np.where(last_move >= 0, (presses - known_moves[np.maximum(last_move, 0)]) / 1e9, np.nan)
+
+        releases = np.concatenate([self._waiting_releases, time_ns[event == 'release']])
+        next_move = np.searchsorted(t, releases, side='right')
+        answered = next_move < len(t)
+        latency = (t[next_move[answered]] - releases[answered]) / 1e9
+        self._waiting_releases = releases[~answered]
+
+        if len(t):
+            self._time_ns = int(t[-1])
+            self._x, self._y = mx[-1], my[-1]
+            self._speed = speed[-1]
+            self._acceleration = acceleration[-1]
+            self._heading = last_heading[-1]
+
+        return {
+            'motion': pd.DataFrame({'time_ns': t, 'speed': speed, 'acceleration': acceleration,
+                                    'jerk': jerk, 'curvature': curvature}),
+            'pauses': pauses,
+            'dwell': pd.DataFrame({'time_ns': presses, 'dwell_s': dwell}),
+            'click_to_move': pd.DataFrame({'time_ns': releases[answered], 'move_latency_s': latency}),
+        }
+
+
+def iter_mouse_chunks(mouse_log, chunk_rows=KINEMATICS_CHUNK_ROWS):
+    """
+    Read a mouse_log.csv in chunks as arrays on the session timeline.
+
+    Yields:
+        tuple: (time_ns, x, y, event) arrays of one chunk; rows without a
+               parseable time are dropped
+    """
+    for chunk in pd.read_csv(mouse_log, usecols=['time', 'x', 'y', 'event'], chunksize=chunk_rows):
+        times = pd.to_datetime(chunk['time'].astype(str), errors='coerce', format='ISO8601')
+        time_ns = times.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        valid = ~times.isna().to_numpy()
+        yield (time_ns[valid], chunk['x'].to_numpy(dtype=np.float64)[valid],
+               chunk['y'].to_numpy(dtype=np.float64)[valid], chunk['event'].to_numpy()[valid])
+
+
+def mouse_kinematics(mouse_log, pause_s=PAUSE_S, chunk_rows=KINEMATICS_CHUNK_ROWS):
+    """
+    Kinematics of a whole mouse log, streamed in chunks.
+
+    Yields:
+        dict: The results of Mouse_Kinematics.update for each chunk
+    """
+    kinematics = Mouse_Kinematics(pause_s)
+    for chunk in iter_mouse_chunks(mouse_log, chunk_rows):
+        yield kinematics.update(*chunk)
+
+
+class Kinematic_Windows:
+    """
+    Per-bin summary of mouse kinematics on a fixed-rate timeline.
+
+    Results of Mouse_Kinematics.update are added chunk by chunk. Means and
+    maxima are over the moves in each bin, pause time is the part of every
+    pause that overlaps the bin, and click measures are averaged over the
+    clicks in the bin.
+
+    Attributes:
+        timeline: Feature_Fusion.Timeline the bins come from
+    """
+
+    MEANS = {
+        'mouse_speed_mean': ('motion', 'speed', False),
+        'mouse_acceleration_abs_mean': ('motion', 'acceleration', True),
+        'mouse_jerk_abs_mean': ('motion', 'jerk', True),
+        'mouse_curvature_mean': ('motion', 'curvature', False),
+        'mouse_click_dwell_mean': ('dwell', 'dwell_s', False),
+        'mouse_click_to_move_mean': ('click_to_move', 'move_latency_s', False),
+    }
+
+    def __init__(self, timeline):
+        self.timeline = timeline
+        bins = timeline.bins
+        self._sums = {name: np.zeros(bins) for name in self.MEANS}
+        self._counts = {name: np.zeros(bins) for name in self.MEANS}
+        self._speed_max = np.full(bins, np.nan)
+        self._pause_s = np.zeros(bins)
+        self._pauses = np.zeros(bins)
+
+    def add(self, results):
+        bins = self.timeline.bins
+        for name, (table, column, absolute) in self.MEANS.items():
+            frame = results[table]
+            index, kept = self.timeline.assign(frame['time_ns'].to_numpy(dtype=np.int64))
+            values = frame[column].to_numpy(dtype=np.float64)[kept]
+            values = np.abs(values) if absolute else values
+            finite = np.isfinite(values)
+            self._sums[name] += np.bincount(index[finite], weights=values[finite], minlength=bins)
+            self._counts[name] += np.bincount(index[finite], minlength=bins)
+            if name == 'mouse_speed_mean' and finite.any():
+                np.fmax.at(self._speed_max, index[finite], values[finite])
+
+        pauses = results['pauses']
+        if len(pauses):
+            self._pause_s += self.timeline.overlap_s(pauses['start_ns'].to_numpy(), pauses['end_ns'].to_numpy())
+            index, _ = self.timeline.assign(pauses['start_ns'].to_numpy(dtype=np.int64))
+            self._pauses += np.bincount(index, minlength=bins)
+
+    def columns(self):
+        """
+        Returns:
+            dict: Column name to per-bin array
+        """
+        columns = {}
+        for name in self.MEANS:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                columns[name] = np.where(self._counts[name] > 0, self._sums[name] / self._counts[name], np.nan)
+        columns['mouse_speed_max'] = self._speed_max
+        columns['mouse_pause_s'] = self._pause_s
+        columns['mouse_pauses'] = self._pauses
+        return columns
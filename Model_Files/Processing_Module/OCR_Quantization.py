@@ -0,0 +1,256 @@
+import os
+import copy
+import json
+import cv2
+import numpy as np
+import easyocr
+import torch
+from easyocr.imgproc import resize_aspect_ratio, normalizeMeanVariance
+
+
+# 'standard' keeps EasyOCR's defaults, 'fp32' switches all quantization off and
+# 'int8' adds a statically quantized text detector to the int8 recognizer
+OCR_INFERENCE_MODES = ('standard', 'fp32', 'int8')
+QUANTIZED_FOLDER_NAME = 'quantized'
+CALIBRATION_FRAMES = 8
+CORPUS_FRAMES = 16
+CANVAS_SIZE = 2560  # EasyOCR readtext default
+
+CORPUS_WORDS = [
+    'File', 'Edit', 'View', 'Terminal', 'Help', 'import', 'return', 'def', 'class', 'self',
+    'session', 'recording', 'attention', 'memory', 'keyboard', 'cursor', 'window', 'browser',
+    'Search', 'Settings', 'Open', 'Save', 'Cancel', 'OK', 'error:', 'line', '2025', '42',
+    '3.14', 'v1.7.2', 'model_data', 'README.md', 'https://example.com', 'Inbox', '(12)',
+]
+
+
+def text_corpus(count=CORPUS_FRAMES, resolution=(1280, 720), seed=0):
+    """
+    Render a fixed corpus of screen-like text frames with known contents.
+
+    Frames mix fonts, sizes and dark-on-light and light-on-dark themes so
+    both calibration and accuracy checks see the range of text a screen
+    capture holds. The same arguments always give the same corpus.
+
+    Args:
+        count (int): Number of frames
+        resolution (tuple): (width, height)
+        seed (int): Random seed
+
+    Returns:
+        list: (BGR frame, list of the text lines drawn on it) per frame
+    """
+    rng = np.random.default_rng(seed)
+    fonts = [cv2.FONT_HERSHEY_SIMPLEX, cv2.FONT_HERSHEY_DUPLEX, cv2.FONT_HERSHEY_COMPLEX]
+    width, height = resolution
+    corpus = []
+    for _ in range(count):
+        dark_theme = rng.random() < 0.4
+        background, foreground = ((30, 30, 30), (220, 220, 220)) if dark_theme else ((245, 245, 245), (20, 20, 20))
+        frame = np.full((height, width, 3), background, dtype=np.uint8)
+        font = fonts[rng.integers(len(fonts))]
+        scale = rng.uniform(0.6, 1.2)
+        line_height = int(40 * scale)
+
+        lines = []
+        y = line_height
+        while y < height - 10:
+            text = ' '.join(rng.choice(CORPUS_WORDS, size=rng.integers(2, 6)))
+            (text_width, _), _ = cv2.getTextSize(text, font, scale, 1)
+            if text_width < width - 20:
+                cv2.putText(frame, text, (10, y), font, scale, foreground, 1 + int(scale > 1), cv2.LINE_AA)
+                lines.append(text)
+            y += line_height
+        corpus.append((frame, lines))
+    return corpus
+
+
+def detector_input(frame, canvas_size=CANVAS_SIZE, mag_ratio=1.0):
+    """
+    Preprocess a frame the way EasyOCR does before running the text detector.
+
+    Returns:
+        torch.Tensor: Normalized (1, 3, H, W) float32 batch
+    """
+    resized, _, _ = resize_aspect_ratio(frame, canvas_size, interpolation=cv2.INTER_LINEAR, mag_ratio=mag_ratio)
+    return torch.from_numpy(np.transpose(normalizeMeanVariance(resized), (2, 0, 1))[np.newaxis].copy())
+
+
+def quantize_detector(detector, calibration_inputs):
+    """
+    Statically quantize EasyOCR's CRAFT text detector to int8.
+
+    EasyOCR's own quantization is dynamic, which only covers linear and LSTM
+    layers, so the convolutions that dominate the detector stay fp32. Here
+    the whole network is quantized with FX graph mode, calibrated on the
+    given inputs, and traced so it can be saved and reloaded without FX.
+
+    Args:
+        detector (torch.nn.Module): fp32 CRAFT detector
+        calibration_inputs (list): Preprocessed batches from detector_input
+
+    Returns:
+        torch.jit.ScriptModule: int8 detector returning the same outputs as CRAFT
+    """
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+    model = copy.deepcopy(detector).eval()
+    qconfig_mapping = get_default_qconfig_mapping(torch.backends.quantized.engine)
+    prepared = prepare_fx(model, qconfig_mapping, example_inputs=(calibration_inputs[0],))
+    with torch.no_grad():
+        for batch in calibration_inputs:
+            prepared(batch)
+        quantized = convert_fx(prepared)
+        return torch.jit.trace(quantized, calibration_inputs[0], check_trace=False)
+
+
+def _edit_distance(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def character_error_rate(reader, corpus):
+    """
+    Character error rate of a reader on a text corpus.
+
+    Detections are put in reading order and compared with the drawn lines,
+    ignoring differences in whitespace.
+
+    Args:
+        reader (easyocr.Reader): Reader to evaluate
+        corpus (list): (frame, lines) pairs from text_corpus
+
+    Returns:
+        float: Edit distance over the number of expected characters
+    """
+    errors = 0
+    expected_chars = 0
+    for frame, lines in corpus:
+        detections = reader.readtext(frame)
+        # Row of the box centre first, then left edge
+        detections.sort(key=lambda d: (round(np.mean([p[1] for p in d[0]]) / 10), d[0][0][0]))
+        predicted = ' '.join(' '.join(text.split()) for _, text, _ in detections)
+        expected = ' '.join(lines)
+        errors += _edit_distance(expected, predicted)
+        expected_chars += len(expected)
+    return errors / max(expected_chars, 1)
+
+
+def load_int8_detector(reader, cache_dir=None, max_cer_increase=0.02):
+    """
+    Int8 text detector for a reader, converted on first use and cached on disk.
+
+    A new conversion is checked against the fp32 detector on a held-out part
+    of the text corpus and rejected if it raises the character error rate by
+    more than max_cer_increase. The check's result is saved in the cache
+    either way, so a rejected conversion is not retried on every start for
+    the same engine and torch version unless max_cer_increase is raised
+    enough for the saved error rates to pass.
+
+    Args:
+        reader (easyocr.Reader): CPU reader whose detector is converted
+        cache_dir (str, optional): Folder for converted models; defaults to a
+                                   'quantized' folder in EasyOCR's model folder
+        max_cer_increase (float): Largest accepted rise in character error rate
+
+    Returns:
+        torch.jit.ScriptModule: The int8 detector
+
+    Raises:
+        ValueError: If the int8 detector fails the accuracy check, now or in an earlier run
+    """
+    cache_dir = cache_dir or os.path.join(reader.model_storage_directory, QUANTIZED_FOLDER_NAME)
+    engine = torch.backends.quantized.engine
+    model_path = os.path.join(cache_dir, f'craft_int8_{engine}_torch{torch.__version__}.pt')
+    report_path = f'{os.path.splitext(model_path)[0]}.json'
+    if os.path.exists(model_path):
+        return torch.jit.load(model_path)
+
+    previous = _load_report(report_path)
+    if previous is not None and previous['int8_cer'] > previous['fp32_cer'] + max_cer_increase:
+        raise ValueError(f"Int8 detector was rejected for {engine} on torch {previous['torch']}: CER "
+                         f"{previous['int8_cer']:.4f} against {previous['fp32_cer']:.4f} for fp32 (see {report_path})")
+
+    print(f"Converting the OCR text detector to int8 ({engine}), this happens once")
+    corpus = text_corpus()
+    calibration, held_out = corpus[:CALIBRATION_FRAMES], corpus[CALIBRATION_FRAMES:]
+    quantized = quantize_detector(reader.detector, [detector_input(frame) for frame, _ in calibration])
+
+    fp32_detector = reader.detector
+    fp32_cer = character_error_rate(reader, held_out)
+    reader.detector = quantized
+    try:
+        int8_cer = character_error_rate(reader, held_out)
+    finally:
+        reader.detector = fp32_detector
+
+    accepted = int8_cer <= fp32_cer + max_cer_increase
+    report = {'engine': engine, 'torch': torch.__version__, 'fp32_cer': fp32_cer, 'int8_cer': int8_cer,
+              'max_cer_increase': max_cer_increase, 'accepted': accepted}
+    print(f"Int8 detector character error rate {int8_cer:.4f} (fp32 {fp32_cer:.4f})")
+    os.makedirs(cache_dir, exist_ok=True)
+    if not accepted:
+        _save_report(report, report_path)
+        raise ValueError(f"Int8 detector loses too much accuracy: CER {int8_cer:.4f} against {fp32_cer:.4f} for fp32")
+
+    # Publish with an atomic rename so an interrupted conversion is never loaded
+    temp_path = f'{model_path}.tmp'
+    torch.jit.save(quantized, temp_path)
+    os.replace(temp_path, model_path)
+    _save_report(report, report_path)
+    return quantized
+
+
+def _load_report(report_path):
+    # A missing or damaged report only costs checking the conversion again
+    try:
+        with open(report_path, 'r') as f:
+            report = json.load(f)
+        return {'torch': report['torch'], 'fp32_cer': float(report['fp32_cer']), 'int8_cer': float(report['int8_cer'])}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _save_report(report, report_path):
+    temp_path = f'{report_path}.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    os.replace(temp_path, report_path)
+
+
+def create_reader(mode='standard', languages=('en',)):
+    """
+    EasyOCR reader using the given inference mode.
+
+    Int8 inference only applies on CPU. If the detector cannot be converted
+    or fails the accuracy check, the reader keeps its fp32 detector.
+
+    Args:
+        mode (str): One of OCR_INFERENCE_MODES
+        languages (tuple): EasyOCR language codes
+
+    Returns:
+        easyocr.Reader: The reader
+    """
+    if mode not in OCR_INFERENCE_MODES:
+        raise ValueError(f"Unknown ocr_inference mode '{mode}'; expected one of {OCR_INFERENCE_MODES}")
+
+    if mode == 'standard':
+        return easyocr.Reader(list(languages))
+
+    reader = easyocr.Reader(list(languages), quantize=mode == 'int8')
+    if mode == 'int8':
+        if reader.device != 'cpu':
+            print(f"Int8 OCR inference only runs on CPU, using the fp32 detector on {reader.device}")
+            return reader
+        try:
+            reader.detector = load_int8_detector(reader)
+        except Exception as e:
+            print(f"⚠️ Int8 text detector unavailable, using fp32: {e}")
+    return reader
@@ -0,0 +1,140 @@
+import os
+import numpy as np
+import pandas as pd
+from ..Session_Index import session_start_ns
+
+
+VIDEO_FPS = 28.8
+SAMPLING_MODES = ('fixed', 'events')
+
+# How strongly an input event predicts a screen change worth reading, by log file and event
+EVENT_WEIGHTS = {
+    'keyboard_log.csv': {'press': 1.0},
+    'mouse_log.csv': {'press': 3.0, 'scroll': 2.0, 'move': 0.02},
+}
+
+# Screens redraw shortly after the input that changes them
+RESPONSE_DELAY_S = 0.1
+
+
+def load_input_events(session_folder, fps=VIDEO_FPS, time_offset_s=0.0):
+    """
+    Positions of a session's keyboard and mouse events on its screen capture.
+
+    Args:
+        session_folder (str): Recording session folder holding the input logs
+        fps (float): Frame rate of the screen capture
+        time_offset_s (float): Start of the capture in seconds since the session
+                               start, e.g. for one segment of a segmented recording
+
+    Returns:
+        tuple: (frame positions as float64, weight of each event); both empty
+               when the session has no input logs or its start time is unknown
+    """
+    if session_folder is None:
+        return np.empty(0), np.empty(0)
+    try:
+        start_ns = session_start_ns(session_folder)
+    except ValueError:
+        return np.empty(0), np.empty(0)
+
+    positions, weights = [], []
+    for filename, event_weights in EVENT_WEIGHTS.items():
+        log_path = os.path.join(session_folder, filename)
+        if not os.path.exists(log_path) or os.path.getsize(log_path) == 0:
+            continue
+        events = pd.read_csv(log_path, usecols=['time', 'event'])
+        events = events[events['event'].isin(list(event_weights))]
+        if events.empty:
+            continue
+        times_ns = pd.to_datetime(events['time']).to_numpy(dtype='datetime64[ns]').view(np.int64)
+        positions.append(((times_ns - start_ns) / 1e9 - time_offset_s) * fps)
+        weights.append(events['event'].map(event_weights).to_numpy(dtype=np.float64))
+
+    if not positions:
+        return np.empty(0), np.empty(0)
+    return np.concatenate(positions), np.concatenate(weights)
+
+
+def plan_event_samples(frame_count, event_frames, event_weights, budget, idle_share=0.25,
+                       decay_s=1.0, min_gap_frames=3, fps=VIDEO_FPS):
+    """
+    Choose which frames to OCR so samples follow the user's input activity.
+
+    Each input event adds a burst of sampling density that starts just after
+    it and decays exponentially, so keystroke bursts, clicks and scrolls are
+    followed by dense samples. A share of the budget is spread evenly over
+    the whole capture to keep watching idle stretches. Samples are placed at
+    equal steps of the cumulative density.
+
+    Args:
+        frame_count (int): Frames in the screen capture
+        event_frames (numpy.ndarray): Frame position of each input event
+        event_weights (numpy.ndarray): Weight of each input event
+        budget (int): Most frames to OCR
+        idle_share (float): Fraction of the budget spread evenly over time
+        decay_s (float): Time constant of the density following an event
+        min_gap_frames (int): Fewest frames between two samples
+        fps (float): Frame rate of the screen capture
+
+    Returns:
+        numpy.ndarray: Sorted frame indices to OCR, always including frame 0,
+                       at most budget of them and at least min_gap_frames apart
+    """
+    if frame_count <= 0:
+        return np.empty(0, dtype=np.int64)
+    budget = int(min(max(budget, 1), frame_count))
+
+    inside = (event_frames >= 0) & (event_frames < frame_count)
+    activity = np.bincount(event_frames[inside].astype(np.int64), weights=event_weights[inside],
+                           minlength=frame_count)
+
+    density = np.full(frame_count, 1.0 / frame_count)
+    if activity.sum() > 0:
+        delay = int(round(RESPONSE_DELAY_S * fps))
+        kernel = np.concatenate([np.zeros(delay), np.exp(-np.arange(int(5 * decay_s * fps) + 1) / (decay_s * fps))])
+        activity = np.convolve(activity, kernel)[:frame_count]
+        density = idle_share * density + (1 - idle_share) * activity / activity.sum()
+
+    # Frame 0 is always sampled, so the remaining samples split the rest of the budget
+    cdf = np.cumsum(density)
+    cdf *= budget / cdf[-1]
+    candidates = np.unique(np.searchsorted(cdf, np.arange(1, budget)))
+
+    samples = [0]
+    for frame_idx in candidates[candidates < frame_count]:
+        if frame_idx - samples[-1] >= min_gap_frames:
+            samples.append(int(frame_idx))
+    return np.asarray(samples, dtype=np.int64)
+
+
+def ocr_sample_frames(session_folder, frame_count, mode='fixed', frame_interval=10, samples_per_minute=90,
+                      idle_share=0.25, decay_s=1.0, min_gap_frames=3, fps=VIDEO_FPS, time_offset_s=0.0):
+    """
+    Frames of a session's screen capture to run OCR on.
+
+    Takes the "ocr_sampling" settings from config.json as keyword arguments.
+    'fixed' samples every frame_interval-th frame. 'events' spends a budget of
+    samples_per_minute over the capture, placed by plan_event_samples from the
+    session's keyboard and mouse logs; sessions without input logs are
+    sampled evenly within the same budget.
+
+    Args:
+        session_folder (str): Recording session folder; None when the input logs
+                              are not available yet, e.g. while still recording
+        frame_count (int): Frames in the screen capture
+        mode (str): 'fixed' or 'events'
+        time_offset_s (float): Start of the capture in seconds since the session start
+
+    Returns:
+        numpy.ndarray: Sorted frame indices to OCR
+    """
+    if mode not in SAMPLING_MODES:
+        raise ValueError(f"Unknown OCR sampling mode '{mode}'; expected one of {SAMPLING_MODES}")
+    if mode == 'fixed':
+        return np.arange(0, frame_count, frame_interval, dtype=np.int64)
+
+    budget = int(np.ceil(samples_per_minute * frame_count / fps / 60))
+    event_frames, event_weights = load_input_events(session_folder, fps, time_offset_s)
+    return plan_event_samples(frame_count, event_frames, event_weights, budget,
+                              idle_share, decay_s, min_gap_frames, fps)
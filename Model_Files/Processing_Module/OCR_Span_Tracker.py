@@ -0,0 +1,174 @@
+import heapq
+import itertools
+import numpy as np
+from difflib import SequenceMatcher
+
+
+SPANS_NAME = 'ocr_spans'
+
+
+def bbox_rectangles(bboxes):
+    """
+    Convert EasyOCR quadrilaterals into axis-aligned rectangles.
+
+    Args:
+        bboxes (list): Boxes as four (x, y) corner points each
+
+    Returns:
+        numpy.ndarray: (n, 4) array of x0, y0, x1, y1
+    """
+    if len(bboxes) == 0:
+        return np.empty((0, 4), dtype=np.float64)
+    corners = np.asarray(bboxes, dtype=np.float64).reshape(len(bboxes), -1, 2)
+    return np.concatenate([corners.min(axis=1), corners.max(axis=1)], axis=1)
+
+
+def pairwise_iou(a, b):
+    """
+    Intersection over union between every rectangle in a and every rectangle in b.
+
+    Returns:
+        numpy.ndarray: (len(a), len(b)) IoU matrix
+    """
+    x0 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y0 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x1 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y1 = np.minimum(a[:, None, 3], b[None, :, 3])
+    intersection = np.clip(x1 - x0, 0, None) * np.clip(y1 - y0, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def text_similarity(a, b):
+    """
+    Similarity ratio between two strings, from 0 (unrelated) to 1 (identical).
+    """
+    if a == b:
+        return 1.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+class OCR_Span_Tracker:
+    """
+    Collapses per-frame OCR detections into spans of persistent on-screen text.
+
+    Each sampled frame's detections are matched against the currently open
+    spans by bounding-box IoU and text similarity. A matched detection extends
+    its span, an unmatched one opens a new span, and a span that has not been
+    matched for longer than max_gap seconds is closed. A span records the text
+    and box of its most confident detection:
+
+        {'text', 'bbox', 't_start', 't_end', 'max_conf', 'frames'}
+
+    Closed spans are released in t_start order, so they can be written
+    straight to an OCR_Writer and indexed by their start time.
+
+    Attributes:
+        iou_threshold (float): Minimum box IoU for a detection to continue a span
+        text_threshold (float): Minimum text similarity for a detection to continue a span
+        max_gap (float): Seconds a span may go unseen before it is closed
+    """
+
+    def __init__(self, iou_threshold=0.5, text_threshold=0.8, max_gap=1.0):
+        self.iou_threshold = iou_threshold
+        self.text_threshold = text_threshold
+        self.max_gap = max_gap
+
+        self._open = []
+        self._closed = []
+        self._counter = itertools.count()
+
+    def update(self, timestamp, detections):
+        """
+        Feed the OCR detections of one sampled frame.
+
+        Args:
+            timestamp (float): Seconds since the start of the capture
+            detections (list): EasyOCR (bbox, text, confidence) tuples
+
+        Returns:
+            list: (t_start, spans) groups that are complete and ready to write
+        """
+        # Spans unseen for longer than max_gap are closed before matching, so a
+        # reappearing text starts a new span instead of bridging the gap
+        still_open = []
+        for span in self._open:
+            if timestamp - span['t_end'] <= self.max_gap:
+                still_open.append(span)
+            else:
+                self._close(span)
+        self._open = still_open
+
+        matched_spans = set()
+        matched_detections = set()
+
+        if self._open and detections:
+            iou = pairwise_iou(
+                bbox_rectangles([span['bbox'] for span in self._open]),
+                bbox_rectangles([bbox for bbox, _, _ in detections]))
+
+            # Text similarity is only computed for pairs whose boxes overlap enough
+            candidates = []
+            for i, j in zip(*np.nonzero(iou >= self.iou_threshold)):
+                similarity = text_similarity(self._open[i]['text'], detections[j][1])
+                if similarity >= self.text_threshold:
+                    candidates.append((iou[i, j] + similarity, i, j))
+
+            # Greedy assignment, best combined score first
+            for _, i, j in sorted(candidates, reverse=True):
+                if i in matched_spans or j in matched_detections:
+                    continue
+                matched_spans.add(i)
+                matched_detections.add(j)
+                self._extend(self._open[i], timestamp, detections[j])
+
+        for j, (bbox, text, conf) in enumerate(detections):
+            if j not in matched_detections:
+                self._open.append({
+                    'text': text,
+                    'bbox': bbox,
+                    't_start': timestamp,
+                    't_end': timestamp,
+                    'max_conf': conf,
+                    'frames': 1,
+                })
+
+        return self._release()
+
+    def finish(self):
+        """
+        Close every open span.
+
+        Returns:
+            list: The remaining (t_start, spans) groups
+        """
+        for span in self._open:
+            self._close(span)
+        self._open = []
+        return self._release()
+
+    def _extend(self, span, timestamp, detection):
+        bbox, text, conf = detection
+        span['t_end'] = timestamp
+        span['frames'] += 1
+        if conf > span['max_conf']:
+            span['max_conf'] = conf
+            span['text'] = text
+            span['bbox'] = bbox
+
+    def _close(self, span):
+        heapq.heappush(self._closed, (span['t_start'], next(self._counter), span))
+
+    def _release(self):
+        # A closed span may only be released once no open span started before it
+        horizon = min((span['t_start'] for span in self._open), default=float('inf'))
+        groups = []
+        while self._closed and self._closed[0][0] <= horizon:
+            t_start, _, span = heapq.heappop(self._closed)
+            if groups and groups[-1][0] == t_start:
+                groups[-1][1].append(span)
+            else:
+                groups.append((t_start, [span]))
+        return groups
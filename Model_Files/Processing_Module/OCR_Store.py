@@ -0,0 +1,250 @@
+import os
+import json
+import numpy as np
+from pathlib import Path
+from numpyencoder import NumpyEncoder
+
+
+OUTPUT_NAME = 'ocr_output'
+RECORDS_SUFFIX = '.jsonl'
+INDEX_SUFFIX = '.idx'
+PARTIAL_SUFFIX = '.partial'
+
+# One index entry per sampled frame: its timestamp and the byte offset of its first record
+INDEX_DTYPE = np.dtype([('timestamp', '<f8'), ('offset', '<i8')])
+
+
+def records_path(output_dir, name=OUTPUT_NAME):
+    return Path(output_dir) / f'{name}{RECORDS_SUFFIX}'
+
+
+def index_path(output_dir, name=OUTPUT_NAME):
+    return Path(output_dir) / f'{name}{INDEX_SUFFIX}'
+
+
+class OCR_Writer:
+    """
+    Append-only writer for OCR results.
+
+    Records are written as one JSON object per line, and every sampled frame
+    appends a fixed-width (timestamp, byte offset) entry to a binary index
+    beside them. Both files are written under a '.partial' suffix and renamed
+    into place on close, so readers only ever see complete output and no
+    second pass over the records is needed.
+
+    Attributes:
+        output_dir (Path): Folder receiving the output
+        batch_size (int): Number of buffered records that triggers a write
+    """
+
+    def __init__(self, output_dir, name=OUTPUT_NAME, batch_size=100):
+        """
+        Args:
+            output_dir (str): Folder receiving the output
+            name (str): Base filename for the records and index files
+            batch_size (int): Number of buffered records that triggers a write
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.name = name
+        self.batch_size = batch_size
+
+        self._records_path = records_path(self.output_dir, name)
+        self._index_path = index_path(self.output_dir, name)
+        self._records_file = open(f'{self._records_path}{PARTIAL_SUFFIX}', 'wb')
+        self._index_file = open(f'{self._index_path}{PARTIAL_SUFFIX}', 'wb')
+
+        self._offset = 0
+        self._buffer = []
+        self._index_buffer = []
+        self._last_timestamp = None
+
+    def write_frame(self, timestamp, records):
+        """
+        Append the records of one sampled frame.
+
+        Frames must be written in non-decreasing timestamp order. A frame
+        without records is still indexed, so readers know it was sampled.
+
+        Args:
+            timestamp (float): Seconds since the start of the capture
+            records (list): JSON-serializable dicts for this frame
+        """
+        if self._last_timestamp is not None and timestamp < self._last_timestamp:
+            raise ValueError(f'OCR frames must be written in time order ({timestamp} < {self._last_timestamp})')
+        self._last_timestamp = timestamp
+
+        self._index_buffer.append((timestamp, self._offset))
+        for record in records:
+            line = (json.dumps(record, cls=NumpyEncoder) + '\n').encode('utf-8')
+            self._buffer.append(line)
+            self._offset += len(line)
+
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write buffered records, then the index entries that point at them.
+        """
+        if self._buffer:
+            self._records_file.write(b''.join(self._buffer))
+            self._buffer.clear()
+            self._records_file.flush()
+        if self._index_buffer:
+            self._index_file.write(np.array(self._index_buffer, dtype=INDEX_DTYPE).tobytes())
+            self._index_buffer.clear()
+            self._index_file.flush()
+
+    def close(self):
+        """
+        Flush remaining output and atomically move both files into place.
+        """
+        if self._records_file.closed:
+            return
+        self.flush()
+        self._records_file.close()
+        self._index_file.close()
+        os.replace(f'{self._records_path}{PARTIAL_SUFFIX}', self._records_path)
+        os.replace(f'{self._index_path}{PARTIAL_SUFFIX}', self._index_path)
+
+    def abort(self):
+        """
+        Close without publishing and remove the '.partial' files.
+        """
+        if not self._records_file.closed:
+            self._records_file.close()
+            self._index_file.close()
+        for path in (self._records_path, self._index_path):
+            if os.path.exists(f'{path}{PARTIAL_SUFFIX}'):
+                os.remove(f'{path}{PARTIAL_SUFFIX}')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class OCR_Reader:
+    """
+    Reader for output written by OCR_Writer.
+
+    The index is small enough to load whole; a time-range read is a binary
+    search over it followed by one seek and one read of the records file.
+
+    Attributes:
+        output_dir (Path): Folder holding the output
+        index (numpy.ndarray): Structured array of (timestamp, offset) per sampled frame
+    """
+
+    def __init__(self, output_dir, name=OUTPUT_NAME):
+        """
+        Args:
+            output_dir (str): Folder holding the output
+            name (str): Base filename used by the writer
+        """
+        self.output_dir = Path(output_dir)
+        self.path = records_path(self.output_dir, name)
+        idx_path = index_path(self.output_dir, name)
+        if not self.path.exists() or not idx_path.exists():
+            raise FileNotFoundError(f'No indexed OCR output named {name} in {output_dir}')
+
+        self.index = np.fromfile(idx_path, dtype=INDEX_DTYPE)
+        self._size = self.path.stat().st_size
+
+    @property
+    def timestamps(self):
+        """
+        Timestamps of every sampled frame, including frames without text.
+        """
+        return self.index['timestamp']
+
+    def _span(self, t0, t1):
+        timestamps = self.index['timestamp']
+        lo = 0 if t0 is None else int(np.searchsorted(timestamps, t0, side='left'))
+        hi = len(timestamps) if t1 is None else int(np.searchsorted(timestamps, t1, side='right'))
+        return lo, max(lo, hi)
+
+    def _byte_range(self, lo, hi):
+        offsets = self.index['offset']
+        start = int(offsets[lo]) if lo < len(offsets) else self._size
+        end = int(offsets[hi]) if hi < len(offsets) else self._size
+        return start, end
+
+    def read(self, t0=None, t1=None):
+        """
+        Read the records of all frames sampled in [t0, t1].
+
+        Args:
+            t0, t1 (float, optional): Inclusive bounds in seconds since the
+                                      start of the capture; None leaves that side open
+
+        Returns:
+            list: Record dicts in time order
+        """
+        start, end = self._byte_range(*self._span(t0, t1))
+        if end <= start:
+            return []
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            raw = f.read(end - start)
+        return [json.loads(line) for line in raw.splitlines() if line.strip()]
+
+    def iter_frames(self, t0=None, t1=None):
+        """
+        Yield each sampled frame in [t0, t1] with its records.
+
+        Yields:
+            tuple: (timestamp, list of record dicts)
+        """
+        lo, hi = self._span(t0, t1)
+        with open(self.path, 'rb') as f:
+            for i in range(lo, hi):
+                start, end = self._byte_range(i, i + 1)
+                if end <= start:
+                    yield float(self.index['timestamp'][i]), []
+                    continue
+                f.seek(start)
+                raw = f.read(end - start)
+                yield float(self.index['timestamp'][i]), [json.loads(line) for line in raw.splitlines() if line.strip()]
+
+
+# Record fields holding seconds since the start of the capture
+TIME_FIELDS = ('timestamp', 't_start', 't_end')
+
+
+def merge_outputs(parts, output_dir, name=OUTPUT_NAME, batch_size=100):
+    """
+    Join the OCR output of consecutive recording segments into one output.
+
+    Each part's times are counted from the start of its segment and are
+    shifted by the part's offset, so the merged output is timed like that of
+    an unsegmented capture. Parts without output of this name are skipped.
+
+    Args:
+        parts (list): (output folder, offset in seconds) per segment, in time order
+        output_dir (str): Folder receiving the merged output
+        name (str): Base filename of the output to merge
+        batch_size (int): Number of buffered records that triggers a write
+
+    Returns:
+        bool: Whether any part had output to merge
+    """
+    parts = [(part_dir, offset) for part_dir, offset in parts
+             if records_path(part_dir, name).exists() and index_path(part_dir, name).exists()]
+    if not parts:
+        return False
+
+    with OCR_Writer(output_dir, name=name, batch_size=batch_size) as writer:
+        for part_dir, offset in parts:
+            for timestamp, records in OCR_Reader(part_dir, name).iter_frames():
+                for record in records:
+                    for field in TIME_FIELDS:
+                        if field in record:
+                            record[field] += offset
+                writer.write_frame(timestamp + offset, records)
+    return True
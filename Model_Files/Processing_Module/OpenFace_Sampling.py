@@ -0,0 +1,183 @@
+import os
+import cv2
+import numpy as np
+import pandas as pd
+
+
+SAMPLING_METHODS = ('proxy_video', 'image_sequence')
+SUBSAMPLED_NAME = 'webcam_capture'
+
+# Columns copied from the nearest sample instead of interpolated
+DISCRETE_COLUMNS = ('face_id', 'success')
+
+
+def write_subsampled_input(video_path, work_dir, stride, method='proxy_video'):
+    """
+    Write every stride-th frame of a video as OpenFace input.
+
+    'proxy_video' writes the kept frames to a high-quality MJPG video at the
+    reduced frame rate; 'image_sequence' writes them as numbered PNG images.
+    Either is named after SUBSAMPLED_NAME, so OpenFace names its outputs as it
+    would for the original webcam capture.
+
+    Args:
+        video_path (str): Webcam capture to subsample
+        work_dir (str): Folder receiving the subsampled input
+        stride (int): Keep one frame out of this many
+        method (str): One of SAMPLING_METHODS
+
+    Returns:
+        tuple: (OpenFace input arguments, original fps, original frame count)
+    """
+    if method not in SAMPLING_METHODS:
+        raise ValueError(f"Unknown OpenFace sampling method '{method}'; expected one of {SAMPLING_METHODS}")
+
+    capture = cv2.VideoCapture(str(video_path))
+    if not capture.isOpened():
+        raise RuntimeError(f'Could not open {video_path}')
+    fps = capture.get(cv2.CAP_PROP_FPS) or 28.8
+
+    os.makedirs(work_dir, exist_ok=True)
+    if method == 'proxy_video':
+        target = os.path.join(work_dir, f'{SUBSAMPLED_NAME}.avi')
+        arguments = ['-f', target]
+        writer = None
+    else:
+        target = os.path.join(work_dir, SUBSAMPLED_NAME)
+        os.makedirs(target, exist_ok=True)
+        arguments = ['-fdir', target]
+
+    frame_idx = 0
+    kept = 0
+    try:
+        # grab() skips decoding the frames that are dropped
+        while capture.grab():
+            if frame_idx % stride == 0:
+                return_val, frame = capture.retrieve()
+                if not return_val:
+                    break
+                if method == 'proxy_video':
+                    if writer is None:
+                        height, width = frame.shape[:2]
+                        writer = cv2.VideoWriter(target, cv2.VideoWriter_fourcc(*'MJPG'), fps / stride, (width, height))
+                        if not writer.isOpened():
+                            raise RuntimeError(f'Could not write {target}')
+                        writer.set(cv2.VIDEOWRITER_PROP_QUALITY, 95)
+                    writer.write(frame)
+                else:
+                    cv2.imwrite(os.path.join(target, f'frame_{kept:07d}.png'), frame)
+                kept += 1
+            frame_idx += 1
+    finally:
+        capture.release()
+        if method == 'proxy_video' and writer is not None:
+            writer.release()
+
+    return arguments, fps, frame_idx
+
+
+def _read_openface_csv(csv_path):
+    frame = pd.read_csv(csv_path, skipinitialspace=True)
+    frame.columns = [c.strip() for c in frame.columns]
+    return frame
+
+
+def _write_openface_csv(frame, csv_path):
+    # Same ', ' separated header OpenFace writes; values need no padding for skipinitialspace readers
+    temp_path = f'{csv_path}.tmp'
+    with open(temp_path, 'w', newline='') as f:
+        f.write(', '.join(frame.columns) + '\n')
+        frame.to_csv(f, header=False, index=False, float_format='%.7g')
+    os.replace(temp_path, csv_path)
+
+
+def remap_openface_csv(csv_path, stride, fps, frame_count, interpolate=True):
+    """
+    Put OpenFace results for a subsampled input back on the original timeline.
+
+    Row frame numbers and timestamps are rewritten to those of the original
+    frames. With interpolate, a row is written for every original frame:
+    features are linearly interpolated between neighbouring samples when
+    both tracked a face, and copied from the nearest sample otherwise. Face
+    id, success and AU presence are always taken from the nearest sample.
+    The CSV is replaced atomically.
+
+    Args:
+        csv_path (str): OpenFace CSV for the subsampled input
+        stride (int): Stride the input was subsampled with
+        fps (float): Frame rate of the original video
+        frame_count (int): Frames in the original video
+        interpolate (bool): Fill in the frames between samples
+    """
+    sparse = _read_openface_csv(csv_path)
+    if sparse.empty:
+        return
+
+    # OpenFace numbers frames from 1
+    sampled = ((sparse['frame'].to_numpy() - 1) * stride).astype(np.int64)
+    if not interpolate:
+        sparse['frame'] = sampled + 1
+        sparse['timestamp'] = np.round(sampled / fps, 3)
+        _write_openface_csv(sparse, csv_path)
+        return
+
+    order = np.argsort(sampled, kind='stable')
+    sparse, sampled = sparse.iloc[order].reset_index(drop=True), sampled[order]
+    frames = np.arange(frame_count, dtype=np.int64)
+
+    left = np.clip(np.searchsorted(sampled, frames, side='right') - 1, 0, len(sampled) - 1)
+    right = np.minimum(left + 1, len(sampled) - 1)
+    span = (sampled[right] - sampled[left]).astype(np.float64)
+    weight = np.clip(np.divide(frames - sampled[left], span, out=np.zeros(frame_count), where=span > 0), 0, 1)
+    nearest = np.where(weight < 0.5, left, right)
+
+    success = sparse['success'].to_numpy() == 1
+    blend = success[left] & success[right]
+
+    dense = {}
+    for column in sparse.columns:
+        values = sparse[column].to_numpy()
+        if column in DISCRETE_COLUMNS or column.endswith('_c') or not np.issubdtype(values.dtype, np.number):
+            dense[column] = values[nearest]
+        else:
+            interpolated = values[left] + (values[right] - values[left]) * weight
+            dense[column] = np.where(blend, interpolated, values[nearest]).astype(np.float64)
+
+    dense['frame'] = frames + 1
+    dense['timestamp'] = np.round(frames / fps, 3)
+    _write_openface_csv(pd.DataFrame(dense, columns=sparse.columns), csv_path)
+
+
+def merge_openface_segments(parts, csv_path):
+    """
+    Join the OpenFace CSVs of consecutive recording segments into one CSV.
+
+    Frame numbers continue across segments and timestamps are placed on the
+    session timeline using each segment's offset and measured frame rate.
+    Segments without a CSV still count their frames, so frame numbers stay
+    those of the recording.
+
+    Args:
+        parts (list): (CSV path, fps, offset in seconds, frame count) per segment, in time order
+        csv_path (str): Merged CSV to write
+
+    Returns:
+        bool: Whether any segment had results to merge
+    """
+    frames = []
+    first_frame = 0
+    for part_csv, fps, offset_s, frame_count in parts:
+        if os.path.exists(part_csv):
+            part = _read_openface_csv(part_csv)
+            if not part.empty:
+                local = part['frame'].to_numpy() - 1
+                part['frame'] = local + first_frame + 1
+                part['timestamp'] = np.round(offset_s + local / fps, 3)
+                frames.append(part)
+        first_frame += frame_count
+
+    if not frames:
+        return False
+    os.makedirs(os.path.dirname(str(csv_path)) or '.', exist_ok=True)
+    _write_openface_csv(pd.concat(frames, ignore_index=True), csv_path)
+    return True
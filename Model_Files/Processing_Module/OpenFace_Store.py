@@ -0,0 +1,222 @@
+import os
+import re
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+
+STORE_FOLDER_NAME = 'Columnar'
+SCHEMA_FILENAME = 'schema.json'
+SCHEMA_VERSION = 1
+CONVERT_CHUNK_ROWS = 20000
+
+# Feature groups in the order they are matched; a column lands in the first group whose pattern it matches
+FEATURE_GROUPS = [
+    ('meta', r'^(frame|face_id|timestamp|confidence|success)$', np.float64),
+    ('gaze', r'^gaze_', np.float32),
+    ('eye_landmarks_2d', r'^eye_lmk_[xy]_\d+$', np.float32),
+    ('eye_landmarks_3d', r'^eye_lmk_[XYZ]_\d+$', np.float32),
+    ('pose', r'^pose_', np.float32),
+    ('landmarks_2d', r'^[xy]_\d+$', np.float32),
+    ('landmarks_3d', r'^[XYZ]_\d+$', np.float32),
+    ('pdm_params', r'^p_', np.float32),
+    ('au_intensity', r'^AU\d+_r$', np.float32),
+    ('au_presence', r'^AU\d+_c$', np.float32),
+]
+
+
+def group_columns(columns):
+    """
+    Split OpenFace output columns into feature groups.
+
+    Args:
+        columns (list): Column names from an OpenFace CSV header
+
+    Returns:
+        dict: Group name to list of columns, in file order. Columns matching
+              no known group are collected under 'other'.
+    """
+    groups = {name: [] for name, _, _ in FEATURE_GROUPS}
+    groups['other'] = []
+    for column in columns:
+        for name, pattern, _ in FEATURE_GROUPS:
+            if re.match(pattern, column):
+                groups[name].append(column)
+                break
+        else:
+            groups['other'].append(column)
+    return {name: cols for name, cols in groups.items() if cols}
+
+
+def _count_rows(csv_path):
+    rows = 0
+    with open(csv_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            rows += block.count(b'\n')
+        # Account for a final record without a trailing newline
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                rows += 1
+    return max(rows - 1, 0)
+
+
+def convert_openface_csv(csv_path, store_dir=None):
+    """
+    Convert an OpenFace CSV into a memory-mappable columnar store.
+
+    Each feature group is written as one column-major .npy matrix, so every
+    column is contiguous on disk and a group can be memory-mapped on its own.
+    A schema.json file records the groups, their columns and the source file.
+    The CSV is streamed in chunks, so memory use does not grow with its length.
+
+    Args:
+        csv_path (str): OpenFace FeatureExtraction output CSV
+        store_dir (str, optional): Destination folder. Defaults to a
+                                   'Columnar/<csv stem>' folder beside the CSV.
+
+    Returns:
+        Path: The store folder
+    """
+    csv_path = Path(csv_path)
+    if store_dir is None:
+        store_dir = csv_path.parent / STORE_FOLDER_NAME / csv_path.stem
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+
+    header = pd.read_csv(csv_path, nrows=0, skipinitialspace=True)
+    columns = [c.strip() for c in header.columns]
+    groups = group_columns(columns)
+    dtypes = {name: dtype for name, _, dtype in FEATURE_GROUPS}
+    rows = _count_rows(csv_path)
+
+    arrays = {}
+    for name, cols in groups.items():
+        arrays[name] = np.lib.format.open_memmap(
+            store_dir / f'{name}.npy.tmp', mode='w+',
+            dtype=dtypes.get(name, np.float32), shape=(rows, len(cols)), fortran_order=True)
+
+    written = 0
+    for chunk in pd.read_csv(csv_path, skipinitialspace=True, chunksize=CONVERT_CHUNK_ROWS):
+        chunk.columns = [c.strip() for c in chunk.columns]
+        end = written + len(chunk)
+        for name, cols in groups.items():
+            arrays[name][written:end] = chunk[cols].apply(pd.to_numeric, errors='coerce').to_numpy()
+        written = end
+
+    for array in arrays.values():
+        array.flush()
+    # Release the maps before renaming, which Windows refuses on open files
+    arrays.clear()
+
+    schema = {'version': SCHEMA_VERSION, 'source': str(csv_path), 'rows': written, 'groups': {}}
+    for name, cols in groups.items():
+        os.replace(store_dir / f'{name}.npy.tmp', store_dir / f'{name}.npy')
+        schema['groups'][name] = {
+            'file': f'{name}.npy',
+            'dtype': np.dtype(dtypes.get(name, np.float32)).name,
+            'columns': cols,
+        }
+
+    # The schema is written last so a store with a schema is always complete
+    temp_schema = store_dir / f'{SCHEMA_FILENAME}.tmp'
+    with open(temp_schema, 'w') as f:
+        json.dump(schema, f, indent=2)
+    os.replace(temp_schema, store_dir / SCHEMA_FILENAME)
+
+    return store_dir
+
+
+class OpenFace_Store:
+    """
+    Reader for an OpenFace columnar store written by convert_openface_csv.
+
+    Only the requested feature groups are memory-mapped, so loading the AU
+    intensities of a long session touches a few megabytes instead of parsing
+    the full CSV.
+
+    Attributes:
+        store_dir (Path): The store folder
+        schema (dict): Contents of schema.json
+    """
+
+    def __init__(self, store_dir):
+        """
+        Open a columnar store.
+
+        Args:
+            store_dir (str): Folder holding schema.json and the group .npy files
+        """
+        self.store_dir = Path(store_dir)
+        schema_path = self.store_dir / SCHEMA_FILENAME
+        if not schema_path.exists():
+            raise FileNotFoundError(f'No OpenFace store schema found in {store_dir}')
+        with open(schema_path, 'r') as f:
+            self.schema = json.load(f)
+        if self.schema.get('version') != SCHEMA_VERSION:
+            raise ValueError(f'Unsupported OpenFace store version in {store_dir}')
+
+    @property
+    def groups(self):
+        """
+        Names of the feature groups available in the store.
+        """
+        return list(self.schema['groups'])
+
+    @property
+    def rows(self):
+        """
+        Number of frames in the store.
+        """
+        return self.schema['rows']
+
+    def columns(self, group):
+        """
+        Column names of a feature group, in matrix order.
+        """
+        return list(self._group(group)['columns'])
+
+    def _group(self, group):
+        if group not in self.schema['groups']:
+            raise KeyError(f"Feature group '{group}' not in store. Available: {self.groups}")
+        return self.schema['groups'][group]
+
+    def load(self, group):
+        """
+        Memory-map one feature group.
+
+        Args:
+            group (str): Feature group name, e.g. 'au_intensity' or 'gaze'
+
+        Returns:
+            numpy.memmap: Read-only (frames x columns) matrix
+        """
+        array = np.load(self.store_dir / self._group(group)['file'], mmap_mode='r')
+        # Blank lines in the CSV leave unused rows at the end of the preallocated matrix
+        return array[:self.rows]
+
+    def column(self, name):
+        """
+        Memory-map a single column by its OpenFace name, e.g. 'AU12_r'.
+        """
+        for group, info in self.schema['groups'].items():
+            if name in info['columns']:
+                return self.load(group)[:, info['columns'].index(name)]
+        raise KeyError(f"Column '{name}' not in store")
+
+    def load_frame(self, groups):
+        """
+        Load several feature groups as a DataFrame.
+
+        Args:
+            groups (list): Feature group names; 'meta' is useful to keep the
+                           frame and timestamp columns alongside the features
+
+        Returns:
+            pandas.DataFrame: One column per OpenFace column in the groups
+        """
+        if isinstance(groups, str):
+            groups = [groups]
+        frames = [pd.DataFrame(np.asarray(self.load(g)), columns=self.columns(g)) for g in groups]
+        return pd.concat(frames, axis=1) if frames else pd.DataFrame()
@@ -0,0 +1,270 @@
+import re
+import glob
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from .OpenFace_Store import OpenFace_Store, group_columns, STORE_FOLDER_NAME, SCHEMA_FILENAME
+
+
+WINDOW_S = 10.0
+OPENFACE_CHUNK_ROWS = 50000
+
+# Feature groups the window statistics are computed from
+WINDOW_GROUPS = ('meta', 'gaze', 'pose', 'au_intensity', 'au_presence')
+# Columns whose per-window mean and variance are tracked
+WELFORD_PATTERNS = (r'^confidence$', r'^AU\d+_r$', r'^gaze_angle_[xy]$', r'^pose_R[xyz]$')
+# AU45 (blink) intensity at or above which the eyes count as closed when AU45_c is missing
+BLINK_INTENSITY = 1.0
+# Frame gaps longer than this are tracking dropouts, not head motion
+MAX_MOTION_GAP_S = 1.0
+
+
+def iter_openface_chunks(openface_dir, chunk_rows=OPENFACE_CHUNK_ROWS, groups=WINDOW_GROUPS):
+    """
+    Read OpenFace output in chunks of rows.
+
+    The columnar store is used when there is one, which avoids parsing text
+    and reads only the requested feature groups; otherwise the CSV is
+    streamed with just the columns of those groups.
+
+    Args:
+        openface_dir (str): 'Openface/<session>' output folder
+        chunk_rows (int): Rows per chunk
+        groups (tuple): OpenFace_Store feature groups to read; None reads all
+
+    Yields:
+        pandas.DataFrame: One chunk with OpenFace column names
+    """
+    stores = sorted(glob.glob(str(Path(openface_dir) / STORE_FOLDER_NAME / '*' / SCHEMA_FILENAME)))
+    stores.sort(key=lambda path: Path(path).parent.name != 'webcam_capture')
+    if stores:
+        store = OpenFace_Store(Path(stores[0]).parent)
+        names = [group for group in store.groups if groups is None or group in groups]
+        for lo in range(0, store.rows, chunk_rows):
+            hi = min(lo + chunk_rows, store.rows)
+            yield pd.concat([pd.DataFrame(np.asarray(store.load(group)[lo:hi]), columns=store.columns(group))
+                             for group in names], axis=1)
+        return
+
+    csv_path = Path(openface_dir) / 'webcam_capture.csv'
+    if not csv_path.exists():
+        candidates = sorted(glob.glob(str(Path(openface_dir) / '*.csv')))
+        if not candidates:
+            return
+        csv_path = Path(candidates[0])
+
+    header = [c.strip() for c in pd.read_csv(csv_path, nrows=0, skipinitialspace=True).columns]
+    wanted = {column for group, columns in group_columns(header).items()
+              if groups is None or group in groups for column in columns}
+    for chunk in pd.read_csv(csv_path, skipinitialspace=True, chunksize=chunk_rows,
+                             usecols=lambda column: column.strip() in wanted):
+        chunk.columns = [c.strip() for c in chunk.columns]
+        yield chunk
+
+
+class _Welford_Window:
+    """
+    Count, mean and sum of squared deviations of a set of columns over one window.
+    """
+
+    def __init__(self, index, count, mean, m2, totals):
+        self.index = index
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.totals = totals
+
+    def merge(self, other):
+        # Chan et al.'s pairwise update, so chunks combine exactly like one pass of Welford's algorithm
+        # Either side may have no tracked frames, whose mean is NaN, so it is taken from the other side
+        count = self.count + other.count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = other.mean - self.mean
+            share = np.where(count > 0, other.count / count, 0.0)
+            mean = np.where(self.count > 0, self.mean + delta * share, other.mean)
+            m2 = np.where(self.count > 0, self.m2 + other.m2 + delta ** 2 * self.count * share, other.m2)
+            self.mean = np.where(other.count > 0, mean, self.mean)
+            self.m2 = np.where(other.count > 0, m2, self.m2)
+        self.count = count
+        self.totals = {name: self.totals[name] + other.totals[name] for name in self.totals}
+
+
+class OpenFace_Windows:
+    """
+    Single-pass windowed statistics of OpenFace output.
+
+    Chunks of OpenFace rows are passed to update() in time order, and every
+    window that can no longer change is returned as soon as the chunk that
+    closes it arrives; the one window still open is carried, so memory does
+    not depend on the session length. Within a chunk, every window's
+    statistics come from a handful of bincounts; the open window is merged
+    with the next chunk's part of it using the pairwise form of Welford's
+    update, so the results match a single pass over the whole output.
+
+    Per window (over frames OpenFace tracked successfully):
+        mean and variance of the tracking confidence and of each AU
+        intensity, gaze angle and head rotation;
+        gaze_dispersion, the root of the summed gaze angle variances;
+        blinks, counted at the frames where AU45 turns on, and blinks_per_min;
+        head_motion_energy, the mean squared angular speed of the head in
+        (rad/s)^2 between consecutive tracked frames.
+
+    Attributes:
+        window_s (float): Window length in seconds
+        start_ns (int): Session start, to place windows on the session timeline; optional
+    """
+
+    def __init__(self, window_s=WINDOW_S, start_ns=None):
+        self.window_s = window_s
+        self.start_ns = start_ns
+        self.columns = None
+        self._open = None
+        self._previous_blink = False
+        self._previous_pose = None
+
+    def _setup(self, chunk):
+        self.columns = [c for c in chunk.columns if any(re.match(p, c) for p in WELFORD_PATTERNS)]
+        self._blink_column = 'AU45_c' if 'AU45_c' in chunk.columns else 'AU45_r' if 'AU45_r' in chunk.columns else None
+        self._pose_columns = [c for c in ('pose_Rx', 'pose_Ry', 'pose_Rz') if c in chunk.columns]
+
+    def update(self, chunk):
+        """
+        Add the next chunk of OpenFace rows.
+
+        Args:
+            chunk (pandas.DataFrame): Rows in time order with OpenFace column names
+
+        Returns:
+            pandas.DataFrame: Windows closed by this chunk, one row each
+        """
+        if self.columns is None:
+            self._setup(chunk)
+        timestamp = pd.to_numeric(chunk['timestamp'], errors='coerce').to_numpy(dtype=np.float64)
+        valid = ~np.isnan(timestamp)
+        tracked = valid & (pd.to_numeric(chunk['success'], errors='coerce').to_numpy() == 1)
+        window = np.floor(np.where(valid, timestamp, 0) / self.window_s).astype(np.int64)
+
+        # Windows present in the chunk, renumbered 0..k-1 for the bincounts
+        present, local = np.unique(window[valid], return_inverse=True)
+        if not len(present):
+            return self._frame([])
+        slot = np.full(len(window), -1, dtype=np.int64)
+        slot[valid] = local
+        k = len(present)
+
+        values = chunk[self.columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+        rows = np.flatnonzero(tracked)
+        count = np.bincount(slot[rows], minlength=k).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.stack([np.bincount(slot[rows], weights=values[rows, j], minlength=k)
+                             for j in range(len(self.columns))], axis=1) / count[:, None]
+        deviation = values[rows] - mean[slot[rows]]
+        m2 = np.stack([np.bincount(slot[rows], weights=deviation[:, j] ** 2, minlength=k)
+                       for j in range(len(self.columns))], axis=1)
+
+        totals = {
+            'frames': np.bincount(slot[valid], minlength=k).astype(np.float64),
+            'blinks': self._blinks(chunk, slot, tracked, k),
+            'motion_energy': np.zeros(k),
+            'motion_pairs': np.zeros(k),
+        }
+        self._head_motion(chunk, timestamp, slot, tracked, totals)
+
+        windows = [_Welford_Window(int(present[i]), count[i], mean[i], m2[i],
+                                   {name: totals[name][i] for name in totals}) for i in range(k)]
+        closed = []
+        if self._open is not None:
+            if self._open.index == windows[0].index:
+                self._open.merge(windows[0])
+                windows[0] = self._open
+            else:
+                closed.append(self._open)
+        closed.extend(windows[:-1])
+        self._open = windows[-1]
+        return self._frame(closed)
+
+    def finish(self):
+        """
+        Return the last window, which no later chunk can add to.
+        """
+        closed = [self._open] if self._open is not None else []
+        self._open = None
+        return self._frame(closed)
+
+    def _blinks(self, chunk, slot, tracked, k):
+        if self._blink_column is None:
+            return np.zeros(k)
+        level = pd.to_numeric(chunk[self._blink_column], errors='coerce').to_numpy(dtype=np.float64)
+        closed = tracked & ((level >= 0.5) if self._blink_column == 'AU45_c' else (level >= BLINK_INTENSITY))
+        # A blink starts where the eyes close after a tracked frame with them open
+        closed_rows = closed[tracked]
+        onset = closed_rows & ~np.concatenate([[self._previous_blink], closed_rows[:-1]])
+        if len(closed_rows):
+            self._previous_blink = bool(closed_rows[-1])
+        return np.bincount(slot[np.flatnonzero(tracked)[onset]], minlength=k).astype(np.float64)
+
+    def _head_motion(self, chunk, timestamp, slot, tracked, totals):
+        if not self._pose_columns:
+            return
+        rows = np.flatnonzero(tracked)
+        pose = chunk[self._pose_columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)[rows]
+        times = timestamp[rows]
+        if self._previous_pose is not None:
+            pose = np.vstack([self._previous_pose[1], pose])
+            times = np.concatenate([[self._previous_pose[0]], times])
+        if len(rows):
+            self._previous_pose = (times[-1], pose[-1])
+
+        dt = np.diff(times)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            energy = np.sum(np.diff(pose, axis=0) ** 2, axis=1) / dt ** 2
+        pairs = (dt > 0) & (dt <= MAX_MOTION_GAP_S) & np.isfinite(energy)
+        # Each pair counts toward the window of its later frame
+        later = slot[rows][-len(dt):] if len(dt) else np.empty(0, dtype=np.int64)
+        totals['motion_energy'] += np.bincount(later[pairs], weights=energy[pairs], minlength=len(totals['frames']))
+        totals['motion_pairs'] += np.bincount(later[pairs], minlength=len(totals['frames']))
+
+    def _frame(self, windows):
+        names = self.columns or []
+        width = len(names)
+        count = np.array([window.count for window in windows], dtype=np.float64)
+        mean = np.array([window.mean for window in windows], dtype=np.float64).reshape(len(windows), width)
+        m2 = np.array([window.m2 for window in windows], dtype=np.float64).reshape(len(windows), width)
+        totals = {name: np.array([window.totals[name] for window in windows], dtype=np.float64)
+                  for name in ('frames', 'blinks', 'motion_energy', 'motion_pairs')}
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = np.where(count[:, None] > 1, m2 / (count[:, None] - 1), np.nan)
+            frame = pd.DataFrame({
+                'window_s': np.array([window.index for window in windows], dtype=np.float64) * self.window_s,
+                'frames': totals['frames'],
+                'face_tracked': np.where(totals['frames'] > 0, count / totals['frames'], np.nan),
+            })
+            gaze = [names.index(c) for c in ('gaze_angle_x', 'gaze_angle_y') if c in names]
+            derived = {
+                'gaze_dispersion': np.sqrt(variance[:, gaze].sum(axis=1)) if gaze else np.full(len(count), np.nan),
+                'blinks': totals['blinks'],
+                'blinks_per_min': totals['blinks'] * 60.0 / self.window_s,
+                'head_motion_energy': np.where(totals['motion_pairs'] > 0,
+                                               totals['motion_energy'] / totals['motion_pairs'], np.nan),
+            }
+        frame = pd.concat([frame,
+                           pd.DataFrame(mean, columns=[f'{c}_mean' for c in names]),
+                           pd.DataFrame(variance, columns=[f'{c}_var' for c in names]),
+                           pd.DataFrame(derived)], axis=1)
+        if self.start_ns is not None:
+            frame.insert(0, 'time_ns', self.start_ns + np.round(frame['window_s'].to_numpy() * 1e9).astype(np.int64))
+        return frame
+
+
+def openface_windows(openface_dir, window_s=WINDOW_S, start_ns=None, chunk_rows=OPENFACE_CHUNK_ROWS):
+    """
+    Windowed statistics of a session's OpenFace output, in one streamed pass.
+
+    Yields:
+        pandas.DataFrame: Windows as they close, as returned by OpenFace_Windows.update
+    """
+    windows = OpenFace_Windows(window_s, start_ns)
+    for chunk in iter_openface_chunks(openface_dir, chunk_rows):
+        yield windows.update(chunk)
+    yield windows.finish()
@@ -1,10 +1,16 @@
-import easyocr
+import torch
 import os
 import json
-import glob
 import cv2
+from contextlib import ExitStack
 from pathlib import Path
-from numpyencoder import NumpyEncoder
+from .OCR_Store import OCR_Writer, records_path, merge_outputs, OUTPUT_NAME
+from .OCR_Span_Tracker import OCR_Span_Tracker, SPANS_NAME
+from .OCR_Sampler import ocr_sample_frames, VIDEO_FPS
+from .Segments import recording_segments, segment_output_dir, is_processed, mark_processed
+from Common_Module.Session_Layout import MANIFEST_SUFFIX
+from ..Session_Catalog import capture_sessions
+from .OCR_Quantization import create_reader
 
 
 class Screen_Process:
@@ -24,46 +30,114 @@ class Screen_Process:
 
         self.config = config
 
-    def process_screen_capture(self, folder):
+    def process_screen_capture(self, folder, threads=None):
         # Run easyocr
+        # threads is an optional shared core allowance from the scheduler's CPU governor
 
         # Get list of all videos named "screen_capture.avi" in folder
-        file_list = glob.glob(f'{folder}/**/screen_capture.avi', recursive=True)
-        
-        print(f"Found {len(file_list)} screen capture files to process")
+        # Sessions come from the data folder's catalog rather than a walk over every file,
+        # leaving out those OCR has already completed
+        sessions = capture_sessions(folder, 'screen_capture')
+        file_list = [path for path in (os.path.join(session, 'screen_capture.avi') for session in sessions)
+                     if os.path.exists(path)]
+        # Segmented recordings are found through their manifests
+        manifest_list = [path for path in (os.path.join(session, f'screen_capture{MANIFEST_SUFFIX}') for session in sessions)
+                         if os.path.exists(path)]
+
+        print(f"Found {len(file_list) + len(manifest_list)} screen capture files to process")
 
         for file in file_list:
             print(f"Processing file: {file}")
             file_path = Path(file)
-            output_foldername = file_path.parent.name
-            data_folder = file_path.parent.parent
-
-            output_dir = data_folder / 'EasyOCR' / output_foldername
-            output_dir.mkdir(parents=True, exist_ok=True)
-
-            output_filepath = output_dir / 'ocr_output.json'
-            if not output_filepath.exists():
-                output_filepath.touch()
+            output_dir = file_path.parent.parent / 'EasyOCR' / file_path.parent.name
+            self._run_ocr(file, output_dir, file_path.parent, VIDEO_FPS, threads)
+
+        for manifest in manifest_list:
+            session_folder = Path(manifest).parent
+            segments = recording_segments(session_folder, 'screen_capture')
+            print(f"Processing {len(segments)} screen capture segments in: {session_folder}")
+
+            # Segments processed while recording are reused, the rest are processed now
+            parts = []
+            for segment in segments:
+                segment_dir = segment_output_dir(segment['path'])
+                if not is_processed(segment_dir):
+                    self.process_segment(segment['path'], segment_dir, segment['fps'],
+                                         session_folder, segment['offset_s'], threads)
+                parts.append((segment_dir, segment['offset_s']))
+
+            output_dir = session_folder.parent / 'EasyOCR' / session_folder.name
+            for name in (OUTPUT_NAME, SPANS_NAME):
+                if merge_outputs(parts, output_dir, name):
+                    print(f"💾 Merged OCR segments into: {records_path(output_dir, name)}")
+
+    def process_segment(self, segment_path, output_dir=None, fps=VIDEO_FPS, session_folder=None,
+                        time_offset_s=0.0, threads=None):
+        """
+        Run OCR on one segment of a segmented screen capture.
+
+        Results are timed from the start of the segment and marked complete
+        once written, so segments processed during recording are not
+        processed again.
+
+        Args:
+            segment_path (str): Segment video
+            output_dir (str, optional): Folder for the results; defaults to segment_output_dir
+            fps (float): Measured frame rate of the segment
+            session_folder (str, optional): Session folder with the input logs, None while recording
+            time_offset_s (float): Start of the segment in seconds since the session start
+            threads (multiprocessing.Value, optional): Core allowance from the CPU governor
+        """
+        output_dir = output_dir or segment_output_dir(segment_path)
+        self._run_ocr(segment_path, output_dir, session_folder, fps, threads, time_offset_s)
+        mark_processed(output_dir, {'segment': os.path.basename(str(segment_path)), 'fps': fps})
+
+    def _run_ocr(self, file, output_dir, session_folder, fps, threads=None, time_offset_s=0.0):
+        file = str(file)
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        output_filepath = records_path(output_dir)
+
+        torch_threads = _apply_thread_allowance(threads, None)
+
+        # Currently only english; 'int8' inference trades a bounded accuracy loss for CPU speed
+        reader = create_reader(self.config.get("ocr_inference", "standard"), ['en'])
         
-            reader = easyocr.Reader(['en']) # Currently only english
-            
-            # Get number of frames
-            probe_capture = cv2.VideoCapture(file)
-            if not probe_capture.isOpened():
-                print(f"❌ Failed to open video capture for: {file}")
-                exit(1)
-
-            frame_count = int(probe_capture.get(cv2.CAP_PROP_FRAME_COUNT))
-            print(f"✅ Successfully opened video capture for: {file}")
-            print(f"Reported frame count: {frame_count}")
-            probe_capture.release()
-
-            ocr_result_buffer = []
-            frame_interval = 10
-            batch_size = 100
-
-            
-            for frame_idx in range(0, frame_count, frame_interval):
+        # Get number of frames
+        probe_capture = cv2.VideoCapture(file)
+        if not probe_capture.isOpened():
+            print(f"❌ Failed to open video capture for: {file}")
+            exit(1)
+
+        frame_count = int(probe_capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        print(f"✅ Successfully opened video capture for: {file}")
+        print(f"Reported frame count: {frame_count}")
+        probe_capture.release()
+
+        batch_size = 100
+
+        # Either every 10th frame, or a budget of frames placed after keyboard and mouse activity
+        sample_frames = ocr_sample_frames(session_folder, frame_count, **self.config.get("ocr_sampling", {}),
+                                          fps=fps, time_offset_s=time_offset_s)
+        print(f"Planned {len(sample_frames)} OCR samples over {frame_count} frames")
+
+        # 'spans' keeps one record per stretch of persistent text, 'frames' one per detection per frame
+        output_mode = self.config.get("ocr_output_mode", "spans")
+        if output_mode not in ('spans', 'frames', 'both'):
+            raise ValueError(f"Unknown ocr_output_mode '{output_mode}' in config.json")
+
+        # Results stay in '.partial' files until the writers are closed; an error removes them instead
+        with ExitStack() as writers:
+            writer = writers.enter_context(OCR_Writer(output_dir, batch_size=batch_size)) \
+                if output_mode != 'spans' else None
+            span_writer = writers.enter_context(OCR_Writer(output_dir, name=SPANS_NAME, batch_size=batch_size)) \
+                if output_mode != 'frames' else None
+            tracker = OCR_Span_Tracker() if span_writer else None
+
+            for frame_idx in sample_frames.tolist():
+                torch_threads = _apply_thread_allowance(threads, torch_threads)
+
                 capture = cv2.VideoCapture(file)
                 if not capture.isOpened():
                     print(f"❌ Failed to re-open video at frame {frame_idx}")
@@ -72,62 +146,44 @@ class Screen_Process:
                 capture.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
                 return_val, frame = capture.read()
                 capture.release()
-                
+
                 if not return_val:
                     print(f"🛑 Failed to read frame at index {frame_idx}")
                     break
 
-                if frame_idx % frame_interval == 0:
-                    ocr_out = reader.readtext(frame)
-
-                    timestamp = frame_idx / 28.8
-                    print(f"🔍 Processing OCR at timestamp: {timestamp:.2f}s (frame {frame_idx})")
-            
-                    for bbox, text, conf in ocr_out:
-                        ocr_result_buffer.append({
-                            'timestamp': timestamp,
-                            'text': text,
-                            'confidence': conf,
-                            'bbox': bbox  # (x0, y0), (x1, y1), (x2, y2), (x3, y3)
-                        })
-                    
-                    if len(ocr_result_buffer) >= batch_size:
-                        with output_filepath.open('a', encoding='utf-8') as f:
-                            for record in ocr_result_buffer:
-                                f.write(json.dumps(record, cls=NumpyEncoder)+'\n')
-                        ocr_result_buffer.clear()
-                    
-                
-                frame_idx += 1
-
-            capture.release()
-            
-            if ocr_result_buffer:
-                with output_filepath.open('a', encoding='utf-8') as f:
-                    for record in ocr_result_buffer:
-                        f.write(json.dumps(record, cls=NumpyEncoder)+'\n')
-
-            print(f"📝 Processed OCR results for {file}")
+                ocr_out = reader.readtext(frame)
 
-            # Restructure json file in a list format
-            temp_filepath = output_dir / 'temp.json'
-            with output_filepath.open('r', encoding='utf-8') as fin, \
-                 temp_filepath.open('w', encoding='utf-8') as fout:
-                fout.write('[\n')
-                is_first = True
+                timestamp = frame_idx / fps
+                print(f"🔍 Processing OCR at timestamp: {timestamp:.2f}s (frame {frame_idx})")
 
-                for line in fin:
-                    record = line.strip()
-                    if not record:
-                        continue
+                if writer:
+                    writer.write_frame(timestamp, [{
+                        'timestamp': timestamp,
+                        'text': text,
+                        'confidence': conf,
+                        'bbox': bbox  # (x0, y0), (x1, y1), (x2, y2), (x3, y3)
+                    } for bbox, text, conf in ocr_out])
 
-                    if not is_first:
-                        fout.write(',\n')
+                if tracker:
+                    for t_start, spans in tracker.update(timestamp, ocr_out):
+                        span_writer.write_frame(t_start, spans)
 
-                    fout.write(record)
-                    is_first = False
+            print(f"📝 Processed OCR results for {file}")
 
-                fout.write('\n]')
+            if tracker:
+                for t_start, spans in tracker.finish():
+                    span_writer.write_frame(t_start, spans)
 
+        # Leaving the block published the records and their timestamp index with atomic renames
+        if writer:
             print(f"💾 Saved OCR results to: {output_filepath}")
+        if span_writer:
+            print(f"💾 Saved OCR text spans to: {records_path(output_dir, SPANS_NAME)}")
+
 
+def _apply_thread_allowance(threads, current):
+    # Follow the governor's allowance, which changes as other stages start and finish
+    if threads is None or threads.value < 1 or threads.value == current:
+        return current
+    torch.set_num_threads(threads.value)
+    return threads.value
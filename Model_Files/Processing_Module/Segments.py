@@ -0,0 +1,70 @@
+import os
+import json
+from Common_Module.Session_Layout import load_manifest, segment_fps, PROCESSED_FOLDER_NAME
+from ..Session_Index import session_start_ns
+
+
+# Written into a segment's output folder once processing it has finished
+SEGMENT_DONE_NAME = 'complete.json'
+
+
+def segment_output_dir(segment_path):
+    """
+    Folder for the processing results of one segment: '<folder>/Processed/<segment name>'.
+    """
+    folder, filename = os.path.split(str(segment_path))
+    return os.path.join(folder, PROCESSED_FOLDER_NAME, os.path.splitext(filename)[0])
+
+
+def is_processed(output_dir):
+    return os.path.exists(os.path.join(output_dir, SEGMENT_DONE_NAME))
+
+
+def processed_details(output_dir):
+    """
+    Details saved when a segment finished processing, or None if it has not.
+    """
+    if not is_processed(output_dir):
+        return None
+    with open(os.path.join(output_dir, SEGMENT_DONE_NAME), 'r') as f:
+        return json.load(f)
+
+
+def mark_processed(output_dir, details=None):
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, SEGMENT_DONE_NAME), 'w') as f:
+        json.dump(details or {}, f, indent=2)
+
+
+def recording_segments(session_folder, stem):
+    """
+    Completed segments of a segmented recording, placed on the session timeline.
+
+    Segments a crash left incomplete are skipped, since their files may not
+    be readable.
+
+    Args:
+        session_folder (str): Recording session folder holding the manifest
+        stem (str): Recording name, e.g. 'screen_capture'
+
+    Returns:
+        list: Manifest entries with their 'path', measured 'fps' and 'offset_s',
+              the start of the segment in seconds since the session start;
+              None if the recording is not segmented
+    """
+    manifest = load_manifest(session_folder, stem)
+    if manifest is None:
+        return None
+
+    complete = [segment for segment in manifest['segments'] if segment['complete']]
+    try:
+        start_ns = session_start_ns(session_folder)
+    except ValueError:
+        # Not in a named session folder yet, so time is counted from the first segment
+        start_ns = complete[0]['start_ns'] if complete else 0
+
+    return [dict(segment,
+                 path=os.path.join(str(session_folder), segment['file']),
+                 fps=segment_fps(segment) or manifest['nominal_fps'],
+                 offset_s=(segment['start_ns'] - start_ns) / 1e9)
+            for segment in complete]
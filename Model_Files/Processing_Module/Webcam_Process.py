@@ -1,8 +1,14 @@
 import subprocess
-import glob
+import shutil
+import tempfile
 from pathlib import Path
 import os
 import json
+from .OpenFace_Store import convert_openface_csv
+from .OpenFace_Sampling import write_subsampled_input, remap_openface_csv, merge_openface_segments, SUBSAMPLED_NAME
+from .Segments import recording_segments, segment_output_dir, is_processed, processed_details, mark_processed
+from Common_Module.Session_Layout import MANIFEST_SUFFIX
+from ..Session_Catalog import capture_sessions
 
 class Webcam_Process:
     def __init__(self):
@@ -23,12 +29,20 @@ class Webcam_Process:
 
         self.config = config
 
-    def process_webcam_video(self, folder):
+    def process_webcam_video(self, folder, threads=None):
         # Run Openface CLI to run and store feature extraction of all webcam videos
         # in given folder
+        # threads is an optional shared core allowance from the scheduler's CPU governor
 
         # Get list of all videos named "webcam_capture.avi" in folder
-        file_list = glob.glob(f'{folder}/**/webcam_capture.avi', recursive=True)
+        # Sessions come from the data folder's catalog rather than a walk over every file,
+        # leaving out those OpenFace has already completed
+        sessions = capture_sessions(folder, 'webcam_capture')
+        file_list = [path for path in (os.path.join(session, 'webcam_capture.avi') for session in sessions)
+                     if os.path.exists(path)]
+        # Segmented recordings are found through their manifests
+        manifest_list = [path for path in (os.path.join(session, f'webcam_capture{MANIFEST_SUFFIX}') for session in sessions)
+                         if os.path.exists(path)]
 
         for file in file_list:
             # Create output folder for given file
@@ -39,11 +53,96 @@ class Webcam_Process:
             output_dir = data_folder / 'Openface' / output_foldername
             output_dir.mkdir(parents=True, exist_ok=True)
 
+            openface_csv = self._run_openface(file, output_dir, threads)
+            self._convert(openface_csv)
+
+        for manifest in manifest_list:
+            session_folder = Path(manifest).parent
+            segments = recording_segments(session_folder, 'webcam_capture')
+            print(f"Processing {len(segments)} webcam capture segments in: {session_folder}")
+
+            # Segments processed while recording are reused, the rest are processed now
+            parts = []
+            for segment in segments:
+                segment_dir = segment_output_dir(segment['path'])
+                if not is_processed(segment_dir):
+                    self.process_segment(segment['path'], segment_dir, threads)
+                details = processed_details(segment_dir)
+                parts.append((os.path.join(segment_dir, details['csv']), segment['fps'],
+                              segment['offset_s'], segment['frames']))
+
+            output_dir = session_folder.parent / 'Openface' / session_folder.name
+            openface_csv = output_dir / 'webcam_capture.csv'
+            if merge_openface_segments(parts, openface_csv):
+                print(f"💾 Merged OpenFace segments into: {openface_csv}")
+                self._convert(openface_csv)
+
+    def process_segment(self, segment_path, output_dir=None, threads=None):
+        """
+        Run OpenFace on one segment of a segmented webcam capture.
+
+        Results keep the segment's own frame numbers and are marked complete
+        once written, so segments processed during recording are not
+        processed again.
+
+        Args:
+            segment_path (str): Segment video
+            output_dir (str, optional): Folder for the results; defaults to segment_output_dir
+            threads (multiprocessing.Value, optional): Core allowance from the CPU governor
+        """
+        output_dir = Path(output_dir or segment_output_dir(segment_path))
+        output_dir.mkdir(parents=True, exist_ok=True)
+        openface_csv = self._run_openface(segment_path, output_dir, threads)
+        mark_processed(output_dir, {'segment': os.path.basename(str(segment_path)), 'csv': openface_csv.name})
+
+    def _run_openface(self, file, output_dir, threads=None):
+        file = str(file)
+
+        # OpenFace's BLAS and OpenMP pools otherwise size themselves to every core
+        env = dict(os.environ)
+        if threads is not None and threads.value > 0:
+            for variable in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+                env[variable] = str(threads.value)
+
+        # With a stride above 1 OpenFace only sees every stride-th frame and results are
+        # mapped back onto the original frames afterwards
+        sampling = self.config.get("openface_sampling", {})
+        stride = max(int(sampling.get("stride", 1)), 1)
+        work_dir = None
+        input_arguments = ['-f', file]
+        if stride > 1:
+            work_dir = tempfile.mkdtemp(prefix='openface_input_', dir=output_dir)
+            input_arguments, fps, frame_count = write_subsampled_input(
+                file, work_dir, stride, sampling.get("method", "proxy_video"))
+            print(f"Running OpenFace on every {stride}th frame of {frame_count} frames")
+
+        # Aligned faces and HOG features are numbered by the frames OpenFace saw and, unlike the
+        # CSV, cannot be filled in for the frames it skipped, so they are only written without a stride
+        alignment_arguments = ['-hogalign', '-simalign', '-nomask', '-nobadaligned'] if stride == 1 else []
+        if stride > 1:
+            print("Skipping OpenFace's aligned face and HOG output, which a frame stride would misalign")
+
+        try:
             subprocess.run([
                 self.openface_exe_path,
-                '-f', file,
+                *input_arguments,
                 '-out_dir', str(output_dir),
                 '-2Dfp', '-3Dfp', '-pose', '-gaze', '-aus', '-pdmparams',
-                '-hogalign', '-simalign', '-nomask', '-nobadaligned', 
+                *alignment_arguments,
                 '-tracked' if self.config["create_tracked_video"] else ''
-            ])
+            ], env=env)
+        finally:
+            if work_dir:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+        # OpenFace names its output after its input
+        openface_csv = Path(output_dir) / f'{SUBSAMPLED_NAME if stride > 1 else Path(file).stem}.csv'
+        if stride > 1 and openface_csv.exists():
+            remap_openface_csv(openface_csv, stride, fps, frame_count, sampling.get("interpolate", True))
+        return openface_csv
+
+    def _convert(self, openface_csv):
+        # Convert the wide CSV once so later analysis can memory-map only the features it needs
+        if self.config.get("create_columnar_store", True) and openface_csv.exists():
+            store_dir = convert_openface_csv(openface_csv)
+            print(f"💾 Saved columnar OpenFace features to: {store_dir}")
@@ -0,0 +1,84 @@
+import os
+
+
+class Resource_Governor:
+    """
+    Splits a CPU core budget between the pipeline stages that have work.
+
+    Left alone, EasyOCR's torch backend and OpenFace each size their thread
+    pools to every core on the machine, so running them side by side
+    oversubscribes the CPU and both slow down. The governor gives each stage
+    with running or ready tasks a share of the budget in proportion to its
+    weight, then turns that share into how many of its tasks may run at once
+    and how many threads each task may use. The scheduler asks again whenever
+    a task starts or finishes, so the cores a finished stage frees go to the
+    stages still running.
+
+    Attributes:
+        total_cores (int): Cores shared between all stages
+        weights (dict): Stage name to its relative share; unlisted stages weigh 1
+        min_threads (dict): Stage name to the fewest cores worth giving one of its
+                            tasks; unlisted stages use 1. Larger values favour
+                            fewer tasks with more threads each
+    """
+
+    def __init__(self, total_cores=None, weights=None, min_threads=None):
+        self.total_cores = max(int(total_cores or os.cpu_count() or 1), 1)
+        self.weights = dict(weights or {})
+        self.min_threads = dict(min_threads or {})
+
+        for name, weight in self.weights.items():
+            if weight <= 0:
+                raise ValueError(f"Stage '{name}' must have a positive CPU weight, got {weight}")
+
+    def _split(self, stage_names, running=()):
+        # Every stage given cores gets at least one, and the shares never add up to more than the budget.
+        # With more stages than cores, those already running keep theirs and the rest wait with none.
+        order = sorted(stage_names, key=lambda name: (name not in running, -self.weights.get(name, 1)))
+        funded = order[:self.total_cores]
+        shares = {name: 0 for name in stage_names}
+        shares.update({name: 1 for name in funded})
+
+        # Largest-remainder split by weight of the cores left after the first one each
+        spare = self.total_cores - len(funded)
+        if spare > 0:
+            total_weight = sum(self.weights.get(name, 1) for name in funded)
+            exact = {name: spare * self.weights.get(name, 1) / total_weight for name in funded}
+            for name in funded:
+                shares[name] += int(exact[name])
+            left = spare - sum(int(value) for value in exact.values())
+            for name in sorted(funded, key=lambda name: exact[name] - int(exact[name]), reverse=True)[:left]:
+                shares[name] += 1
+        return shares
+
+    def allocate(self, demand, running=None):
+        """
+        Split the budget between the stages that currently have work.
+
+        Args:
+            demand (dict): Stage name to the number of its tasks running or ready to run
+            running (dict, optional): Stage name to the number of its tasks running, which
+                                      keep their cores when there are more stages than cores
+
+        Returns:
+            dict: Stage name to {'cores', 'concurrency', 'threads'} for every stage
+                  with demand, where threads is the allowance of each of its tasks.
+                  A stage given no cores has a concurrency of 0 and waits
+        """
+        active = [name for name, count in demand.items() if count > 0]
+        if not active:
+            return {}
+
+        busy = {name for name, count in (running or {}).items() if count > 0}
+        allocation = {}
+        for name, cores in self._split(active, busy).items():
+            if cores == 0:
+                allocation[name] = {'cores': 0, 'concurrency': 0, 'threads': 0}
+                continue
+            concurrency = max(1, min(demand[name], cores // self.min_threads.get(name, 1)))
+            allocation[name] = {
+                'cores': cores,
+                'concurrency': concurrency,
+                'threads': max(1, cores // concurrency),
+            }
+        return allocation
@@ -0,0 +1,405 @@
+import os
+import sqlite3
+import argparse
+import datetime
+from Common_Module.Session_Layout import MANIFEST_SUFFIX, PROCESSED_FOLDER_NAME, SESSION_TIME_FORMAT, WORKING_FOLDER_PREFIX
+
+
+CATALOG_FILENAME = 'catalog.sqlite'
+CATALOG_VERSION = 1
+
+# Recording name to the processing stage that turns it into features
+CAPTURE_STAGES = {'screen_capture': 'ocr', 'webcam_capture': 'openface'}
+
+# Modality to the files in a session folder that show it was recorded
+MODALITY_FILES = {
+    'keyboard': ('keyboard_log.csv',),
+    'mouse': ('mouse_log.csv',),
+    'screen': ('screen_capture.avi', f'screen_capture{MANIFEST_SUFFIX}'),
+    'webcam': ('webcam_capture.avi', f'webcam_capture{MANIFEST_SUFFIX}'),
+}
+
+SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS sessions (
+    name TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    start_ns INTEGER NOT NULL,
+    stop_ns INTEGER NOT NULL,
+    duration_s REAL NOT NULL,
+    {', '.join(f'has_{modality} INTEGER NOT NULL' for modality in MODALITY_FILES)},
+    size_bytes INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stages (
+    session TEXT NOT NULL REFERENCES sessions(name) ON DELETE CASCADE,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL,
+    elapsed_s REAL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (session, stage)
+);
+CREATE INDEX IF NOT EXISTS sessions_by_start ON sessions(start_ns);
+CREATE INDEX IF NOT EXISTS stages_by_status ON stages(stage, status);
+'''
+
+
+def parse_session_name(name):
+    """
+    Start and stop of a session from its 'start_--_stop' folder name.
+
+    Returns:
+        tuple: (start_ns, stop_ns) as naive wall-clock nanoseconds, or None if the
+               name is not a session name
+    """
+    parts = name.split('_--_')
+    if len(parts) != 2:
+        return None
+    try:
+        start, stop = (datetime.datetime.strptime(part, SESSION_TIME_FORMAT) for part in parts)
+    except ValueError:
+        return None
+    epoch = datetime.datetime(1970, 1, 1)
+    return (int((start - epoch).total_seconds()) * 10**9, int((stop - epoch).total_seconds()) * 10**9)
+
+
+class Session_Catalog:
+    """
+    SQLite catalog of the recording sessions in a data folder.
+
+    Records each session's time span, recorded modalities and size, and the
+    status of every processing stage run on it, so finding work is a query
+    rather than a walk over every file. The catalog is updated when a
+    recording is saved and when a stage finishes; rescan reconciles it with
+    the disk, re-reading only session folders whose modification time
+    changed. Session folders are found at any depth, e.g. 'P01/<session>',
+    where below the top level only folders holding a recording count, so
+    processing output named after its session is left out.
+
+    Attributes:
+        data_folder (str): Folder holding the session folders
+        path (str): Catalog database file
+    """
+
+    def __init__(self, data_folder, path=None):
+        """
+        Args:
+            data_folder (str): Folder holding the session folders
+            path (str, optional): Database file; defaults to CATALOG_FILENAME in data_folder
+        """
+        self.data_folder = os.path.abspath(data_folder)
+        self.path = path or os.path.join(self.data_folder, CATALOG_FILENAME)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        # The recorder and the model pipeline may write at the same time
+        self.connection = sqlite3.connect(self.path, timeout=30)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA foreign_keys=ON')
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(f'PRAGMA user_version={CATALOG_VERSION}')
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @staticmethod
+    def _now():
+        return datetime.datetime.now().isoformat(timespec='seconds')
+
+    def _read_session(self, folder, mtime_ns=None):
+        name = os.path.basename(os.path.normpath(folder))
+        times = parse_session_name(name)
+        if times is None:
+            return None
+
+        files = {}
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    files[entry.name] = entry.stat().st_size
+        # Everything recorded, subfolders included; processing output is left out, as it is
+        # written without changing the session folder's modification time
+        size_bytes = sum(files.values())
+        for root, dirs, filenames in os.walk(folder):
+            if root == folder:
+                dirs[:] = [d for d in dirs if d != PROCESSED_FOLDER_NAME]
+                continue
+            size_bytes += sum(os.path.getsize(os.path.join(root, filename)) for filename in filenames)
+
+        row = {
+            'name': name,
+            'path': os.path.abspath(folder),
+            'start_ns': times[0],
+            'stop_ns': times[1],
+            'duration_s': (times[1] - times[0]) / 1e9,
+            'size_bytes': size_bytes,
+            'mtime_ns': mtime_ns if mtime_ns is not None else os.stat(folder).st_mtime_ns,
+            'updated_at': self._now(),
+        }
+        for modality, filenames in MODALITY_FILES.items():
+            row[f'has_{modality}'] = int(any(filename in files for filename in filenames))
+        return row
+
+    def _upsert(self, row):
+        columns = ', '.join(row)
+        placeholders = ', '.join(f':{column}' for column in row)
+        updates = ', '.join(f'{column}=excluded.{column}' for column in row if column != 'name')
+        self.connection.execute(f'INSERT INTO sessions ({columns}) VALUES ({placeholders}) '
+                                f'ON CONFLICT(name) DO UPDATE SET {updates}', row)
+
+    def add_session(self, session_folder):
+        """
+        Add or refresh one session, e.g. right after it is saved.
+
+        Returns:
+            bool: False if the folder is not named like a session
+        """
+        row = self._read_session(session_folder)
+        if row is None:
+            return False
+        with self.connection:
+            self._upsert(row)
+        return True
+
+    def _scan(self):
+        # Session folders and unfinished recordings below the data folder. Session folders and
+        # other hidden folders are not descended into
+        sessions, unfinished = [], []
+        pending = [(self.data_folder, True)]
+        while pending:
+            folder, top = pending.pop()
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if not entry.is_dir():
+                        continue
+                    if entry.name.startswith(WORKING_FOLDER_PREFIX):
+                        unfinished.append(entry.path)
+                    elif parse_session_name(entry.name) is not None:
+                        if top or _holds_recording(entry.path):
+                            sessions.append(entry)
+                    elif not entry.name.startswith('.'):
+                        pending.append((entry.path, False))
+        return sessions, unfinished
+
+    def rescan(self):
+        """
+        Reconcile the catalog with the session folders on disk.
+
+        Session folders that are new, moved or were modified since they were
+        last read are read again, and sessions whose folder is gone are
+        removed with their stage records. A session name found in two places
+        is catalogued once, with a warning. Working folders of unfinished
+        recordings are not sessions yet; they are counted and reported, as
+        one left by a crash is only finalized by the recorder's
+        recover_working_folders.
+
+        Returns:
+            dict: Number of sessions 'added', 'updated', 'removed' and 'unchanged',
+                  and of 'unfinished' recordings
+        """
+        known = {row['name']: (row['mtime_ns'], row['path'])
+                 for row in self.connection.execute('SELECT name, mtime_ns, path FROM sessions')}
+        counts = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0, 'unfinished': 0}
+        seen = {}
+
+        sessions, unfinished = self._scan()
+        for path in unfinished:
+            print(f"⚠️ Unfinished recording, still recording or interrupted: {path}")
+        counts['unfinished'] = len(unfinished)
+
+        with self.connection:
+            for entry in sorted(sessions, key=lambda entry: entry.path):
+                if entry.name in seen:
+                    print(f"⚠️ Session {entry.name} is in both {seen[entry.name]} and {entry.path}, "
+                          f"only the first is catalogued")
+                    continue
+                seen[entry.name] = entry.path
+                mtime_ns = entry.stat().st_mtime_ns
+                if known.get(entry.name) == (mtime_ns, entry.path):
+                    counts['unchanged'] += 1
+                    continue
+                self._upsert(self._read_session(entry.path, mtime_ns))
+                counts['updated' if entry.name in known else 'added'] += 1
+
+            for name in set(known) - set(seen):
+                self.connection.execute('DELETE FROM sessions WHERE name = ?', (name,))
+                counts['removed'] += 1
+        return counts
+
+    def set_stage(self, session, stage, status, elapsed_s=None):
+        """
+        Record the outcome of a processing stage for a session.
+
+        Args:
+            session (str): Session folder or name
+            stage (str): Stage name, e.g. 'ocr'
+            status (str): e.g. 'completed' or 'failed'
+            elapsed_s (float, optional): Time the stage took
+        """
+        name = os.path.basename(os.path.normpath(session))
+        with self.connection:
+            if self.connection.execute('SELECT 1 FROM sessions WHERE name = ?', (name,)).fetchone() is None:
+                return
+            self.connection.execute(
+                'INSERT INTO stages (session, stage, status, elapsed_s, updated_at) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT(session, stage) DO UPDATE SET status=excluded.status, '
+                'elapsed_s=excluded.elapsed_s, updated_at=excluded.updated_at',
+                (name, stage, status, elapsed_s, self._now()))
+
+    def stage_status(self, session):
+        """
+        Status of every stage recorded for a session.
+
+        Returns:
+            dict: Stage name to status
+        """
+        name = os.path.basename(os.path.normpath(session))
+        return {row['stage']: row['status'] for row in
+                self.connection.execute('SELECT stage, status FROM stages WHERE session = ?', (name,))}
+
+    def sessions(self, modalities=(), any_modality=(), min_duration_s=None, max_duration_s=None,
+                 since=None, until=None, pending_stage=None):
+        """
+        Session folders matching all the given conditions, oldest first.
+
+        For example, unprocessed sessions with webcam video longer than ten
+        minutes are sessions(modalities=['webcam'], min_duration_s=600,
+        pending_stage='openface').
+
+        Args:
+            modalities (list): Modalities every session must have
+            any_modality (list): Modalities of which a session must have at least one
+            min_duration_s, max_duration_s (float, optional): Bounds on the recording length
+            since, until (optional): Bounds on the session start, as anything pandas.Timestamp accepts
+            pending_stage (str, optional): Only sessions this stage has not completed
+
+        Returns:
+            list: Absolute session folder paths
+        """
+        conditions, parameters = [], []
+        for modality in modalities:
+            self._check_modality(modality)
+            conditions.append(f'has_{modality} = 1')
+        if any_modality:
+            for modality in any_modality:
+                self._check_modality(modality)
+            conditions.append('(' + ' OR '.join(f'has_{modality} = 1' for modality in any_modality) + ')')
+        if min_duration_s is not None:
+            conditions.append('duration_s >= ?')
+            parameters.append(min_duration_s)
+        if max_duration_s is not None:
+            conditions.append('duration_s <= ?')
+            parameters.append(max_duration_s)
+        if since is not None or until is not None:
+            from .Session_Index import to_ns
+            if since is not None:
+                conditions.append('start_ns >= ?')
+                parameters.append(to_ns(since))
+            if until is not None:
+                conditions.append('start_ns <= ?')
+                parameters.append(to_ns(until))
+        if pending_stage is not None:
+            conditions.append("NOT EXISTS (SELECT 1 FROM stages WHERE stages.session = sessions.name "
+                              "AND stages.stage = ? AND stages.status = 'completed')")
+            parameters.append(pending_stage)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        return [row['path'] for row in
+                self.connection.execute(f'SELECT path FROM sessions {where} ORDER BY start_ns', parameters)]
+
+    @staticmethod
+    def _check_modality(modality):
+        if modality not in MODALITY_FILES:
+            raise ValueError(f"Unknown modality '{modality}'; expected one of {list(MODALITY_FILES)}")
+
+
+def _holds_recording(folder):
+    return any(os.path.exists(os.path.join(folder, filename))
+               for filenames in MODALITY_FILES.values() for filename in filenames)
+
+
+def add_saved_sessions(data_folder, session_folders):
+    """
+    Add newly saved sessions to the catalog of their data folder.
+
+    Meant as the recorder's on_sessions_saved callback, so a catalog that
+    cannot be written never fails a recording; the sessions are then picked
+    up by the next rescan.
+
+    Args:
+        data_folder (str): Folder the sessions were saved in
+        session_folders (list): The saved session folders
+
+    Returns:
+        bool: Whether the catalog was updated
+    """
+    try:
+        with Session_Catalog(data_folder) as catalog:
+            for session_folder in session_folders:
+                catalog.add_session(session_folder)
+        return True
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not add {len(session_folders)} session(s) to the catalog, "
+              f"they are picked up on the next rescan: {e}")
+        return False
+
+
+def capture_sessions(folder, stem, rescan=False):
+    """
+    Session folders under folder holding a recording named stem, whole or
+    segmented, that its processing stage has not completed.
+
+    A session folder is returned as is, so a session can always be processed
+    again explicitly. A data folder is looked up in its catalog, as
+    Model._sessions does, leaving out sessions whose stage in CAPTURE_STAGES
+    is recorded as completed. The recorder adds sessions to the catalog as
+    it saves them, so the folders are only walked when rescan is set, e.g.
+    for sessions copied into the data folder by other means.
+
+    Args:
+        folder (str): A session folder or a data folder
+        stem (str): 'screen_capture' or 'webcam_capture'
+        rescan (bool): Reconcile the catalog with the disk first
+
+    Returns:
+        list: Session folder paths
+    """
+    modality = stem.split('_')[0]
+    if parse_session_name(os.path.basename(os.path.normpath(str(folder)))) is not None:
+        filenames = MODALITY_FILES[modality]
+        return [str(folder)] if any(os.path.exists(os.path.join(str(folder), f)) for f in filenames) else []
+    with Session_Catalog(folder) as catalog:
+        if rescan:
+            catalog.rescan()
+        return catalog.sessions(modalities=[modality], pending_stage=CAPTURE_STAGES[stem])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query or rescan the session catalog of a data folder.')
+    parser.add_argument('data_folder', help='Folder holding the recording sessions')
+    parser.add_argument('-rescan', action='store_true', help='Reconcile the catalog with the disk first')
+    parser.add_argument('-modality', nargs='+', default=[], choices=list(MODALITY_FILES),
+                        help='Only sessions with all of these modalities')
+    parser.add_argument('-min_minutes', type=float, help='Only sessions at least this long')
+    parser.add_argument('-pending', help='Only sessions this stage has not completed, e.g. openface')
+    args = parser.parse_args()
+
+    with Session_Catalog(args.data_folder) as catalog:
+        if args.rescan:
+            print(f"Rescanned: {catalog.rescan()}")
+        sessions = catalog.sessions(args.modality,
+                                    min_duration_s=args.min_minutes * 60 if args.min_minutes is not None else None,
+                                    pending_stage=args.pending)
+        for session in sessions:
+            print(session)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+import os
+import io
+import csv
+import json
+import glob
+import datetime
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from Common_Module.Session_Layout import SESSION_TIME_FORMAT
+
+
+INDEX_FOLDER_NAME = 'Index'
+INDEX_VERSION = 1
+BUILD_BATCH_SIZE = 100000
+
+
+def session_start_ns(session_folder):
+    """
+    Parse the start time of a recording session from its folder name.
+
+    Session folders are named 'start_--_stop' by Central_Data_Controller, with
+    both timestamps in YYYY-MM-DD_HH-MM-SS format.
+
+    Args:
+        session_folder (str): Path to the recording session folder
+
+    Returns:
+        int: Session start as naive wall-clock nanoseconds
+    """
+    name = Path(session_folder).name
+    start = datetime.datetime.strptime(name.split('_--_')[0], SESSION_TIME_FORMAT)
+    return pd.Timestamp(start).value
+
+
+def to_ns(t):
+    """
+    Convert a point in time to naive wall-clock nanoseconds.
+
+    Args:
+        t: Integer nanoseconds, or anything pandas.Timestamp accepts
+           (datetime, numpy.datetime64, ISO string, ...)
+
+    Returns:
+        int: Nanoseconds on the session timeline
+    """
+    if isinstance(t, (int, np.integer)):
+        return int(t)
+    return pd.Timestamp(t).value
+
+
+def iter_csv_records(f):
+    """
+    Yield the byte offset and raw bytes of every record in a CSV file.
+
+    Records are split on newlines, except inside quoted fields, so keys such
+    as a literal comma or newline logged by the keyboard handler stay intact.
+
+    Args:
+        f: CSV file opened in binary mode, positioned at the first record
+
+    Yields:
+        tuple: (offset, record_bytes)
+    """
+    offset = f.tell()
+    pending = b''
+    pending_offset = offset
+    for line in f:
+        if not pending:
+            pending_offset = offset
+        pending += line
+        offset += len(line)
+        # An odd number of quotes means a quoted field continues on the next line
+        if pending.count(b'"') % 2 == 0:
+            yield pending_offset, pending
+            pending = b''
+    if pending:
+        yield pending_offset, pending
+
+
+class Stream_Source:
+    """
+    Description of one recorded stream and how to place its records on the
+    session timeline.
+
+    Attributes:
+        name (str): Stream name used in queries ('keyboard', 'ocr', ...)
+        path (Path): File holding the stream's records
+        kind (str): 'csv' for comma-separated records, 'jsonl' for one JSON object per line
+        time_field (str): Column or key holding each record's time
+        relative (bool): True if the time field is seconds since the session start,
+                         False if it is a wall-clock timestamp
+    """
+
+    def __init__(self, name, path, kind, time_field, relative):
+        self.name = name
+        self.path = Path(path)
+        self.kind = kind
+        self.time_field = time_field
+        self.relative = relative
+
+
+class Session_Index:
+    """
+    Time index over every data stream of a single recording session.
+
+    Keyboard and mouse logs carry wall-clock timestamps, OCR output carries
+    seconds into the screen capture and OpenFace output carries seconds into
+    the webcam capture. The index places all of them on one nanosecond
+    timeline and keeps, per stream, a sorted array of record times and the
+    byte offset of every record in its source file. A range query is then a
+    binary search plus a single read of the matching records, so files are
+    never loaded whole.
+
+    The arrays are persisted as .npy files in an 'Index' folder inside the
+    session folder and memory-mapped on later opens. A stream is rebuilt
+    automatically when its source file changes.
+
+    Attributes:
+        session_folder (Path): The recording session folder
+        index_folder (Path): Where the persisted index is stored
+        start_ns (int): Session start on the shared timeline
+        sources (dict): Stream name to Stream_Source for every stream found on disk
+    """
+
+    def __init__(self, session_folder, rebuild=False):
+        """
+        Open the index of a session, building or refreshing it as needed.
+
+        Args:
+            session_folder (str): Path to a 'start_--_stop' recording folder
+            rebuild (bool): Discard any persisted index and build from scratch
+        """
+        self.session_folder = Path(session_folder)
+        if not self.session_folder.is_dir():
+            raise FileNotFoundError(f'Session folder not found: {session_folder}')
+
+        self.index_folder = self.session_folder / INDEX_FOLDER_NAME
+        self.start_ns = session_start_ns(self.session_folder)
+        self.sources = self._discover_sources()
+
+        self._manifest = {} if rebuild else self._load_manifest()
+        self._arrays = {}
+        self._headers = {}
+
+        built = False
+        for source in self.sources.values():
+            if rebuild or not self._is_current(source):
+                self._build_stream(source)
+                built = True
+            self._open_stream(source)
+
+        if built:
+            self._save_manifest()
+
+    @property
+    def streams(self):
+        """
+        Names of all indexed streams.
+        """
+        return list(self.sources)
+
+    def _discover_sources(self):
+        """
+        Locate the stream files belonging to this session.
+
+        Raw logs live in the session folder itself, processed outputs live in
+        the 'EasyOCR' and 'Openface' folders next to it, under the session name.
+        """
+        data_folder = self.session_folder.parent
+        session_name = self.session_folder.name
+        sources = {}
+
+        keyboard_log = self.session_folder / 'keyboard_log.csv'
+        if keyboard_log.exists():
+            sources['keyboard'] = Stream_Source('keyboard', keyboard_log, 'csv', 'time', False)
+
+        mouse_log = self.session_folder / 'mouse_log.csv'
+        if mouse_log.exists():
+            sources['mouse'] = Stream_Source('mouse', mouse_log, 'csv', 'time', False)
+
+        ocr_dir = data_folder / 'EasyOCR' / session_name
+        ocr_output = ocr_dir / 'ocr_output.jsonl'
+        if not ocr_output.exists():
+            # Sessions processed before the indexed OCR format
+            ocr_output = ocr_dir / 'ocr_output.json'
+        if ocr_output.exists():
+            sources['ocr'] = Stream_Source('ocr', ocr_output, 'jsonl', 'timestamp', True)
+
+        # Text spans are placed on the timeline by the time they first appeared
+        ocr_spans = ocr_dir / 'ocr_spans.jsonl'
+        if ocr_spans.exists():
+            sources['ocr_spans'] = Stream_Source('ocr_spans', ocr_spans, 'jsonl', 't_start', True)
+
+        openface_dir = data_folder / 'Openface' / session_name
+        openface_output = openface_dir / 'webcam_capture.csv'
+        if not openface_output.exists():
+            candidates = sorted(glob.glob(str(openface_dir / '*.csv')))
+            openface_output = Path(candidates[0]) if candidates else None
+        if openface_output is not None:
+            sources['openface'] = Stream_Source('openface', openface_output, 'csv', 'timestamp', True)
+
+        return sources
+
+    def _load_manifest(self):
+        manifest_path = self.index_folder / 'manifest.json'
+        if not manifest_path.exists():
+            return {}
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            # A damaged manifest only costs a rebuild
+            return {}
+        if manifest.get('version') != INDEX_VERSION:
+            return {}
+        return manifest.get('streams', {})
+
+    def _save_manifest(self):
+        self.index_folder.mkdir(parents=True, exist_ok=True)
+        manifest_path = self.index_folder / 'manifest.json'
+        temp_path = self.index_folder / 'manifest.json.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'version': INDEX_VERSION, 'start_ns': self.start_ns, 'streams': self._manifest}, f, indent=2)
+        os.replace(temp_path, manifest_path)
+
+    def _is_current(self, source):
+        entry = self._manifest.get(source.name)
+        if not entry:
+            return False
+        stat = source.path.stat()
+        return (entry['path'] == str(source.path)
+                and entry['size'] == stat.st_size
+                and entry['mtime_ns'] == stat.st_mtime_ns
+                and (self.index_folder / f'{source.name}.times.npy').exists())
+
+    def _build_stream(self, source):
+        """
+        Scan a stream file once, recording each record's time and byte offset.
+
+        Times are parsed in batches so the file is streamed rather than loaded.
+        """
+        offsets = []
+        times = []
+        batch = []
+        header = b''
+
+        def flush():
+            if not batch:
+                return
+            if source.relative:
+                seconds = pd.to_numeric(pd.Series(batch), errors='coerce').to_numpy(dtype=np.float64)
+                missing = np.isnan(seconds)
+                # Offset in integers so the epoch-sized start keeps nanosecond precision
+                values = self.start_ns + np.round(np.where(missing, 0, seconds) * 1e9).astype(np.int64)
+                values[missing] = np.iinfo(np.int64).min
+            else:
+                values = pd.to_datetime(pd.Series(batch), errors='coerce').to_numpy(dtype='datetime64[ns]').astype(np.int64)
+            times.append(values)
+            batch.clear()
+
+        with open(source.path, 'rb') as f:
+            if source.kind == 'csv':
+                header = f.readline()
+                columns = [c.strip() for c in header.decode('utf-8').strip().split(',')]
+                if source.time_field not in columns:
+                    raise ValueError(f"'{source.time_field}' column missing from {source.path}")
+                column = columns.index(source.time_field)
+                for offset, record in iter_csv_records(f):
+                    if not record.strip():
+                        continue
+                    offsets.append(offset)
+                    if b'"' not in record:
+                        batch.append(record.split(b',', column + 1)[column].decode('utf-8').strip())
+                    else:
+                        row = next(csv.reader(io.StringIO(record.decode('utf-8')), skipinitialspace=True))
+                        batch.append(row[column].strip())
+                    if len(batch) >= BUILD_BATCH_SIZE:
+                        flush()
+            else:
+                offset = 0
+                for line in f:
+                    if line.strip():
+                        offsets.append(offset)
+                        batch.append(json.loads(line).get(source.time_field))
+                        if len(batch) >= BUILD_BATCH_SIZE:
+                            flush()
+                    offset += len(line)
+            end_offset = f.tell()
+        flush()
+
+        times = np.concatenate(times) if times else np.empty(0, dtype=np.int64)
+        # Offsets carry one trailing entry so record i spans [offsets[i], offsets[i + 1])
+        offsets = np.asarray(offsets + [end_offset], dtype=np.int64)
+
+        # Records without a parseable time cannot be placed on the timeline
+        valid = times != np.iinfo(np.int64).min
+        positions = np.flatnonzero(valid)
+        order = positions[np.argsort(times[valid], kind='stable')]
+
+        self.index_folder.mkdir(parents=True, exist_ok=True)
+        np.save(self.index_folder / f'{source.name}.times.npy', times[order])
+        np.save(self.index_folder / f'{source.name}.offsets.npy', offsets)
+        np.save(self.index_folder / f'{source.name}.order.npy', order.astype(np.int64))
+
+        stat = source.path.stat()
+        self._manifest[source.name] = {
+            'path': str(source.path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'kind': source.kind,
+            'header': header.decode('utf-8'),
+            'count': int(len(order)),
+        }
+
+    def _open_stream(self, source):
+        arrays = {}
+        for key in ('times', 'offsets', 'order'):
+            arrays[key] = np.load(self.index_folder / f'{source.name}.{key}.npy', mmap_mode='r')
+        self._arrays[source.name] = arrays
+        self._headers[source.name] = self._manifest[source.name]['header'].encode('utf-8')
+
+    def _check_stream(self, stream):
+        if stream not in self.sources:
+            raise KeyError(f"Stream '{stream}' not recorded in this session. Available: {self.streams}")
+
+    def _bounds(self, stream, t0, t1):
+        times = self._arrays[stream]['times']
+        lo = 0 if t0 is None else int(np.searchsorted(times, to_ns(t0), side='left'))
+        hi = len(times) if t1 is None else int(np.searchsorted(times, to_ns(t1), side='right'))
+        return lo, max(lo, hi)
+
+    def count(self, stream, t0=None, t1=None):
+        """
+        Count the records of a stream in [t0, t1] without reading them.
+
+        Args:
+            stream (str): Stream name
+            t0, t1: Inclusive time bounds; None leaves that side open
+
+        Returns:
+            int: Number of matching records
+        """
+        self._check_stream(stream)
+        lo, hi = self._bounds(stream, t0, t1)
+        return hi - lo
+
+    def time_range(self, stream):
+        """
+        First and last record time of a stream.
+
+        Args:
+            stream (str): Stream name
+
+        Returns:
+            tuple: (first_ns, last_ns), or None if the stream is empty
+        """
+        self._check_stream(stream)
+        times = self._arrays[stream]['times']
+        if len(times) == 0:
+            return None
+        return int(times[0]), int(times[-1])
+
+    def times(self, stream, t0=None, t1=None):
+        """
+        Sorted record times of a stream in [t0, t1], as nanoseconds.
+        """
+        self._check_stream(stream)
+        lo, hi = self._bounds(stream, t0, t1)
+        return np.asarray(self._arrays[stream]['times'][lo:hi])
+
+    def query(self, stream, t0=None, t1=None):
+        """
+        Read the records of one stream that fall in [t0, t1].
+
+        Args:
+            stream (str): 'keyboard', 'mouse', 'ocr', 'ocr_spans' or 'openface'
+            t0, t1: Inclusive time bounds as nanoseconds or anything
+                    pandas.Timestamp accepts; None leaves that side open
+
+        Returns:
+            pandas.DataFrame: Matching records in time order, with a 'time_ns'
+            column holding each record's position on the session timeline
+        """
+        self._check_stream(stream)
+        lo, hi = self._bounds(stream, t0, t1)
+        arrays = self._arrays[stream]
+        rows = np.asarray(arrays['order'][lo:hi])
+        raw = self._read_records(stream, rows)
+
+        if self.sources[stream].kind == 'csv':
+            frame = pd.read_csv(io.BytesIO(self._headers[stream] + raw), skipinitialspace=True)
+            frame.columns = [c.strip() for c in frame.columns]
+        else:
+            frame = pd.DataFrame([json.loads(line) for line in raw.splitlines() if line.strip()])
+
+        frame['time_ns'] = np.asarray(arrays['times'][lo:hi])
+        return frame
+
+    def query_all(self, t0=None, t1=None):
+        """
+        Read every stream's records that fall in [t0, t1].
+
+        Returns:
+            dict: Stream name to pandas.DataFrame, as returned by query()
+        """
+        return {stream: self.query(stream, t0, t1) for stream in self.sources}
+
+    def _read_records(self, stream, rows):
+        """
+        Read the raw bytes of the given records.
+
+        When the records are consecutive in the file, which is the usual case
+        since every stream is written in time order, a single read suffices.
+        """
+        if len(rows) == 0:
+            return b''
+        offsets = self._arrays[stream]['offsets']
+        with open(self.sources[stream].path, 'rb') as f:
+            if rows[-1] - rows[0] == len(rows) - 1 and np.all(np.diff(rows) == 1):
+                start = int(offsets[rows[0]])
+                f.seek(start)
+                return f.read(int(offsets[rows[-1] + 1]) - start)
+
+            chunks = []
+            for row in rows:
+                start = int(offsets[row])
+                f.seek(start)
+                chunk = f.read(int(offsets[row + 1]) - start)
+                chunks.append(chunk if chunk.endswith(b'\n') else chunk + b'\n')
+            return b''.join(chunks)
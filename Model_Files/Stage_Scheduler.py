@@ -0,0 +1,247 @@
+import os
+import json
+import time
+import datetime
+from multiprocessing.connection import wait
+from Common_Module.Process_Context import handler_context
+
+
+STATE_FILENAME = 'pipeline_state.json'
+
+
+class Stage:
+    """
+    A named step of the model pipeline, run once per recording session.
+
+    Attributes:
+        name (str): Stage name, used in dependencies, progress events and the state file
+        target (callable): Picklable callable taking a session folder path; run in its own process,
+                           so it must be importable by name, e.g. a module-level function
+        depends_on (list): Names of stages that must complete for the same session first
+        max_concurrency (int): Most sessions this stage may process at once
+        applies_to (callable): Optional predicate on the session folder; sessions it rejects
+                               skip the stage, e.g. OpenFace for sessions without webcam video
+        takes_threads (bool): Call the target as target(session, threads), where threads is a
+                              shared multiprocessing.Value holding the task's current core
+                              allowance, or None when no governor is in use
+    """
+
+    def __init__(self, name, target, depends_on=(), max_concurrency=1, applies_to=None, takes_threads=False):
+        self.name = name
+        self.target = target
+        self.depends_on = list(depends_on)
+        self.max_concurrency = max_concurrency
+        self.applies_to = applies_to
+        self.takes_threads = takes_threads
+
+
+class Stage_Scheduler:
+    """
+    Dependency-aware executor for per-session pipeline stages.
+
+    Every (session, stage) pair is a task run in its own process, started
+    from the same preloaded context as the recorders' processes (see
+    handler_context), so none is forked from the caller's threads. A task
+    starts as soon as the stages it depends on have completed for the same
+    session, subject to the stage's concurrency limit and the overall worker
+    limit, so independent stages overlap and dependent ones wait only for
+    their own inputs.
+
+    With a Resource_Governor, how many tasks of each stage may run and how
+    many threads each may use follow the governor's split of the core budget.
+    The split is recomputed as tasks start and finish, and the thread
+    allowance of tasks already running is updated in place.
+
+    Completed tasks are recorded in a state file, so a rerun after a crash
+    or a failed stage resumes where it stopped. Progress is reported through
+    a callback receiving one event dict per task state change.
+
+    Attributes:
+        stages (dict): Stage name to Stage, in declaration order
+        state_path (str): JSON file holding the status and timing of every task
+        max_workers (int): Most task processes running at once
+        progress_callback (callable): Called with each progress event dict
+        governor (Resource_Governor): Optional CPU budget governor
+    """
+
+    def __init__(self, stages, state_path, max_workers=None, progress_callback=None, governor=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_path = state_path
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.progress_callback = progress_callback
+        self.governor = governor
+
+        for stage in stages:
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dependency}'")
+        self._check_acyclic()
+
+        self.state = self._load_state()
+
+    def _check_acyclic(self):
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage dependencies form a cycle through '{name}'")
+            visiting.add(name)
+            for dependency in self.stages[name].depends_on:
+                visit(dependency)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def _load_state(self):
+        if os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, 'r') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, OSError):
+                # A damaged state file only costs rerunning completed stages
+                return {}
+        return {}
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        temp_path = f'{self.state_path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(temp_path, self.state_path)
+
+    @staticmethod
+    def _task_key(session, stage_name):
+        return f'{os.path.basename(os.path.normpath(session))}::{stage_name}'
+
+    def _report(self, status, session, stage_name, **details):
+        event = {
+            'status': status,
+            'stage': stage_name,
+            'session': os.path.basename(os.path.normpath(session)),
+            'time': datetime.datetime.now().isoformat(timespec='seconds'),
+            **details,
+        }
+        if self.progress_callback:
+            self.progress_callback(event)
+
+    def _is_ready(self, session, name, status):
+        dependencies = [status[self._task_key(session, d)] for d in self.stages[name].depends_on]
+        return all(s in ('completed', 'not_applicable') for s in dependencies)
+
+    def _allocate(self, pending, running_per_stage, status):
+        if self.governor is None:
+            return {}
+        demand = dict(running_per_stage)
+        for session, name in pending:
+            if self._is_ready(session, name, status):
+                demand[name] += 1
+        return self.governor.allocate(demand, running_per_stage)
+
+    def run(self, sessions, force=False):
+        """
+        Run every stage for every session, respecting dependencies and limits.
+
+        Args:
+            sessions (list): Recording session folders
+            force (bool): Rerun tasks even if the state file marks them completed
+
+        Returns:
+            dict: Stage name to {'completed', 'failed', 'skipped', 'total_s', 'max_s'}
+                  for the tasks run in this call
+        """
+        pending = []
+        status = {}
+        for session in sessions:
+            for name, stage in self.stages.items():
+                key = self._task_key(session, name)
+                if stage.applies_to is not None and not stage.applies_to(session):
+                    status[key] = 'not_applicable'
+                elif not force and self.state.get(key, {}).get('status') == 'completed':
+                    status[key] = 'completed'
+                    self._report('resumed', session, name)
+                else:
+                    pending.append((session, name))
+                    status[key] = 'pending'
+
+        timings = {name: {'completed': 0, 'failed': 0, 'skipped': 0, 'total_s': 0.0, 'max_s': 0.0}
+                   for name in self.stages}
+        context = handler_context()
+        running = {}
+        running_per_stage = {name: 0 for name in self.stages}
+
+        while pending or running:
+            # Drop tasks whose inputs can no longer be produced
+            for session, name in list(pending):
+                dependencies = [status[self._task_key(session, d)] for d in self.stages[name].depends_on]
+                if any(s in ('failed', 'skipped') for s in dependencies):
+                    pending.remove((session, name))
+                    status[self._task_key(session, name)] = 'skipped'
+                    timings[name]['skipped'] += 1
+                    self._report('skipped', session, name, reason='dependency failed')
+
+            allocation = self._allocate(pending, running_per_stage, status)
+
+            # Start every task that is ready, within the limits
+            for session, name in list(pending):
+                if len(running) >= self.max_workers:
+                    break
+                stage = self.stages[name]
+                limit = min(stage.max_concurrency, allocation[name]['concurrency']) if name in allocation \
+                    else stage.max_concurrency
+                if running_per_stage[name] >= limit:
+                    continue
+                if not self._is_ready(session, name, status):
+                    continue
+
+                args = (session,)
+                threads = None
+                if stage.takes_threads:
+                    threads = context.Value('i', allocation[name]['threads']) if name in allocation else None
+                    args = (session, threads)
+                process = context.Process(target=stage.target, args=args)
+                process.start()
+                running[process.sentinel] = (process, session, name, time.perf_counter(), threads)
+                running_per_stage[name] += 1
+                pending.remove((session, name))
+                status[self._task_key(session, name)] = 'running'
+                self._report('started', session, name)
+
+            if not running:
+                # Nothing can start and nothing is running; only unreachable tasks remain
+                break
+
+            # Rebalance the threads of running tasks over their stage's current share
+            for process, session, name, started, threads in running.values():
+                if threads is not None and name in allocation:
+                    threads.value = max(1, allocation[name]['cores'] // running_per_stage[name])
+
+            for sentinel in wait(list(running)):
+                process, session, name, started, threads = running.pop(sentinel)
+                process.join()
+                elapsed = time.perf_counter() - started
+                running_per_stage[name] -= 1
+                key = self._task_key(session, name)
+
+                if process.exitcode == 0:
+                    status[key] = 'completed'
+                    timings[name]['completed'] += 1
+                    timings[name]['total_s'] += elapsed
+                    timings[name]['max_s'] = max(timings[name]['max_s'], elapsed)
+                    self.state[key] = {
+                        'status': 'completed',
+                        'elapsed_s': elapsed,
+                        'finished': datetime.datetime.now().isoformat(timespec='seconds'),
+                    }
+                    self._report('completed', session, name, elapsed_s=elapsed)
+                else:
+                    status[key] = 'failed'
+                    timings[name]['failed'] += 1
+                    self.state[key] = {'status': 'failed', 'exitcode': process.exitcode, 'elapsed_s': elapsed}
+                    self._report('failed', session, name, elapsed_s=elapsed, exitcode=process.exitcode)
+                self._save_state()
+
+        return timings
@@ -0,0 +1,88 @@
+import os
+import sys
+import subprocess
+import argparse
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UI_DIR = os.path.join(REPO_DIR, 'User_Interface')
+
+# Imports that must not happen before the first window is shown
+HEAVY_MODULES = ('cv2', 'mss', 'pyautogui', 'pandas', 'pynput', 'numpy', 'torch', 'easyocr')
+
+
+def measure_imports(module, python=None):
+    """
+    Import a module in a fresh interpreter and time every import it triggers.
+
+    Uses the interpreter's own -X importtime instrumentation, so the numbers
+    include everything a cold start pays for, with the UI folder and the
+    repository on the path the way the apps run.
+
+    Args:
+        module (str): Module to import, e.g. 'Main_App'
+        python (str, optional): Interpreter to use; defaults to the current one
+
+    Returns:
+        list: One dict per imported module with 'module', 'self_us', 'cumulative_us'
+              and 'depth' (1 for direct imports), in import order
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [UI_DIR, REPO_DIR, env.get('PYTHONPATH')]))
+    result = subprocess.run([python or sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, cwd=REPO_DIR, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        entries.append({
+            'module': name.strip(),
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+            # importtime indents nested imports by two spaces per level
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2 + 1,
+        })
+    return entries
+
+
+def import_report(module, top=20, python=None):
+    """
+    Human-readable summary of what importing a module costs.
+
+    Lists the slowest top-level imports by cumulative time and flags any of
+    HEAVY_MODULES that were loaded.
+
+    Returns:
+        str: The report
+    """
+    entries = measure_imports(module, python)
+    loaded = {entry['module'] for entry in entries}
+    total_us = sum(entry['self_us'] for entry in entries)
+    heavy = [name for name in HEAVY_MODULES if name in loaded]
+
+    lines = [f"Import of {module}: {total_us / 1e3:.1f} ms over {len(entries)} modules"]
+    lines.append(f"Heavy modules loaded: {', '.join(heavy) if heavy else 'none'}")
+    lines.append('')
+    lines.append(f"{'cumulative ms':>14}  {'self ms':>8}  module")
+    direct = sorted((entry for entry in entries if entry['depth'] == 1),
+                    key=lambda entry: entry['cumulative_us'], reverse=True)
+    for entry in direct[:top]:
+        lines.append(f"{entry['cumulative_us'] / 1e3:>14.1f}  {entry['self_us'] / 1e3:>8.1f}  {entry['module']}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report the import cost of a module on a cold interpreter.')
+    parser.add_argument('module', nargs='?', default='Main_App', help='Module to import (default: Main_App)')
+    parser.add_argument('-top', type=int, default=20, help='Top-level imports to list')
+    args = parser.parse_args()
+
+    print(import_report(args.module, args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import os
+import io
+import sys
+import glob
+import json
+import shutil
+import pstats
+import cProfile
+import tracemalloc
+import argparse
+
+
+# Comma-separated profiling modes, e.g. COGNITIVE_MODELER_PROFILE=cpu,memory
+PROFILE_ENV_VAR = 'COGNITIVE_MODELER_PROFILE'
+PROFILE_MODES = ('cpu', 'memory')
+PROFILE_FOLDER_NAME = 'Profiles'
+REPORT_FILENAME = 'profile_report.txt'
+TRACEMALLOC_FRAMES = 10
+
+
+def profiling_modes(config=None):
+    """
+    Profiling modes switched on by the environment or a config dict.
+
+    Args:
+        config (dict, optional): Config with a "profile" list, e.g. ["cpu", "memory"]
+
+    Returns:
+        set: Enabled modes out of 'cpu' and 'memory'; empty when profiling is off
+    """
+    requested = set()
+    env_value = os.environ.get(PROFILE_ENV_VAR, '')
+    if env_value.strip().lower() in ('1', 'true', 'all'):
+        requested.update(PROFILE_MODES)
+    else:
+        requested.update(mode.strip().lower() for mode in env_value.split(',') if mode.strip())
+    if config:
+        requested.update(mode.lower() for mode in config.get("profile", []))
+
+    unknown = requested - set(PROFILE_MODES)
+    if unknown:
+        raise ValueError(f"Unknown profiling modes {sorted(unknown)}; expected any of {PROFILE_MODES}")
+    return requested
+
+
+def run_profiled(target, output_dir, name, modes, *args):
+    """
+    Process entry point that runs target under cProfile and/or tracemalloc.
+
+    Pass this as a multiprocessing.Process target in place of the real entry
+    point. Results are written to output_dir when the target returns or raises:
+    - <name>_<pid>.prof: cProfile stats, readable with pstats or snakeviz
+    - <name>_<pid>.tracemalloc: tracemalloc snapshot of live allocations
+    - <name>_<pid>.memory.json: current and peak traced memory
+
+    Args:
+        target (callable): The real process entry point
+        output_dir (str): Folder receiving the profile files
+        name (str): Process label used in the filenames
+        modes (set): Profiling modes from profiling_modes()
+        *args: Arguments for target
+    """
+    profiler = cProfile.Profile() if 'cpu' in modes else None
+    if 'memory' in modes:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    if profiler:
+        profiler.enable()
+    try:
+        return target(*args)
+    finally:
+        if profiler:
+            profiler.disable()
+        os.makedirs(output_dir, exist_ok=True)
+        prefix = os.path.join(output_dir, f'{name}_{os.getpid()}')
+        if profiler:
+            profiler.dump_stats(f'{prefix}.prof')
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.take_snapshot().dump(f'{prefix}.tracemalloc')
+            tracemalloc.stop()
+            with open(f'{prefix}.memory.json', 'w') as f:
+                json.dump({'process': name, 'pid': os.getpid(), 'current_bytes': current, 'peak_bytes': peak}, f, indent=2)
+
+
+def collect_profiles(staging_dir, output_dir):
+    """
+    Move profile files from a staging folder into their final folder.
+
+    Args:
+        staging_dir (str): Folder the profiled process wrote to
+        output_dir (str): Destination, usually the session's Profiles folder
+    """
+    if not staging_dir or not os.path.isdir(staging_dir):
+        return
+    os.makedirs(output_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(staging_dir, '*')):
+        shutil.move(path, os.path.join(output_dir, os.path.basename(path)))
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def merge_profiles(profile_dir, top=40):
+    """
+    Merge every profile in a folder into one text report.
+
+    CPU profiles are shown per process and combined across processes, sorted
+    by cumulative time. Memory snapshots are summarized by the source lines
+    holding the most memory, along with each process's peak.
+
+    Args:
+        profile_dir (str): Folder holding .prof, .tracemalloc and .memory.json files
+        top (int): Number of entries to show per section
+
+    Returns:
+        str: Path of the written profile_report.txt
+    """
+    sections = []
+
+    cpu_profiles = sorted(glob.glob(os.path.join(profile_dir, '*.prof')))
+    if cpu_profiles:
+        combined = None
+        for path in cpu_profiles:
+            stream = io.StringIO()
+            stats = pstats.Stats(path, stream=stream)
+            stats.sort_stats('cumulative').print_stats(top)
+            sections.append(f'===== CPU: {os.path.basename(path)} =====\n{stream.getvalue()}')
+            if combined is None:
+                combined = pstats.Stats(path)
+            else:
+                combined.add(path)
+
+        stream = io.StringIO()
+        combined.stream = stream
+        combined.sort_stats('cumulative').print_stats(top)
+        sections.insert(0, f'===== CPU: all {len(cpu_profiles)} processes combined =====\n{stream.getvalue()}')
+
+    for path in sorted(glob.glob(os.path.join(profile_dir, '*.memory.json'))):
+        with open(path, 'r') as f:
+            memory = json.load(f)
+        lines = [f"===== Memory: {memory['process']} (pid {memory['pid']}) =====",
+                 f"Peak traced: {memory['peak_bytes'] / 2**20:.1f} MiB, "
+                 f"live at exit: {memory['current_bytes'] / 2**20:.1f} MiB"]
+        snapshot_path = path[:-len('.memory.json')] + '.tracemalloc'
+        if os.path.exists(snapshot_path):
+            snapshot = tracemalloc.Snapshot.load(snapshot_path)
+            for stat in snapshot.statistics('lineno')[:top]:
+                lines.append(str(stat))
+        sections.append('\n'.join(lines) + '\n')
+
+    report_path = os.path.join(profile_dir, REPORT_FILENAME)
+    with open(report_path, 'w') as f:
+        f.write('\n'.join(sections) if sections else 'No profiles found.\n')
+    return report_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge per-process profiles into one report.')
+    parser.add_argument('profile_dir', help="A session's Profiles folder")
+    parser.add_argument('-top', type=int, default=40, help='Entries to show per section')
+    args = parser.parse_args()
+
+    report_path = merge_profiles(args.profile_dir, args.top)
+    print(f"📝 Saved profile report to: {report_path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,73 @@
 import os
 import sys
+import json
+import shutil
 import subprocess
-from multiprocessing import Process, Pipe, Event
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from .Recorders.Keyboard_Mouse_Handler import Keyboard_Handler, Mouse_Handler
 from .Recorders.Screen_Handler import Screen_Handler
 from .Recorders.Webcam_Handler import Webcam_Handler
+from Common_Module.Session_Layout import load_manifest, SESSION_TIME_FORMAT, WORKING_FOLDER_PREFIX
+from Common_Module.Process_Context import handler_context, warm_up
+from Profiling_Module.Process_Profiler import merge_profiles, PROFILE_FOLDER_NAME
 
 import datetime
 
+# Names used for each handler code in metrics.json
+HANDLER_NAMES = {'k': 'keyboard', 'm': 'mouse', 's': 'screen', 'w': 'webcam'}
+
+def recover_working_folders(recording_location, on_recovered=None):
+    """
+    Finalize the working folders of recordings that were never stopped, e.g. after a crash.
+
+    Each is renamed to a session named after its start and the time its
+    last file was written, so what was recorded before the interruption is
+    processed like any other session. Only call this while nothing is
+    recording into recording_location.
+
+    Args:
+        recording_location (str): Base directory sessions are saved in
+        on_recovered (callable, optional): Called with recording_location and the list of
+                                           recovered session folders, if there are any
+
+    Returns:
+        list: The recovered session folders
+    """
+    if not os.path.isdir(recording_location):
+        return []
+    recovered = []
+    for name in sorted(os.listdir(recording_location)):
+        working_folder = os.path.join(recording_location, name)
+        if not name.startswith(WORKING_FOLDER_PREFIX) or not os.path.isdir(working_folder):
+            continue
+        start_time = name[len(WORKING_FOLDER_PREFIX):]
+        try:
+            datetime.datetime.strptime(start_time, SESSION_TIME_FORMAT)
+        except ValueError:
+            continue
+
+        last_write = max([os.path.getmtime(os.path.join(root, file))
+                          for root, _, files in os.walk(working_folder) for file in files],
+                         default=os.path.getmtime(working_folder))
+        stop_time = max(datetime.datetime.fromtimestamp(last_write).strftime(SESSION_TIME_FORMAT), start_time)
+        session_folder = os.path.join(recording_location, start_time + '_--_' + stop_time)
+        if os.path.exists(session_folder):
+            print(f"⚠️ Could not recover {working_folder}, {session_folder} already exists")
+            continue
+        os.rename(working_folder, session_folder)
+        print(f"♻️ Recovered an interrupted recording as {session_folder}")
+        recovered.append(session_folder)
+
+    if recovered and on_recovered:
+        on_recovered(recording_location, recovered)
+    return recovered
+
 def process_recordings(recording_folder, filename, screen_recording_filepath, stretch_factor):
     adjusted_capture_path = os.path.join(recording_folder, f'_{filename}')
     
@@ -39,9 +96,17 @@ class Central_Data_Controller:
     Each data stream is handled by a specialized handler class and can be
     activated/deactivated independently. The controller manages the recording lifecycle,
     including starting, stopping, and post-processing of recordings.
+
+    Start, stop and post-processing each have a blocking method and an
+    '_async' variant that returns a concurrent.futures.Future at once, for
+    callers such as the UI that must not wait; asyncio code can await it
+    through asyncio.wrap_future. Requests run one at a time in the order
+    made. Handlers are started and stopped concurrently, and every step is
+    reported to progress_callback.
     """
 
-    def __init__(self):
+    def __init__(self, screen_source=None, webcam_source=None, segment_seconds=None, live_processor_factory=None,
+                 on_sessions_saved=None, start_method=None, progress_callback=None):
         """
         Initialize the controller with all available handlers.
         
@@ -51,9 +116,36 @@ class Central_Data_Controller:
         - Webcam recording handler
         - Keyboard input handler
         - Mouse movement handler
+
+        Args:
+            screen_source (Capture_Source, optional): Replaces the screen as the source of
+                                                      screen recording frames
+            webcam_source (Capture_Source, optional): Replaces the system webcam as the
+                                                      source of webcam recording frames
+            segment_seconds (float, optional): Record screen and webcam video in segments
+                                               of this length instead of one file each
+            live_processor_factory (callable, optional): Creates the processor each completed
+                                                         segment is submitted to while recording,
+                                                         e.g. Model_Files' Live_Segment_Processor,
+                                                         so little is left to process after stopping.
+                                                         It needs submit, poll and cancel methods
+            on_sessions_saved (callable, optional): Called with the recording location and a list
+                                                    of session folders whenever sessions are saved
+                                                    there, including recovered ones, e.g. to add
+                                                    them to the model's session catalog
+            start_method (str, optional): How handler processes are started; see handler_context
+                                          (default: a preloaded fork server)
+            progress_callback (callable, optional): Called with an event dict for every
+                                                    step of starting, stopping and
+                                                    post-processing; may be called from
+                                                    any thread
         """
-        self.screen_handler = Screen_Handler()
-        self.webcam_handler = Webcam_Handler()
+        # Handlers create their events and queues from this context, so it is chosen first
+        handler_context(start_method)
+        threading.Thread(target=warm_up, daemon=True).start()
+
+        self.screen_handler = Screen_Handler(source=screen_source)
+        self.webcam_handler = Webcam_Handler(source=webcam_source)
         self.keyboard_handler = Keyboard_Handler()
         self.mouse_handler = Mouse_Handler()
 
@@ -61,13 +153,176 @@ class Central_Data_Controller:
         self.latest_start_time = str()
         self.latest_stop_time = str()
         self.recording_folder = str()
+        self.working_folder = str()
+
+        self.segment_seconds = segment_seconds
+        self.live_processor_factory = live_processor_factory
+        self.on_sessions_saved = on_sessions_saved
+        self.live_processor = None
+        self._segment_watcher = None
+        self._stop_watching = threading.Event()
+
+        self.progress_callback = progress_callback
+        # One control thread runs start, stop and post-processing requests in the order made
+        self._control_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='recording_control')
+
+    def _handler(self, code):
+        return {
+            'k': self.keyboard_handler,
+            'm': self.mouse_handler,
+            's': self.screen_handler,
+            'w': self.webcam_handler,
+        }[code]
+
+    def shutdown(self):
+        """
+        End every handler process and live processing job, e.g. when the application closes.
+
+        A recording still in progress is abandoned unsaved.
+        """
+        if self.live_processor:
+            self._stop_watching.set()
+            self.live_processor.cancel()
+            self.live_processor = None
+        for code in HANDLER_NAMES:
+            self._handler(code).shutdown()
+        self._control_executor.shutdown(wait=False)
+
+    def _report_progress(self, step, status, handler=None, **details):
+        event = {
+            'step': step,
+            'status': status,
+            'handler': handler,
+            'time': datetime.datetime.now().isoformat(timespec='seconds'),
+            **details,
+        }
+        if self.progress_callback:
+            self.progress_callback(event)
+
+    def _trigger_handlers(self, command, codes):
+        # Each handler starts or stops on its own thread, so the slowest handler sets the
+        # time taken rather than the sum of all of them
+        def trigger(code):
+            started = time.perf_counter()
+            self._report_progress(command, 'started', HANDLER_NAMES[code])
+            # Video handlers record straight into the working folder, the others save there at stop
+            save_dir = self.working_folder if command == 'stop' or self._handler(code).capture_stem else None
+            try:
+                self._handler(code).trigger_listener(command, save_dir)
+            except Exception as e:
+                self._report_progress(command, 'failed', HANDLER_NAMES[code], error=str(e))
+                raise
+            self._report_progress(command, 'completed', HANDLER_NAMES[code], elapsed_s=time.perf_counter() - started)
+
+        with ThreadPoolExecutor(max_workers=max(len(codes), 1)) as pool:
+            futures = [pool.submit(trigger, code) for code in codes]
+        for future in futures:
+            future.result()
+
+    def start_recording_async(self, recording_location=None, handlers=None):
+        """
+        Start recording without blocking; see start_recording.
+
+        Pass the handler codes here rather than setting active_handlers, so
+        they are applied on the control thread after any request still queued
+        ahead of this one, e.g. post-processing of the last recording.
+
+        Returns:
+            concurrent.futures.Future: Resolves once every handler is running
+        """
+        return self._control_executor.submit(self.start_recording, recording_location, handlers)
+
+    def stop_recording_async(self, recording_location, after=None):
+        """
+        Stop recording without blocking; see stop_recording.
+
+        Args:
+            recording_location (str): Base directory the session is saved in
+            after (concurrent.futures.Future, optional): The start_recording_async request
+                                                         this stop ends. The stop is queued
+                                                         once that request has finished, and
+                                                         fails without stopping anything if
+                                                         the start failed
+
+        Returns:
+            concurrent.futures.Future: Resolves to the session folder once it is saved
+        """
+        if after is None:
+            return self._control_executor.submit(self.stop_recording, recording_location)
+
+        stopped = Future()
+
+        def relay(queued):
+            if queued.exception() is not None:
+                stopped.set_exception(queued.exception())
+            else:
+                stopped.set_result(queued.result())
+
+        def chain(started):
+            if started.cancelled() or started.exception() is not None:
+                stopped.set_exception(RuntimeError('The recording did not start, so there is nothing to stop'))
+                return
+            try:
+                self._control_executor.submit(self.stop_recording, recording_location).add_done_callback(relay)
+            except RuntimeError as e:
+                # The controller was shut down in the meantime
+                stopped.set_exception(e)
+
+        after.add_done_callback(chain)
+        return stopped
+
+    def process_recordings_async(self):
+        """
+        Post-process the last recording without blocking; see _process_recordings.
+
+        Returns:
+            concurrent.futures.Future: Resolves once post-processing has finished
+        """
+        return self._control_executor.submit(self._process_recordings)
+
+    def poll_metrics(self):
+        """
+        Collect the latest performance metrics from every active handler.
+
+        Non-blocking, so it can be called periodically while recording.
+        Each handler reports counters (frames captured, events), their
+        per-second rates, gauges (dropped frames, buffered events) and
+        latency histograms (capture and encode p50/p99).
+
+        Returns:
+            dict: Handler name ('keyboard', 'mouse', 'screen', 'webcam') to its
+                  latest metrics snapshot
+        """
+        return {HANDLER_NAMES[code]: self._handler(code).poll_metrics()
+                for code in self.active_handlers}
+
+    def _write_metrics(self, handler_codes, folder):
+        """
+        Write the final metrics of the given handlers to metrics.json in the given folder.
+        """
+        summary = {
+            'start_time': self.latest_start_time,
+            'stop_time': self.latest_stop_time,
+            'handlers': {HANDLER_NAMES[code]: self._handler(code).latest_metrics for code in handler_codes},
+        }
+        with open(os.path.join(folder, 'metrics.json'), 'w') as f:
+            json.dump(summary, f, indent=2)
 
-    def start_recording(self):
+    def start_recording(self, recording_location=None, handlers=None):
         """
         Start recording for all active handlers.
         
         Creates a timestamp for the recording start time and triggers
         all active handlers to begin their recording processes.
+
+        Args:
+            recording_location (str, optional): Base directory the session will be saved in.
+                                                Handlers record straight into a working folder
+                                                there, so stopping only renames it. Without it
+                                                the session is recorded in a temporary folder
+                                                and moved at stop.
+            handlers (list, optional): Codes of the handlers to record with, replacing
+                                       active_handlers; None keeps active_handlers as set
         
         Active handlers are identified by single-letter codes:
         - 'k': Keyboard recording
@@ -75,21 +330,49 @@ class Central_Data_Controller:
         - 's': Screen recording
         - 'w': Webcam recording
         
-        The start time is stored in YYYY-MM-DD_HH-MM-SS format.
+        The start time is stored in YYYY-MM-DD_HH-MM-SS format. Working
+        folders left in recording_location by recordings that were never
+        stopped are recovered first; see recover_working_folders.
         """
-        self.latest_start_time = datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')  
+        if self.working_folder:
+            raise RuntimeError('start_recording called while a recording is in progress')
+        if handlers is not None:
+            self.active_handlers = list(handlers)
 
-        if 'k' in self.active_handlers:
-            self.keyboard_handler.trigger_listener('start')
+        self.latest_start_time = datetime.datetime.now().strftime(SESSION_TIME_FORMAT)
 
-        if 'm' in self.active_handlers:
-            self.mouse_handler.trigger_listener('start')
+        if recording_location:
+            recover_working_folders(recording_location, self.on_sessions_saved)
+            self.working_folder = os.path.join(recording_location, WORKING_FOLDER_PREFIX + self.latest_start_time)
+            os.makedirs(self.working_folder, exist_ok=True)
+        else:
+            self.working_folder = tempfile.mkdtemp(prefix=WORKING_FOLDER_PREFIX.lstrip('.'))
 
-        if 's' in self.active_handlers:
-            self.screen_handler.trigger_listener('start')
-        
-        if 'w' in self.active_handlers:
-            self.webcam_handler.trigger_listener('start')
+        self.screen_handler.segment_seconds = self.segment_seconds
+        self.webcam_handler.segment_seconds = self.segment_seconds
+
+        self._trigger_handlers('start', list(self.active_handlers))
+
+        if self.segment_seconds and self.live_processor_factory:
+            self.live_processor = self.live_processor_factory()
+            self._stop_watching.clear()
+            self._segment_watcher = threading.Thread(target=self._watch_segments, daemon=True)
+            self._segment_watcher.start()
+
+    def _video_handlers(self):
+        return [self._handler(code) for code in ('s', 'w') if code in self.active_handlers]
+
+    def _watch_segments(self, interval=0.5):
+        # Hands each completed segment to the live processor while recording
+        while not self._stop_watching.is_set():
+            self._submit_segments()
+            self._stop_watching.wait(interval)
+
+    def _submit_segments(self):
+        for handler in self._video_handlers():
+            for segment in handler.poll_segments():
+                self.live_processor.submit(segment)
+        self.live_processor.poll()
 
     def stop_recording(self, recording_location):
         """
@@ -100,36 +383,70 @@ class Central_Data_Controller:
                                     A new subfolder will be created using the start
                                     and stop timestamps.
         
-        Creates a new folder named with the format:
-        'start_timestamp_--_stop_timestamp' under the specified location.
-        Each active handler's data is saved to this folder and the handler
-        is deactivated after saving.
+        The session is named with the format 'start_timestamp_--_stop_timestamp'
+        under the specified location. Each active handler finishes writing
+        into the working folder created at start and is deactivated, a
+        metrics.json summary of every handler's capture performance is
+        written alongside the data, and the working folder is then renamed
+        to the session name, so stopping takes the same time however long
+        the recording was.
         """
         self.latest_stop_time = datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-        self.recording_folder = os.path.join(recording_location, self.latest_start_time + '_--_' + self.latest_stop_time)
-        
-        # Create the recording folder
-        os.makedirs(self.recording_folder, exist_ok=True)
-        
-        if 'k' in self.active_handlers:
-            self.keyboard_handler.trigger_listener('stop', self.recording_folder)
-            self.active_handlers.remove('k')
 
-        if 'm' in self.active_handlers:
-            self.mouse_handler.trigger_listener('stop', self.recording_folder)
-            self.active_handlers.remove('m')
-        
-        if 's' in self.active_handlers:
-            self.screen_handler.trigger_listener('stop', self.recording_folder)
-        
-        if 'w' in self.active_handlers:
-            self.webcam_handler.trigger_listener('stop', self.recording_folder)
+        if not self.working_folder:
+            raise RuntimeError('stop_recording called without a recording in progress')
+
+        if self.live_processor:
+            # Segments still being processed are left for model generation, which picks up
+            # every segment not marked as processed
+            self._stop_watching.set()
+            self._segment_watcher.join()
+            self.live_processor.cancel()
+            self.live_processor = None
+
+        stopped_handlers = list(self.active_handlers)
+        self._trigger_handlers('stop', stopped_handlers)
 
+        # Screen and webcam stay listed until their recordings are post-processed
+        for code in ('k', 'm'):
+            if code in self.active_handlers:
+                self.active_handlers.remove(code)
+
+        self._write_metrics(stopped_handlers, self.working_folder)
+
+        # Only present when profiling was switched on for this recording
+        profile_dir = os.path.join(self.working_folder, PROFILE_FOLDER_NAME)
+        if os.path.isdir(profile_dir):
+            merge_profiles(profile_dir)
+
+        self.recording_folder = os.path.join(recording_location, self.latest_start_time + '_--_' + self.latest_stop_time)
+        os.makedirs(recording_location, exist_ok=True)
+        try:
+            os.rename(self.working_folder, self.recording_folder)
+        except OSError:
+            # Only a temporary working folder on another filesystem needs copying
+            shutil.move(self.working_folder, self.recording_folder)
+        self.working_folder = str()
+
+        if self.on_sessions_saved:
+            self.on_sessions_saved(recording_location, [self.recording_folder])
+        self._report_progress('stop', 'saved', folder=self.recording_folder)
+        return self.recording_folder
 
     def _process_recordings(self):
         screen_process = None
         webcam_process = None
         # Post-process recordings
+        started = time.perf_counter()
+        self._report_progress('process', 'started', folder=self.recording_folder)
+        latest_start_time = datetime.datetime.strptime(self.latest_start_time, '%Y-%m-%d_%H-%M-%S')
+        latest_stop_time = datetime.datetime.strptime(self.latest_stop_time, '%Y-%m-%d_%H-%M-%S')
+
+        # Segmented recordings keep each frame's capture time in their manifest, so need no retiming
+        if 's' in self.active_handlers and load_manifest(self.recording_folder, 'screen_capture') is not None:
+            self.active_handlers.remove('s')
+        if 'w' in self.active_handlers and load_manifest(self.recording_folder, 'webcam_capture') is not None:
+            self.active_handlers.remove('w')
         
         # Screen capture
         if 's' in self.active_handlers:
@@ -145,14 +462,13 @@ class Central_Data_Controller:
                                 stderr=subprocess.STDOUT).stdout
             )
         
-            latest_start_time = datetime.datetime.strptime(self.latest_start_time, '%Y-%m-%d_%H-%M-%S')
-            latest_stop_time = datetime.datetime.strptime(self.latest_stop_time, '%Y-%m-%d_%H-%M-%S')
             nominal_duration = (latest_stop_time - latest_start_time).seconds
 
             stretch_factor = nominal_duration / actual_duration
             
             if stretch_factor > 1.01 or stretch_factor < 0.99:
-                screen_process = Process(target=process_recordings, args=(
+                self._report_progress('process', 'retiming', 'screen', stretch_factor=stretch_factor)
+                screen_process = handler_context().Process(target=process_recordings, args=(
                     self.recording_folder, 
                     'screen_capture.avi', 
                     screen_recording_filepath, 
@@ -179,7 +495,8 @@ class Central_Data_Controller:
             stretch_factor = nominal_duration / actual_duration
             
             if stretch_factor > 1.01 or stretch_factor < 0.99:
-                webcam_process = Process(target=process_recordings, args=(
+                self._report_progress('process', 'retiming', 'webcam', stretch_factor=stretch_factor)
+                webcam_process = handler_context().Process(target=process_recordings, args=(
                     self.recording_folder, 
                     'webcam_capture.avi', 
                     screen_recording_filepath, 
@@ -191,4 +508,7 @@ class Central_Data_Controller:
             screen_process.join()
         
         if webcam_process:
-            webcam_process.join()
\ No newline at end of file
+            webcam_process.join()
+
+        self._report_progress('process', 'completed', folder=self.recording_folder,
+                              elapsed_s=time.perf_counter() - started)
\ No newline at end of file
@@ -0,0 +1,286 @@
+from abc import ABC, abstractmethod
+import os
+import time
+import cv2
+import numpy as np
+
+
+class Capture_Source(ABC):
+    """
+    Abstract source of video frames for the screen and webcam handlers.
+
+    A source is created in the parent process and opened inside the handler's
+    recording process, so constructors must only store plain settings and all
+    device or library state must be created in open().
+
+    Sources with a frame rate pace themselves: read() waits for the next frame
+    time, and when the consumer falls behind by whole frame periods those
+    frames are counted as dropped instead of being delivered late.
+
+    Attributes:
+        fps (float): Frames per second to pace reads at, or None to read as fast as possible
+        frames_read (int): Frames delivered since open()
+        dropped (int): Frames skipped because the consumer was too slow
+    """
+
+    def __init__(self, fps=None):
+        self.fps = fps
+        self.frames_read = 0
+        self.dropped = 0
+        self._next_frame_time = None
+
+    @property
+    @abstractmethod
+    def resolution(self):
+        """
+        (width, height) of the frames returned by read(). Valid after open().
+        """
+        pass
+
+    @abstractmethod
+    def open(self):
+        """
+        Acquire the underlying device or file.
+
+        Returns:
+            bool: True if the source is ready to read
+        """
+        pass
+
+    @abstractmethod
+    def _read_frame(self):
+        """
+        Produce the next frame.
+
+        Returns:
+            tuple: (success, BGR frame)
+        """
+        pass
+
+    def close(self):
+        """
+        Release the underlying device or file.
+        """
+        pass
+
+    def cursor_position(self):
+        """
+        Cursor position to overlay on the current frame, or None if the source has no cursor.
+        """
+        return None
+
+    def read(self):
+        """
+        Return the next frame, paced to the source frame rate if it has one.
+
+        Returns:
+            tuple: (success, BGR frame)
+        """
+        if self.fps:
+            self._pace()
+        ret, frame = self._read_frame()
+        if ret:
+            self.frames_read += 1
+        return ret, frame
+
+    def _pace(self):
+        period = 1.0 / self.fps
+        now = time.perf_counter()
+        if self._next_frame_time is None:
+            self._next_frame_time = now
+        elif now < self._next_frame_time:
+            time.sleep(self._next_frame_time - now)
+        else:
+            missed = int((now - self._next_frame_time) / period)
+            if missed:
+                self.dropped += missed
+                self._next_frame_time += missed * period
+        self._next_frame_time += period
+
+    def __enter__(self):
+        if not self.open():
+            raise RuntimeError(f'Failed to open capture source {type(self).__name__}')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class Screen_Source(Capture_Source):
+    """
+    Captures the full screen with mss and reports the cursor position from pyautogui.
+    """
+
+    def __init__(self, fps=None):
+        super().__init__(fps)
+        self._sct = None
+        self._monitor = None
+        self._pyautogui = None
+
+    @property
+    def resolution(self):
+        return self._monitor['width'], self._monitor['height']
+
+    def open(self):
+        # Imported here so other sources work on machines without a display
+        from mss import mss
+        import pyautogui
+
+        self._pyautogui = pyautogui
+        self._sct = mss()
+        if os.name == 'nt':
+            import ctypes
+            user32 = ctypes.windll.user32
+            screensize = user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
+            self._monitor = {
+                "left": 0,
+                "top": 0,
+                "width": screensize[0],
+                "height": screensize[1],
+            }
+        else:
+            self._monitor = self._sct.monitors[0]  # Full screen
+        return True
+
+    def _read_frame(self):
+        frame = np.array(self._sct.grab(self._monitor))
+        return True, cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+
+    def cursor_position(self):
+        return self._pyautogui.position()
+
+    def close(self):
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+
+
+class Webcam_Source(Capture_Source):
+    """
+    Captures frames from a system camera through OpenCV.
+    """
+
+    def __init__(self, device=0, fps=None):
+        super().__init__(fps)
+        self.device = device
+        self._capture = None
+
+    @property
+    def resolution(self):
+        return (int(self._capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(self._capture.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+    def open(self):
+        self._capture = cv2.VideoCapture(self.device)
+        return self._capture.isOpened()
+
+    def _read_frame(self):
+        return self._capture.read()
+
+    def close(self):
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+
+
+class Video_File_Source(Capture_Source):
+    """
+    Replays frames from a recorded video file.
+
+    Args:
+        path (str): Video file to replay
+        fps (float, optional): Replay rate; 'native' uses the file's own frame
+                               rate and None replays as fast as possible
+        loop (bool): Restart from the first frame when the file ends
+    """
+
+    def __init__(self, path, fps='native', loop=False):
+        super().__init__(None if fps == 'native' else fps)
+        self.path = path
+        self.native_fps = fps == 'native'
+        self.loop = loop
+        self._capture = None
+
+    @property
+    def resolution(self):
+        return (int(self._capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(self._capture.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+    def open(self):
+        self._capture = cv2.VideoCapture(self.path)
+        if self.native_fps:
+            self.fps = self._capture.get(cv2.CAP_PROP_FPS) or None
+        return self._capture.isOpened()
+
+    def _read_frame(self):
+        ret, frame = self._capture.read()
+        if not ret and self.loop:
+            self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self._capture.read()
+        return ret, frame
+
+    def close(self):
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+
+
+class Synthetic_Source(Capture_Source):
+    """
+    Generates test-pattern frames at a configurable resolution and rate.
+
+    A small ring of frames is rendered in open() and cycled through, so
+    producing a frame costs nothing and the measured rate reflects the
+    handler's own processing and encoding. Needs no display or camera.
+
+    Args:
+        resolution (tuple): (width, height) of the generated frames
+        fps (float, optional): Rate to deliver frames at, or None for as fast as possible
+        pattern (str): 'bars' for moving color bars, 'noise' for random pixels,
+                       which is the worst case for the encoder
+        variants (int): Number of distinct frames in the ring
+    """
+
+    def __init__(self, resolution=(1920, 1080), fps=30, pattern='bars', variants=16):
+        super().__init__(fps)
+        if pattern not in ('bars', 'noise'):
+            raise ValueError(f"Unknown synthetic pattern '{pattern}'")
+        self._resolution = tuple(resolution)
+        self.pattern = pattern
+        self.variants = variants
+        self._frames = []
+
+    @property
+    def resolution(self):
+        return self._resolution
+
+    def open(self):
+        width, height = self._resolution
+        rng = np.random.default_rng(0)
+        self._frames = []
+        for i in range(self.variants):
+            if self.pattern == 'noise':
+                frame = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+            else:
+                hue = ((np.arange(width) * 180 // width + i * 180 // self.variants) % 180).astype(np.uint8)
+                hsv = np.empty((height, width, 3), dtype=np.uint8)
+                hsv[..., 0] = hue[None, :]
+                hsv[..., 1] = 200
+                hsv[..., 2] = 220
+                frame = cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+            cv2.putText(frame, f'synthetic {i}', (20, height // 2), cv2.FONT_HERSHEY_SIMPLEX,
+                        max(height / 400, 0.5), (0, 0, 0), 2, cv2.LINE_AA)
+            self._frames.append(frame)
+        return True
+
+    def _read_frame(self):
+        return True, self._frames[(self.frames_read + self.dropped) % self.variants]
+
+    def cursor_position(self):
+        width, height = self._resolution
+        step = self.frames_read
+        return step * 7 % width, step * 3 % height
+
+    def close(self):
+        self._frames = []
@@ -1,5 +1,14 @@
 from abc import ABC, abstractmethod
-from multiprocessing import Process, Pipe, Event
+from multiprocessing import Pipe
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import traceback
+from .Metrics import Handler_Metrics
+from Common_Module.Process_Context import handler_context
+from Profiling_Module.Process_Profiler import profiling_modes, run_profiled, collect_profiles, PROFILE_FOLDER_NAME
 
 class Handler(ABC):
     """
@@ -7,6 +16,8 @@ class Handler(ABC):
     
     Provides common functionality for asynchronous event handling in a separate process.
     All recording handlers (keyboard, mouse, screen, webcam) inherit from this class.
+    Processes, events and queues come from handler_context(), by default a
+    fork server with the recording modules already imported.
     
     Attributes:
         stop_event (Event): Multiprocessing event for signaling process termination
@@ -14,12 +25,30 @@ class Handler(ABC):
         active (bool): Current state of the handler
         parent_conn (Connection): Parent end of the pipe for communication
         child_conn (Connection): Child end of the pipe for communication
+        metrics_queue (Queue): Carries metric snapshots from the process to the parent
+        latest_metrics (dict): Most recent metric snapshot received from the process
+        segment_seconds (float): Roll video recordings over to a new file this often;
+                                 None records a single file
+        segment_queue (Queue): Carries completed segments from the process to the parent
+        capture_dir (str): Folder a video recording is written to until it is saved
     """
+    # Name of the video a handler records, None for handlers that record no video
+    capture_stem = None
+
     def __init__(self):
-        self.stop_event = Event()
+        self.context = handler_context()
+        self.stop_event = self.context.Event()
         self.process = None
         self.active = False
         self.parent_conn, self.child_conn = Pipe()
+        self.metrics_queue = self.context.Queue()
+        self.metrics_interval = 1.0
+        self.latest_metrics = {}
+        self.profile_staging_dir = None
+        self.segment_seconds = None
+        self.segment_queue = self.context.Queue()
+        self.completed_segments = []
+        self.capture_dir = None
 
     def trigger_listener(self, command, save_dir=None):
         """
@@ -27,23 +56,169 @@ class Handler(ABC):
 
         Parameters:
             command (str): 'start' to begin listening, 'stop' to end the process.
-            save_dir (str, optional): Directory to save the log when stopping.
+            save_dir (str, optional): Directory to save the log when stopping. When
+                                      starting, the directory a video handler records
+                                      into; a temporary one is used if not given.
 
         Returns:
             None
         """
         if command == 'start' and not self.active:
-            self.stop_event = Event()
-            self.process = Process(target=self._run_listener, args=(self.stop_event, self.child_conn), daemon=True)
+            self.stop_event = self.context.Event()
+            self.latest_metrics = {}
+            self.completed_segments = []
+
+            # Known to the parent, so it can reach segments while they are being recorded
+            if self.capture_stem:
+                self.capture_dir = save_dir or tempfile.mkdtemp(prefix=f'{self.capture_stem}_')
+                os.makedirs(self.capture_dir, exist_ok=True)
+
+            # Profiles are staged until the session folder is known at stop
+            modes = profiling_modes()
+            if modes:
+                self.profile_staging_dir = tempfile.mkdtemp(prefix='profile_')
+                target = run_profiled
+                args = (self._run_listener, self.profile_staging_dir, type(self).__name__, modes,
+                        self.stop_event, self.child_conn)
+            else:
+                self.profile_staging_dir = None
+                target = self._run_listener
+                args = (self.stop_event, self.child_conn)
+
+            self.process = self.context.Process(target=target, args=args, daemon=True)
             self.process.start()
             self.active = True
 
         elif command == 'stop' and self.active:
             self.stop_event.set()
             self.parent_conn.send(save_dir)
-            self.process.join()
+            # Keep draining the queues while waiting, a process with unflushed queue data cannot exit
+            while self.process.is_alive():
+                self.poll_metrics()
+                self._drain_segments()
+                self.process.join(timeout=0.1)
+            self.poll_metrics()
+            self._drain_segments()
+            self._release_process()
+            if self.profile_staging_dir and save_dir:
+                collect_profiles(self.profile_staging_dir, os.path.join(save_dir, PROFILE_FOLDER_NAME))
             self.active = False
 
+    def shutdown(self, timeout=5.0):
+        """
+        End the listener process without saving, e.g. when the application closes.
+
+        The listener is asked to stop and given timeout seconds to exit
+        before it is terminated.
+        """
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            self.stop_event.set()
+            self.parent_conn.send(None)
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+        self._release_process()
+        self.active = False
+
+    def _release_process(self):
+        # Frees the process handle now rather than whenever it is garbage collected
+        self.process.close()
+        self.process = None
+
+    def __getstate__(self):
+        # The handler is sent to its own process, which has no use for the parent's process handle
+        state = self.__dict__.copy()
+        state['process'] = None
+        return state
+
+    def poll_metrics(self):
+        """
+        Collect metric snapshots published by the listener process without blocking.
+
+        Returns:
+            dict: The most recent snapshot, empty if none has arrived yet
+        """
+        while True:
+            try:
+                self.latest_metrics = self.metrics_queue.get_nowait()
+            except queue.Empty:
+                break
+        return self.latest_metrics
+
+    def _drain_segments(self):
+        while True:
+            try:
+                self.completed_segments.append(self.segment_queue.get_nowait())
+            except queue.Empty:
+                break
+
+    def poll_segments(self):
+        """
+        Collect segments the listener process completed since the last call, without blocking.
+
+        Returns:
+            list: Manifest entries of the completed segments, with their 'path'
+        """
+        self._drain_segments()
+        segments, self.completed_segments = self.completed_segments, []
+        return segments
+
+    def _publish_segment(self, segment):
+        # Runs in the listener process as the segmented writer's on_segment callback
+        self.segment_queue.put(segment)
+
+    def _save_capture(self, save_dir):
+        """
+        Move everything recorded in capture_dir into save_dir.
+
+        Call from within _run_listener once the writer is released. Nothing
+        is moved when the handler recorded straight into save_dir. Folders
+        already present in save_dir, e.g. another recording's processed
+        segments, are merged rather than replaced.
+        """
+        if os.path.abspath(save_dir) == os.path.abspath(self.capture_dir):
+            return
+        os.makedirs(save_dir, exist_ok=True)
+        for root, dirs, files in os.walk(self.capture_dir):
+            target = os.path.join(save_dir, os.path.relpath(root, self.capture_dir))
+            os.makedirs(target, exist_ok=True)
+            for name in files:
+                shutil.move(os.path.join(root, name), os.path.join(target, name))
+        shutil.rmtree(self.capture_dir, ignore_errors=True)
+
+    def _report_error(self, metrics, message):
+        """
+        Count and surface an error that ends or damages a recording.
+
+        Call from within _run_listener. The error is counted as
+        'listener_errors' in the published metrics and shown through the
+        handler's status callback, or printed with its traceback when there
+        is none, so a recorder that died is never mistaken for a working one.
+        """
+        metrics.increment('listener_errors')
+        callback = getattr(self, 'update_status_callback', None)
+        if callback:
+            callback(message, "red")
+        else:
+            print(f"❌ {type(self).__name__}: {message}", file=sys.stderr)
+            if sys.exc_info()[0] is not None:
+                traceback.print_exc()
+
+    def _create_metrics(self):
+        """
+        Create the metrics recorder for a listener process.
+
+        Call from within _run_listener; the recorder publishes to this
+        handler's metrics queue.
+
+        Returns:
+            Handler_Metrics: Recorder named after the handler class
+        """
+        return Handler_Metrics(type(self).__name__, self.metrics_queue, self.metrics_interval)
+
     @abstractmethod
     def _run_listener(self, stop_event, pipe_conn):
         """
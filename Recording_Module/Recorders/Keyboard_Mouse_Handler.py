@@ -47,14 +47,26 @@ class Keyboard_Handler(Handler):
 
         listener = keyboard.Listener(on_press=on_press, on_release=on_release)
         listener.start()
+        metrics = self._create_metrics()
+        counted = 0
         while not stop_event.is_set():
             time.sleep(0.01)
+            # Events are only counted here, keeping the listener callbacks untouched
+            buffered = len(log_data)
+            metrics.increment('events', buffered - counted)
+            metrics.set_gauge('buffered_events', buffered)
+            counted = buffered
+            metrics.publish()
         listener.stop()
         listener.join()
+        metrics.increment('events', len(log_data) - counted)
 
         # Save to CSV if directory provided
         save_dir = pipe_conn.recv()
+        save_start = time.perf_counter()
         self._save_log(log_data, save_dir, 'keyboard_log.csv')
+        metrics.observe('save_latency', time.perf_counter() - save_start)
+        metrics.publish(final=True)
 
     def _save_log(self, log_data, save_dir, filename):
         """
@@ -121,14 +133,26 @@ class Mouse_Handler(Handler):
 
         listener = mouse.Listener(on_click=on_click, on_scroll=on_scroll, on_move=on_move)
         listener.start()
+        metrics = self._create_metrics()
+        counted = 0
         while not stop_event.is_set():
             time.sleep(0.01)
+            # Events are only counted here, keeping the listener callbacks untouched
+            buffered = len(log_data)
+            metrics.increment('events', buffered - counted)
+            metrics.set_gauge('buffered_events', buffered)
+            counted = buffered
+            metrics.publish()
         listener.stop()
         listener.join()
+        metrics.increment('events', len(log_data) - counted)
 
         # Save to CSV if directory provided
         save_dir = pipe_conn.recv()
+        save_start = time.perf_counter()
         self._save_log(log_data, save_dir, 'mouse_log.csv')
+        metrics.observe('save_latency', time.perf_counter() - save_start)
+        metrics.publish(final=True)
 
     def _save_log(self, log_data, save_dir, filename):
         """
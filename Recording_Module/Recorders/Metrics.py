@@ -0,0 +1,143 @@
+import time
+import queue
+from bisect import bisect_left
+
+
+# Latency bucket upper bounds in seconds: 40 log-spaced buckets per decade from 10 us to 10 s
+LATENCY_BUCKETS = [10 ** (-5 + i / 40) for i in range(241)]
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Recording a value is a binary search over the bucket bounds, and the
+    summary only depends on the bucket counts, so the histogram stays cheap
+    and small no matter how many values are recorded. Percentiles are
+    accurate to one bucket, about 6%.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        """
+        Record one latency in seconds.
+        """
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        """
+        Upper bound of the bucket holding the q-th percentile, in seconds.
+        """
+        if self.count == 0:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return min(LATENCY_BUCKETS[i], self.max) if i < len(LATENCY_BUCKETS) else self.max
+        return self.max
+
+    def summary(self):
+        """
+        Count, mean, p50, p99 and max in milliseconds.
+        """
+        if self.count == 0:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count * 1e3,
+            'p50_ms': self.percentile(50) * 1e3,
+            'p99_ms': self.percentile(99) * 1e3,
+            'max_ms': self.max * 1e3,
+        }
+
+
+class Handler_Metrics:
+    """
+    Counters, gauges and latency histograms kept by a handler's recording process.
+
+    Snapshots are pushed to the parent through a multiprocessing queue at most
+    once per interval, so instrumenting a hot loop costs a few attribute
+    updates per iteration.
+
+    Attributes:
+        name (str): Name of the handler publishing the metrics
+        interval (float): Minimum seconds between published snapshots
+    """
+
+    def __init__(self, name, metrics_queue=None, interval=1.0):
+        self.name = name
+        self.interval = interval
+        self._queue = metrics_queue
+        self._start = time.perf_counter()
+        self._last_publish = self._start
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+    def increment(self, counter, amount=1):
+        """
+        Add to a counter. Counters are also reported as per-second rates.
+        """
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def set_gauge(self, gauge, value):
+        """
+        Set a gauge to its current value, e.g. a queue depth.
+        """
+        self.gauges[gauge] = value
+
+    def observe(self, histogram, seconds):
+        """
+        Record a latency in seconds.
+        """
+        if histogram not in self.histograms:
+            self.histograms[histogram] = Histogram()
+        self.histograms[histogram].observe(seconds)
+
+    def snapshot(self, final=False):
+        """
+        Current state of all metrics as plain, picklable data.
+
+        Args:
+            final (bool): Marks the last snapshot of a recording
+
+        Returns:
+            dict: Handler name, elapsed seconds, counters, per-second rates,
+                  gauges and histogram summaries
+        """
+        elapsed = time.perf_counter() - self._start
+        return {
+            'handler': self.name,
+            'elapsed_s': elapsed,
+            'final': final,
+            'counters': dict(self.counters),
+            'rates': {f'{name}_per_s': value / elapsed if elapsed > 0 else 0.0
+                      for name, value in self.counters.items()},
+            'gauges': dict(self.gauges),
+            'histograms': {name: histogram.summary() for name, histogram in self.histograms.items()},
+        }
+
+    def publish(self, final=False):
+        """
+        Push a snapshot to the parent if the interval has passed, or always when final.
+        """
+        now = time.perf_counter()
+        if self._queue is None or (not final and now - self._last_publish < self.interval):
+            return
+        self._last_publish = now
+        try:
+            self._queue.put_nowait(self.snapshot(final))
+        except queue.Full:
+            # A slow reader loses intermediate snapshots, never recording time
+            pass
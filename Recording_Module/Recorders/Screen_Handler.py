@@ -1,14 +1,9 @@
-from mss import mss
-import ctypes
 import cv2
-import numpy as np
-import os
-import tempfile
-import shutil
-import pyautogui
 import time
-import subprocess
+import pandas as pd
 from .Handler import Handler
+from .Segmented_Writer import Segmented_Video_Writer
+from .Capture_Sources import Screen_Source
 
 
 class Screen_Handler(Handler):
@@ -17,27 +12,34 @@ class Screen_Handler(Handler):
     
     Records the user's screen at a specified resolution and frame rate,
     while also capturing and drawing the mouse cursor position on each frame.
-    The recording is temporarily stored and then moved to a permanent location
-    when recording stops.
+    The recording is written into the capture directory given at start and
+    only moved at stop if that is not the save directory. With segment_seconds set, it is split into segments
+    that are each announced on the segment queue as soon as they complete.
     
     Attributes:
         resolution (tuple): Target resolution for the video (width, height)
         fps (float): Frames per second for recording
         codec (int): Video codec for encoding (default: XVID)
+        source (Capture_Source): Where frames come from (default: the screen)
         update_status_callback (callable): Optional callback for status updates
     """
+    capture_stem = 'screen_capture'
 
-    def __init__(self, update_status_callback=None):
+    def __init__(self, update_status_callback=None, source=None):
         """
         Initialize the screen recording handler.
         
         Args:
             update_status_callback (callable, optional): Function to call for status updates
+            source (Capture_Source, optional): Frame source, e.g. a Video_File_Source or
+                                               Synthetic_Source for replay and load testing.
+                                               Defaults to capturing the screen.
         """
         super().__init__()
         self.resolution = (1280, 720)
         self.fps = 28.8
         self.codec = cv2.VideoWriter_fourcc(*"XVID")
+        self.source = source if source is not None else Screen_Source()
         self.update_status_callback = update_status_callback  # Callback to update the status box
 
     def _run_listener(self, stop_event, pipe_conn):
@@ -51,67 +53,68 @@ class Screen_Handler(Handler):
             stop_event (Event): Multiprocessing event to signal stopping
             pipe_conn (Connection): Pipe connection for receiving save location
         """
+        metrics = self._create_metrics()
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = os.path.join(temp_dir, 'screen_capture.avi')
+            with self.source as source:
+                output = Segmented_Video_Writer(self.capture_dir, self.capture_stem, self.codec, self.fps,
+                                                self.resolution, self.segment_seconds, self._publish_segment)
+                if not output.isOpened():
+                    self._report_error(metrics, "Failed to open VideoWriter for screen capture.")
+                    return
 
-                with mss() as sct:
-                    if os.name == 'nt':
-                        user32 = ctypes.windll.user32 
-                        screensize = user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
-                        monitor = {
-                            "left": 0,
-                            "top": 0,
-                            "width": screensize[0],
-                            "height": screensize[1],
-                        }
+                loop_start = time.perf_counter()
+                while not stop_event.is_set():
+                    try:
+                        frame_start = time.perf_counter()
+                        ret, frame = source.read()
+                        captured = time.perf_counter()
+                        frame_time = pd.Timestamp.now().value
+                        if not ret:
+                            metrics.increment('read_failures')
+                            break
+                        resized_frame = cv2.resize(frame, self.resolution, interpolation=cv2.INTER_AREA)
                         
-                    else:
-                        monitor = sct.monitors[0]  # Full screen
-
-                    output = cv2.VideoWriter(temp_path, self.codec, self.fps, self.resolution)
-                    if not output.isOpened():
-                        return
-
-                    start_time = time.time()
-                    frame_count = 0
-                    
-                    while not stop_event.is_set():
-                        try:
-                            frame = np.array(sct.grab(monitor))
-                            frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
-                            resized_frame = cv2.resize(frame, self.resolution, interpolation=cv2.INTER_AREA)
-                            frame_count += 1
-                            
-                            # Draw the mouse cursor onto the frame
-                            x, y = pyautogui.position()
+                        # Draw the mouse cursor onto the frame
+                        position = source.cursor_position()
+                        if position is not None:
                             cursor_color = (0, 0, 255)  # Red dot
                             cursor_radius = 5
-                            cv2.circle(resized_frame, (x, y), cursor_radius, cursor_color, -1)
+                            cv2.circle(resized_frame, tuple(position), cursor_radius, cursor_color, -1)
 
-                            output.write(resized_frame)
-                            
-                            if not output.isOpened():
-                                break
-                            
-                        except Exception as e:
-                            if self.update_status_callback:
-                                self.update_status_callback(f"Error during frame processing: {e}", "red")
+                        encode_start = time.perf_counter()
+                        output.write(resized_frame, frame_time)
+                        frame_end = time.perf_counter()
 
-                    output.release()
-                
-                save_dir = pipe_conn.recv()
-                os.makedirs(save_dir, exist_ok=True)
-                save_location = os.path.join(save_dir, 'screen_capture.avi')
-
-                try:
-                    shutil.move(temp_path, save_location)
-                except Exception as e:
-                    if self.update_status_callback:
-                        self.update_status_callback(f"Error while moving video file: {e}", "red")
+                        metrics.increment('frames_captured')
+                        metrics.observe('capture_latency', captured - frame_start)
+                        metrics.observe('encode_latency', frame_end - encode_start)
+                        metrics.observe('frame_latency', frame_end - frame_start)
+                        metrics.set_gauge('dropped_frames', source.dropped)
+                        metrics.publish()
                         
-        except Exception as e:
-            if self.update_status_callback:
-                self.update_status_callback(f"Critical error in _run_listener: {e}", "red")
+                        if not output.isOpened():
+                            break
+                        
+                    except Exception as e:
+                        metrics.increment('frame_errors')
+                        if self.update_status_callback:
+                            self.update_status_callback(f"Error during frame processing: {e}", "red")
+
+                loop_time = time.perf_counter() - loop_start
+                metrics.set_gauge('captured_fps', metrics.counters.get('frames_captured', 0) / loop_time if loop_time > 0 else 0.0)
+                metrics.set_gauge('dropped_frames', source.dropped)
+                output.release()
+            
+            save_dir = pipe_conn.recv()
 
+            try:
+                move_start = time.perf_counter()
+                self._save_capture(save_dir)
+                metrics.observe('finalize_latency', time.perf_counter() - move_start)
+            except Exception as e:
+                self._report_error(metrics, f"Error while moving video file: {e}")
 
+        except Exception as e:
+            self._report_error(metrics, f"Critical error in _run_listener: {e}")
+        finally:
+            metrics.publish(final=True)
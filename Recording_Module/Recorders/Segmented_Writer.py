@@ -0,0 +1,113 @@
+import os
+import json
+import cv2
+import pandas as pd
+from Common_Module.Session_Layout import manifest_path, MANIFEST_VERSION
+
+
+class Segmented_Video_Writer:
+    """
+    Video writer that rolls over to a new file every segment_seconds.
+
+    Segments are named '<stem>_0000.avi', '<stem>_0001.avi', ... and listed
+    in '<stem>_segments.json' with the wall-clock times of their first and
+    last frames, in nanoseconds on the same naive timeline as the input
+    logs. The manifest is rewritten atomically whenever a segment opens or
+    completes, so after a crash every completed segment is still usable and
+    each one can be processed as soon as it completes.
+
+    Without segment_seconds a single '<stem>.avi' is written and no manifest,
+    exactly like a plain cv2.VideoWriter.
+
+    Attributes:
+        directory (str): Folder receiving the video files
+        stem (str): Recording name, e.g. 'screen_capture'
+        segment_seconds (float): Length of a segment, or None for one file
+        on_segment (callable): Called with the manifest entry of each completed segment
+    """
+
+    def __init__(self, directory, stem, codec, fps, resolution, segment_seconds=None, on_segment=None):
+        self.directory = directory
+        self.stem = stem
+        self.codec = codec
+        self.fps = fps
+        self.resolution = tuple(resolution)
+        self.segment_seconds = segment_seconds
+        self.on_segment = on_segment
+
+        self._writer = None
+        self._segment = None
+        self.segments = []
+
+        if not segment_seconds:
+            self._writer = cv2.VideoWriter(os.path.join(directory, f'{stem}.avi'), codec, fps, self.resolution)
+
+    def isOpened(self):
+        # A segmented writer opens its files on demand
+        return self._writer.isOpened() if not self.segment_seconds else True
+
+    def _save_manifest(self):
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'stem': self.stem,
+            'nominal_fps': self.fps,
+            'resolution': list(self.resolution),
+            'segment_seconds': self.segment_seconds,
+            'segments': self.segments + ([self._segment] if self._segment else []),
+        }
+        path = manifest_path(self.directory, self.stem)
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(f'{path}.tmp', path)
+
+    def _open_segment(self, timestamp_ns):
+        index = len(self.segments)
+        filename = f'{self.stem}_{index:04d}.avi'
+        self._writer = cv2.VideoWriter(os.path.join(self.directory, filename), self.codec, self.fps, self.resolution)
+        if not self._writer.isOpened():
+            raise RuntimeError(f'Could not open VideoWriter for segment {filename}')
+        self._segment = {'index': index, 'file': filename, 'start_ns': timestamp_ns,
+                         'end_ns': timestamp_ns, 'frames': 0, 'complete': False}
+        self._save_manifest()
+
+    def _close_segment(self):
+        self._writer.release()
+        self._writer = None
+        segment, self._segment = self._segment, None
+        segment['complete'] = True
+        self.segments.append(segment)
+        self._save_manifest()
+        if self.on_segment:
+            self.on_segment(dict(segment, path=os.path.join(self.directory, segment['file'])))
+
+    def write(self, frame, timestamp_ns=None):
+        """
+        Write a frame, rolling over to a new segment when the current one is full.
+
+        Args:
+            frame (numpy.ndarray): BGR frame at the writer's resolution
+            timestamp_ns (int, optional): Capture time of the frame; defaults to now
+        """
+        if not self.segment_seconds:
+            self._writer.write(frame)
+            return
+
+        if timestamp_ns is None:
+            timestamp_ns = pd.Timestamp.now().value
+        if self._segment and timestamp_ns - self._segment['start_ns'] >= self.segment_seconds * 1e9:
+            self._close_segment()
+        if self._segment is None:
+            self._open_segment(timestamp_ns)
+
+        self._writer.write(frame)
+        self._segment['end_ns'] = timestamp_ns
+        self._segment['frames'] += 1
+
+    def release(self):
+        """
+        Finish the current file; for segmented recordings, complete the last segment.
+        """
+        if not self.segment_seconds:
+            self._writer.release()
+        elif self._segment is not None:
+            self._close_segment()
@@ -1,35 +1,44 @@
 import cv2
-import tempfile
-import os
-import shutil
+import time
+import pandas as pd
 from .Handler import Handler
+from .Segmented_Writer import Segmented_Video_Writer
+from .Capture_Sources import Webcam_Source
 
 class Webcam_Handler(Handler):
     """
     Handler for recording webcam video feed.
     
     Records video from the default system webcam at specified frame rate
-    and resolution. The recording is temporarily stored and then moved to
-    a permanent location when recording stops.
+    and resolution. The recording is written into the capture directory
+    given at start and only moved at stop if that is not the save directory.
+    With segment_seconds set, it is split into segments that are each announced on the segment queue as
+    soon as they complete.
     
     Attributes:
         fps (float): Frames per second for recording
         codec (int): Video codec for encoding (XVID)
         resolution (tuple): Automatically determined from webcam capabilities
+        source (Capture_Source): Where frames come from (default: camera 0)
         update_status_callback (callable): Optional callback for status updates
     """
+    capture_stem = 'webcam_capture'
 
-    def __init__(self, update_status_callback=None):
+    def __init__(self, update_status_callback=None, source=None):
         """
         Initialize the webcam recording handler.
         
         Args:
             update_status_callback (callable, optional): Function to call for status updates
+            source (Capture_Source, optional): Frame source, e.g. a Video_File_Source or
+                                               Synthetic_Source for replay and load testing.
+                                               Defaults to the default system webcam.
         """
         super().__init__()
         self.fps = 28.8
         self.codec = cv2.VideoWriter_fourcc(*"XVID")
         self.resolution = tuple()
+        self.source = source if source is not None else Webcam_Source(0)
         self.update_status_callback = update_status_callback  # Callback to update the status box
 
     def _run_listener(self, stop_event, pipe_conn):
@@ -43,44 +52,57 @@ class Webcam_Handler(Handler):
             stop_event (Event): Multiprocessing event to signal stopping
             pipe_conn (Connection): Pipe connection for receiving save location
         """
+        metrics = self._create_metrics()
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = os.path.join(temp_dir, 'webcam_capture.avi')
-                cam = cv2.VideoCapture(0)
-                self.resolution = (int(cam.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cam.get(cv2.CAP_PROP_FRAME_HEIGHT)))
-                output = cv2.VideoWriter(temp_path, self.codec, self.fps, self.resolution)
+            with self.source as cam:
+                self.resolution = cam.resolution
+                output = Segmented_Video_Writer(self.capture_dir, self.capture_stem, self.codec, self.fps,
+                                                self.resolution, self.segment_seconds, self._publish_segment)
 
                 if not output.isOpened():
-                    if self.update_status_callback:
-                        self.update_status_callback("Failed to open VideoWriter for webcam.", "red")
+                    self._report_error(metrics, "Failed to open VideoWriter for webcam.")
                     return
 
+                loop_start = time.perf_counter()
                 while not stop_event.is_set():
                     try:
+                        frame_start = time.perf_counter()
                         ret, frame = cam.read()
+                        captured = time.perf_counter()
+                        frame_time = pd.Timestamp.now().value
                         if not ret:
+                            metrics.increment('read_failures')
                             if self.update_status_callback:
                                 self.update_status_callback("Failed to read frame from webcam.", "red")
                             continue
 
-                        output.write(frame)
+                        output.write(frame, frame_time)
+                        frame_end = time.perf_counter()
+
+                        metrics.increment('frames_captured')
+                        metrics.observe('capture_latency', captured - frame_start)
+                        metrics.observe('encode_latency', frame_end - captured)
+                        metrics.set_gauge('dropped_frames', cam.dropped)
+                        metrics.publish()
                     except Exception as e:
+                        metrics.increment('frame_errors')
                         if self.update_status_callback:
                             self.update_status_callback(f"Error during webcam frame processing: {e}", "red")
 
+                loop_time = time.perf_counter() - loop_start
+                metrics.set_gauge('captured_fps', metrics.counters.get('frames_captured', 0) / loop_time if loop_time > 0 else 0.0)
+                metrics.set_gauge('dropped_frames', cam.dropped)
                 output.release()
-                cam.release()
 
-                save_dir = pipe_conn.recv()
-                os.makedirs(save_dir, exist_ok=True)
-                save_location = os.path.join(save_dir, 'webcam_capture.avi')
+            save_dir = pipe_conn.recv()
 
-                try:
-                    shutil.move(temp_path, save_location)
-                except Exception as e:
-                    if self.update_status_callback:
-                        self.update_status_callback(f"Error while moving webcam video file: {e}", "red")
+            try:
+                move_start = time.perf_counter()
+                self._save_capture(save_dir)
+                metrics.observe('finalize_latency', time.perf_counter() - move_start)
+            except Exception as e:
+                self._report_error(metrics, f"Error while moving webcam video file: {e}")
         except Exception as e:
-            if self.update_status_callback:
-                self.update_status_callback(f"Critical error in webcam listener: {e}", "red")
-
+            self._report_error(metrics, f"Critical error in webcam listener: {e}")
+        finally:
+            metrics.publish(final=True)
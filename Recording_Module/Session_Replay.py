@@ -0,0 +1,372 @@
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from .Recorders.Metrics import Histogram
+
+
+REPLAY_CHUNK_ROWS = 100000
+# The last stretch before an event's deadline is spent spinning on the clock rather than sleeping
+SPIN_S = 0.0002
+# Weight of each new measurement in the running estimate of how far sleeps overshoot
+OVERSLEEP_SMOOTHING = 0.1
+
+# Recorded logs, with the columns replay reads from each when present
+REPLAY_LOGS = {
+    'keyboard': ('keyboard_log.csv', ('time', 'key', 'event')),
+    'mouse': ('mouse_log.csv', ('time', 'x', 'y', 'event', 'button', 'scroll_dx', 'scroll_dy')),
+}
+
+Replay_Event = namedtuple('Replay_Event', ['time_ns', 'stream', 'event', 'key', 'x', 'y', 'button', 'dx', 'dy'])
+
+
+def _read_log_chunks(path, stream, columns, chunk_rows):
+    # Chunks of one log as arrays for every Replay_Event field, on the recorded timeline
+    header = pd.read_csv(path, nrows=0).columns
+    for chunk in pd.read_csv(path, usecols=[c for c in columns if c in header], chunksize=chunk_rows):
+        times = pd.to_datetime(chunk['time'].astype(str), errors='coerce', format='ISO8601')
+        valid = ~times.isna().to_numpy()
+        rows = int(valid.sum())
+
+        def field(name, default):
+            if name not in chunk.columns:
+                return np.full(rows, default, dtype=object)
+            values = chunk[name].to_numpy(dtype=object)[valid]
+            return np.where(pd.isna(values), default, values)
+
+        yield {
+            'time_ns': times.to_numpy(dtype='datetime64[ns]').view(np.int64)[valid],
+            'stream': np.full(rows, stream, dtype=object),
+            'event': field('event', None),
+            'key': field('key', None),
+            'x': field('x', None),
+            'y': field('y', None),
+            'button': field('button', None),
+            'dx': field('scroll_dx', None),
+            'dy': field('scroll_dy', None),
+        }
+
+
+def iter_replay_events(session_folder, streams=tuple(REPLAY_LOGS), chunk_rows=REPLAY_CHUNK_ROWS):
+    """
+    Events of a session's input logs, merged into one time-ordered stream.
+
+    Each log is read in chunks and the chunks are merged as they go: events
+    are released up to, but not including, the earliest last time any log
+    has buffered, so no later chunk can hold an earlier or equal event and
+    memory stays within a few chunks per log. Events with equal times keep
+    the order of streams, wherever the chunks split them.
+
+    Args:
+        session_folder (str): A recording session folder
+        streams (tuple): Names from REPLAY_LOGS to replay
+        chunk_rows (int): Rows read at a time from each log
+
+    Yields:
+        Replay_Event: One recorded event, with None for fields its log lacks
+    """
+    readers = {}
+    for stream in streams:
+        filename, columns = REPLAY_LOGS[stream]
+        path = os.path.join(session_folder, filename)
+        if os.path.exists(path):
+            readers[stream] = _read_log_chunks(path, stream, columns, chunk_rows)
+    buffers = {stream: None for stream in readers}
+
+    def read(stream):
+        # Appends the log's next chunk to its buffer; False once the log is used up
+        chunk = next(readers[stream], None)
+        if chunk is None:
+            del readers[stream]
+            return False
+        buffer = buffers[stream]
+        buffers[stream] = chunk if buffer is None else {name: np.concatenate([buffer[name], chunk[name]])
+                                                        for name in buffer}
+        return True
+
+    while readers or any(buffer is not None for buffer in buffers.values()):
+        # Every log still being read needs buffered events to bound the merge
+        for stream in list(readers):
+            while (buffers[stream] is None or not len(buffers[stream]['time_ns'])) and read(stream):
+                pass
+        live = {stream: buffer for stream, buffer in buffers.items() if buffer is not None and len(buffer['time_ns'])}
+        if not live:
+            break
+        bounding = [stream for stream in live if stream in readers]
+        horizon = min(live[stream]['time_ns'][-1] for stream in bounding) if bounding else None
+
+        takes = {stream: len(buffer['time_ns']) if horizon is None else int(
+            np.searchsorted(buffer['time_ns'], horizon, side='left')) for stream, buffer in live.items()}
+        if not any(takes.values()):
+            # Everything buffered is at the horizon; read on in the logs that end there
+            for stream in bounding:
+                if live[stream]['time_ns'][-1] == horizon:
+                    read(stream)
+            continue
+
+        parts = []
+        for stream, buffer in live.items():
+            parts.append({name: values[:takes[stream]] for name, values in buffer.items()})
+            rest = {name: values[takes[stream]:] for name, values in buffer.items()}
+            buffers[stream] = rest if len(rest['time_ns']) else None
+        merged = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+        order = np.argsort(merged['time_ns'], kind='stable')
+        yield from map(Replay_Event._make, zip(*(merged[name][order].tolist() for name in Replay_Event._fields)))
+
+
+class Replay_Sink(ABC):
+    """
+    Destination of replayed events.
+
+    deliver() is called once per event at the event's scheduled time, so it
+    sits on the timing path and should return quickly.
+    """
+
+    @abstractmethod
+    def deliver(self, event, delivered_ns):
+        """
+        Args:
+            event (Replay_Event): The recorded event
+            delivered_ns (int): Wall clock time of delivery, on the same naive clock the recorders use
+        """
+        pass
+
+    def close(self):
+        pass
+
+
+class Callback_Sink(Replay_Sink):
+    """
+    Passes every event to a function, e.g. to feed handler callbacks or a live estimator.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def deliver(self, event, delivered_ns):
+        self.callback(event, delivered_ns)
+
+
+class In_Process_Sink(Replay_Sink):
+    """
+    In-process stand-in for an OS input injector.
+
+    Records what would have been injected, stamped with the delivery time,
+    and saves it as keyboard_log.csv and mouse_log.csv in the format of the
+    input handlers, so a replay can be recorded again and compared with the
+    original without touching the real keyboard and mouse.
+    """
+
+    def __init__(self):
+        self.log_data = {stream: [] for stream in REPLAY_LOGS}
+
+    def deliver(self, event, delivered_ns):
+        self.log_data[event.stream].append((delivered_ns, event))
+
+    def save(self, save_dir):
+        """
+        Write the delivered events as the handlers would have logged them.
+        """
+        os.makedirs(save_dir, exist_ok=True)
+        for stream, (filename, columns) in REPLAY_LOGS.items():
+            rows = self.log_data[stream]
+            if not rows:
+                continue
+            fields = {'time': 'time_ns', 'scroll_dx': 'dx', 'scroll_dy': 'dy'}
+            frame = pd.DataFrame({column: [getattr(event, fields.get(column, column)) for _, event in rows]
+                                  for column in columns})
+            frame['time'] = pd.to_datetime([delivered_ns for delivered_ns, _ in rows])
+            # Like the handlers' logs, only columns some event has a value for
+            frame = frame.dropna(axis=1, how='all')
+            frame.to_csv(os.path.join(save_dir, filename), index=False)
+
+
+class Injector_Sink(Replay_Sink):
+    """
+    Replays events into the real keyboard and mouse through pynput.
+
+    Key names are read back the way the keyboard handler wrote them:
+    characters as themselves and special keys as 'Key.<name>'.
+    """
+
+    def __init__(self):
+        # Imported here so replaying into other sinks does not need a display
+        from pynput import keyboard, mouse
+        self._keyboard_module = keyboard
+        self._mouse_module = mouse
+        self._keyboard = keyboard.Controller()
+        self._mouse = mouse.Controller()
+
+    def _key(self, name):
+        if isinstance(name, str) and name.startswith('Key.'):
+            return getattr(self._keyboard_module.Key, name[len('Key.'):], None)
+        if isinstance(name, str) and name.startswith('<') and name.endswith('>') and name[1:-1].isdigit():
+            return self._keyboard_module.KeyCode.from_vk(int(name[1:-1]))
+        return name if isinstance(name, str) and name else None
+
+    def deliver(self, event, delivered_ns):
+        if event.stream == 'keyboard':
+            key = self._key(event.key)
+            if key is None:
+                return
+            if event.event == 'press':
+                self._keyboard.press(key)
+            elif event.event == 'release':
+                self._keyboard.release(key)
+            return
+
+        self._mouse.position = (event.x, event.y)
+        if event.event in ('press', 'release'):
+            button = getattr(self._mouse_module.Button, str(event.button).split('.')[-1], self._mouse_module.Button.left)
+            if event.event == 'press':
+                self._mouse.press(button)
+            else:
+                self._mouse.release(button)
+        elif event.event == 'scroll':
+            self._mouse.scroll(event.dx, event.dy)
+
+
+class Session_Replay:
+    """
+    Delivers recorded events to sinks at their recorded pace, a multiple of it, or as fast as possible.
+
+    Each event is due at a fixed offset from the start of the replay, its
+    recorded offset divided by the speed, rather than a fixed gap after the
+    event before it, so delays never add up over a session. The wait for a
+    deadline sleeps most of the way and spins on perf_counter for the last
+    spin_s; how far sleeps overshoot what was asked is tracked and taken off
+    the next sleep. Falling more than max_lag_s behind moves the remaining
+    deadlines back instead of delivering the backlog in a burst.
+
+    Attributes:
+        sinks (list): Replay_Sink instances, each given every event
+        speed (float): Multiple of real time; None replays as fast as possible
+        spin_s (float): Time before a deadline spent spinning rather than sleeping
+        max_lag_s (float): Lateness at which the schedule is moved back; None keeps to it
+    """
+
+    def __init__(self, sinks, speed=1.0, spin_s=SPIN_S, max_lag_s=None):
+        if speed is not None and speed <= 0:
+            raise ValueError(f'Replay speed must be positive, not {speed}')
+        self.sinks = list(sinks)
+        self.speed = speed
+        self.spin_s = spin_s
+        self.max_lag_s = max_lag_s
+
+    def run(self, events):
+        """
+        Replay events in order until they run out.
+
+        Args:
+            events (iterable): Replay_Event in time order, e.g. from iter_replay_events
+
+        Returns:
+            dict: Replay report, see _report
+        """
+        lateness = Histogram()
+        spin_ns = int(self.spin_s * 1e9)
+        max_lag_ns = int(self.max_lag_s * 1e9) if self.max_lag_s is not None else None
+        oversleep_ns = 0.0
+        waited_ns = 0
+        rebases = 0
+        count = 0
+        first_ns = last_ns = None
+        # Delivery times are read from perf_counter and placed on the recorders' wall clock
+        wall_origin_ns = pd.Timestamp.now().value
+        origin = began = time.perf_counter_ns()
+
+        for event in events:
+            if first_ns is None:
+                first_ns = event.time_ns
+            last_ns = event.time_ns
+
+            if self.speed is not None:
+                deadline = origin + int((event.time_ns - first_ns) / self.speed)
+                wait_start = now = time.perf_counter_ns()
+                asked = deadline - now - spin_ns - oversleep_ns
+                if asked > 0:
+                    time.sleep(asked / 1e9)
+                    now = time.perf_counter_ns()
+                    overshoot = (now - wait_start) - asked
+                    oversleep_ns = max(0.0, oversleep_ns + OVERSLEEP_SMOOTHING * (overshoot - oversleep_ns))
+                while now < deadline:
+                    now = time.perf_counter_ns()
+                waited_ns += now - wait_start
+                late = now - deadline
+                lateness.observe(late / 1e9)
+                if max_lag_ns is not None and late > max_lag_ns:
+                    origin += late
+                    rebases += 1
+            else:
+                now = time.perf_counter_ns()
+
+            delivered_ns = wall_origin_ns + (now - began)
+            for sink in self.sinks:
+                sink.deliver(event, delivered_ns)
+            count += 1
+
+        elapsed_ns = time.perf_counter_ns() - began
+        for sink in self.sinks:
+            sink.close()
+        return self._report(count, first_ns, last_ns, elapsed_ns, waited_ns, lateness, rebases, oversleep_ns)
+
+    def _report(self, count, first_ns, last_ns, elapsed_ns, waited_ns, lateness, rebases, oversleep_ns):
+        # Rates, timing error and how far the replay ended from its schedule
+        span_s = (last_ns - first_ns) / 1e9 if count else 0.0
+        elapsed_s = elapsed_ns / 1e9
+        busy_s = (elapsed_ns - waited_ns) / 1e9
+        report = {
+            'events': count,
+            'speed': self.speed if self.speed is not None else 'max',
+            'recorded_span_s': span_s,
+            'elapsed_s': elapsed_s,
+            'events_per_s': count / elapsed_s if elapsed_s > 0 else None,
+            # Rate the loop and sinks could keep up with if there were no waiting
+            'max_sustainable_events_per_s': count / busy_s if busy_s > 0 else None,
+            'achieved_speed': span_s / elapsed_s if elapsed_s > 0 else None,
+        }
+        if self.speed is not None:
+            report['timing_error'] = lateness.summary()
+            report['end_drift_ms'] = (elapsed_s - span_s / self.speed) * 1e3
+            report['rebases'] = rebases
+            report['oversleep_ms'] = oversleep_ns / 1e6
+        return report
+
+
+def replay_session(session_folder, sinks, speed=1.0, streams=tuple(REPLAY_LOGS), **options):
+    """
+    Replay a recorded session's input logs into sinks.
+
+    Returns:
+        dict: The Session_Replay report
+    """
+    return Session_Replay(sinks, speed, **options).run(iter_replay_events(session_folder, streams))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a session's keyboard and mouse logs.")
+    parser.add_argument('session_folder', help='Recording session folder with keyboard_log.csv and mouse_log.csv')
+    parser.add_argument('-speed', default='1', help="Multiple of real time, or 'max' for as fast as possible")
+    parser.add_argument('-streams', nargs='+', default=list(REPLAY_LOGS), choices=list(REPLAY_LOGS))
+    parser.add_argument('-inject', action='store_true', help='Inject the events into the real keyboard and mouse')
+    parser.add_argument('-output', help='Save the delivered events as logs in this folder')
+    parser.add_argument('-max_lag', type=float, help='Seconds behind schedule at which it is moved back')
+    args = parser.parse_args()
+
+    sinks = [In_Process_Sink()]
+    if args.inject:
+        sinks.append(Injector_Sink())
+    speed = None if args.speed == 'max' else float(args.speed)
+    report = replay_session(args.session_folder, sinks, speed, args.streams, max_lag_s=args.max_lag)
+    if args.output:
+        sinks[0].save(args.output)
+        print(f"💾 Saved replayed logs to: {args.output}")
+    for name, value in report.items():
+        print(f"{name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from Model_Files.Processing_Module.Cognitive_State import Online_Normalizer
+
+
+class Test_Online_Normalizer:
+
+    def test_matches_exponentially_weighted_statistics(self):
+        rng = np.random.default_rng(0)
+        values = rng.normal(5.0, 2.0, size=(200, 3))
+        alpha = 0.05
+        normalizer = Online_Normalizer(3, alpha)
+        z = np.array([normalizer.update(row.copy()) for row in values])
+
+        # Each window is scored against the statistics of the windows before it
+        history = pd.DataFrame(values).ewm(alpha=alpha, adjust=False)
+        mean = history.mean().shift().to_numpy()[2:]
+        std = np.sqrt(history.var(bias=True).shift().to_numpy())[2:]
+        np.testing.assert_allclose(z[2:], (values[2:] - mean) / std, rtol=1e-9)
+        np.testing.assert_allclose(normalizer.mean, history.mean().to_numpy()[-1])
+
+    def test_first_value_is_not_scored(self):
+        normalizer = Online_Normalizer(2, 0.1)
+        assert np.isnan(normalizer.update(np.array([1.0, 2.0]))).all()
+
+    def test_constant_feature_sits_at_its_mean(self):
+        normalizer = Online_Normalizer(1, 0.1)
+        normalizer.update(np.array([3.0]))
+        np.testing.assert_array_equal(normalizer.update(np.array([3.0])), [0.0])
+
+    def test_missing_values_leave_statistics_unchanged(self):
+        normalizer = Online_Normalizer(2, 0.1)
+        for row in ([1.0, 1.0], [3.0, 3.0], [2.0, 2.0]):
+            normalizer.update(np.array(row))
+        mean, var, count = normalizer.mean.copy(), normalizer.var.copy(), normalizer.count.copy()
+
+        z = normalizer.update(np.array([np.nan, 2.5]))
+        assert np.isnan(z[0]) and np.isfinite(z[1])
+        assert normalizer.mean[0] == mean[0] and normalizer.var[0] == var[0]
+        assert normalizer.count.tolist() == [count[0], count[1] + 1]
+
+    def test_warmup(self):
+        normalizer = Online_Normalizer(1, 0.1, warmup=3)
+        scored = [np.isfinite(normalizer.update(np.array([value])))[0] for value in (1.0, 2.0, 3.0, 4.0, 5.0)]
+        assert scored == [False, False, False, True, True]
+
+    def test_does_not_modify_the_input(self):
+        normalizer = Online_Normalizer(2, 0.1)
+        values = np.array([1.0, np.nan])
+        normalizer.update(values)
+        assert values[0] == 1.0 and np.isnan(values[1])
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from Model_Files.Processing_Module.Feature_Fusion import Timeline
+
+
+START_NS = 1_700_000_000 * 10**9
+
+
+class Test_Timeline:
+
+    @pytest.fixture
+    def timeline(self):
+        # Five one-second bins
+        return Timeline(START_NS, START_NS + 5 * 10**9, rate_hz=1.0)
+
+    def test_bins_cover_session(self, timeline):
+        assert timeline.bins == 5
+        assert timeline.bin_s == 1.0
+        assert timeline.edges[0] == START_NS
+        assert timeline.edges[-1] == START_NS + 5 * 10**9
+
+    def test_partial_last_bin(self):
+        timeline = Timeline(START_NS, START_NS + 4_500_000_000, rate_hz=1.0)
+        assert timeline.bins == 5
+
+    def test_assign_bins_by_left_closed_edges(self, timeline):
+        times = START_NS + np.array([0, 999_999_999, 10**9, 4_999_999_999], dtype=np.int64)
+        index, kept = timeline.assign(times)
+        assert kept.all()
+        np.testing.assert_array_equal(index, [0, 0, 1, 4])
+
+    def test_assign_drops_times_off_the_timeline(self, timeline):
+        missing = np.iinfo(np.int64).min
+        times = np.array([START_NS - 1, START_NS + 2 * 10**9, START_NS + 5 * 10**9, missing], dtype=np.int64)
+        index, kept = timeline.assign(times)
+        np.testing.assert_array_equal(kept, [False, True, False, False])
+        np.testing.assert_array_equal(index, [2])
+
+    def test_overlap_within_one_bin(self, timeline):
+        covered = timeline.overlap_s([START_NS + 1_200_000_000], [START_NS + 1_700_000_000])
+        np.testing.assert_allclose(covered, [0, 0.5, 0, 0, 0])
+
+    def test_overlap_spanning_bins(self, timeline):
+        covered = timeline.overlap_s([START_NS + 500_000_000], [START_NS + 3_250_000_000])
+        np.testing.assert_allclose(covered, [0.5, 1, 1, 0.25, 0])
+
+    def test_overlap_clipped_to_the_timeline(self, timeline):
+        covered = timeline.overlap_s([START_NS - 10**9], [START_NS + 6 * 10**9])
+        np.testing.assert_allclose(covered, [1, 1, 1, 1, 1])
+
+    def test_overlap_matches_interval_by_interval_sum(self, timeline):
+        rng = np.random.default_rng(0)
+        starts = START_NS + rng.integers(0, 5 * 10**9, size=200)
+        ends = starts + rng.integers(0, 2 * 10**9, size=200)
+
+        expected = np.zeros(timeline.bins)
+        for start, end in zip(starts, ends):
+            low = np.maximum(timeline.edges[:-1], start)
+            high = np.minimum(timeline.edges[1:], end)
+            expected += np.clip(high - low, 0, None) / 1e9
+
+        np.testing.assert_allclose(timeline.overlap_s(starts, ends), expected, atol=1e-6)
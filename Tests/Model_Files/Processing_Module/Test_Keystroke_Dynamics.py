@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+from Model_Files.Processing_Module.Keystroke_Dynamics import pair_keystrokes, Keystroke_Dynamics, MAX_HOLD_S
+from Benchmarks.Synthetic import synthetic_keyboard_events
+
+
+def _events(*rows):
+    # (time in ms, key, event) rows as the arrays pair_keystrokes takes
+    time_ns = np.array([row[0] * 10**6 for row in rows], dtype=np.int64)
+    key = np.array([row[1] for row in rows], dtype=object)
+    event = np.array([row[2] for row in rows], dtype=object)
+    return time_ns, key, event
+
+
+def _log_arrays(frame):
+    return (frame['time'].to_numpy(dtype='datetime64[ns]').view(np.int64),
+            frame['key'].to_numpy(dtype=object), frame['event'].to_numpy(dtype=object))
+
+
+class Test_Pair_Keystrokes:
+
+    def test_press_and_release(self):
+        keystrokes, membership = pair_keystrokes(*_events((0, 'a', 'press'), (80, 'a', 'release')))
+        assert keystrokes.to_dict('records') == [
+            {'press_ns': 0, 'release_ns': 80 * 10**6, 'key': 'a', 'repeats': 0}]
+        np.testing.assert_array_equal(membership, [0, 0])
+
+    def test_repeated_presses_while_held(self):
+        keystrokes, membership = pair_keystrokes(*_events(
+            (0, 'a', 'press'), (500, 'a', 'press'), (530, 'a', 'press'), (600, 'a', 'release')))
+        assert len(keystrokes) == 1
+        assert keystrokes.loc[0, 'repeats'] == 2
+        assert keystrokes.loc[0, 'release_ns'] == 600 * 10**6
+        np.testing.assert_array_equal(membership, [0, 0, 0, 0])
+
+    def test_orphan_release(self):
+        # The first release is of a key already down when logging started
+        keystrokes, membership = pair_keystrokes(*_events(
+            (0, 'b', 'release'), (10, 'a', 'press'), (90, 'a', 'release')))
+        assert keystrokes['key'].tolist() == ['a']
+        np.testing.assert_array_equal(membership, [-1, 0, 0])
+
+    def test_duplicate_release(self):
+        keystrokes, membership = pair_keystrokes(*_events(
+            (0, 'a', 'press'), (80, 'a', 'release'), (85, 'a', 'release')))
+        assert len(keystrokes) == 1
+        assert keystrokes.loc[0, 'release_ns'] == 80 * 10**6
+        np.testing.assert_array_equal(membership, [0, 0, -1])
+
+    def test_only_orphan_releases(self):
+        keystrokes, membership = pair_keystrokes(*_events((0, 'a', 'release'), (5, 'b', 'release')))
+        assert keystrokes.empty
+        np.testing.assert_array_equal(membership, [-1, -1])
+
+    def test_overlapping_keys_in_press_order(self):
+        keystrokes, membership = pair_keystrokes(*_events(
+            (0, 'a', 'press'), (40, 'b', 'press'), (90, 'a', 'release'), (120, 'b', 'release')))
+        assert keystrokes['key'].tolist() == ['a', 'b']
+        assert keystrokes['release_ns'].tolist() == [90 * 10**6, 120 * 10**6]
+        np.testing.assert_array_equal(membership, [0, 1, 0, 1])
+
+    def test_held_key_has_no_release(self):
+        keystrokes, _ = pair_keystrokes(*_events((0, 'a', 'press'), (100, 'b', 'press'), (150, 'b', 'release')))
+        assert keystrokes['release_ns'].tolist() == [-1, 150 * 10**6]
+
+
+class Test_Keystroke_Dynamics:
+
+    @pytest.fixture
+    def log(self):
+        return _log_arrays(synthetic_keyboard_events(600, pd.Timestamp('2025-01-01 09:00:00'), seed=3))
+
+    @staticmethod
+    def _run(log, bounds):
+        dynamics = Keystroke_Dynamics()
+        parts = [dynamics.update(*(values[lo:hi] for values in log)) for lo, hi in zip(bounds[:-1], bounds[1:])]
+        parts.append(dynamics.finish())
+        return pd.concat(parts, ignore_index=True)
+
+    @pytest.mark.parametrize('chunk_rows', [1, 7, 250])
+    def test_chunk_invariance(self, log, chunk_rows):
+        rows = len(log[0])
+        whole = self._run(log, [0, rows])
+        chunked = self._run(log, list(range(0, rows, chunk_rows)) + [rows])
+        pd.testing.assert_frame_equal(chunked, whole)
+
+    def test_features(self):
+        dynamics = Keystroke_Dynamics(burst_pause_s=2.0)
+        keystrokes = dynamics.update(*_events(
+            (0, 'h', 'press'), (100, 'h', 'release'), (150, 'i', 'press'), (230, 'i', 'release'),
+            (3000, 'Key.backspace', 'press'), (3050, 'Key.backspace', 'release')))
+        np.testing.assert_allclose(keystrokes['dwell_s'], [0.1, 0.08, 0.05])
+        np.testing.assert_allclose(keystrokes['flight_s'], [np.nan, 0.05, 2.77])
+        np.testing.assert_allclose(keystrokes['digraph_s'], [np.nan, 0.15, 2.85])
+        assert keystrokes['digraph'].tolist()[1:] == ['h>i', 'i>Key.backspace']
+        assert keystrokes['burst_start'].tolist() == [True, False, True]
+        assert keystrokes['correction'].tolist() == [False, False, True]
+        assert keystrokes['text'].tolist() == [True, True, False]
+
+    def test_held_key_waits_for_its_release(self):
+        dynamics = Keystroke_Dynamics()
+        first = dynamics.update(*_events((0, 'a', 'press'), (50, 'b', 'press'), (90, 'b', 'release')))
+        assert first.empty
+        second = dynamics.update(*_events((200, 'a', 'release')))
+        assert second['key'].tolist() == ['a', 'b']
+
+    def test_stuck_key_stops_holding_back(self):
+        dynamics = Keystroke_Dynamics()
+        later_ms = int(MAX_HOLD_S * 1000) + 500
+        keystrokes = dynamics.update(*_events(
+            (0, 'a', 'press'), (later_ms, 'b', 'press'), (later_ms + 80, 'b', 'release')))
+        assert keystrokes['key'].tolist() == ['a', 'b']
+        assert np.isnan(keystrokes.loc[0, 'dwell_s'])
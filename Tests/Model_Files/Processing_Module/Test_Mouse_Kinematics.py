@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from Model_Files.Processing_Module.Mouse_Kinematics import Mouse_Kinematics
+from Benchmarks.Synthetic import synthetic_mouse_events
+
+
+def _log_arrays(frame):
+    return (frame['time'].to_numpy(dtype='datetime64[ns]').view(np.int64), frame['x'].to_numpy(),
+            frame['y'].to_numpy(), frame['event'].to_numpy(dtype=object))
+
+
+class Test_Mouse_Kinematics:
+
+    @pytest.fixture
+    def log(self):
+        frame = synthetic_mouse_events(3000, pd.Timestamp('2025-01-01 09:00:00'), rate_hz=60.0, seed=5)
+        # Rest the cursor now and then, so the log has pauses
+        rests = pd.to_timedelta(np.where(np.arange(len(frame)) % 400 == 399, 1.0, 0.0).cumsum(), unit='s')
+        frame['time'] = frame['time'] + rests
+        return _log_arrays(frame)
+
+    @staticmethod
+    def _run(log, bounds):
+        kinematics = Mouse_Kinematics()
+        parts = [kinematics.update(*(values[lo:hi] for values in log)) for lo, hi in zip(bounds[:-1], bounds[1:])]
+        return {name: pd.concat([part[name] for part in parts], ignore_index=True) for name in parts[0]}
+
+    @pytest.mark.parametrize('chunk_rows', [1, 13, 1000])
+    def test_chunk_invariance(self, log, chunk_rows):
+        rows = len(log[0])
+        whole = self._run(log, [0, rows])
+        chunked = self._run(log, list(range(0, rows, chunk_rows)) + [rows])
+        assert len(whole['pauses']) >= 7
+        for name in whole:
+            pd.testing.assert_frame_equal(chunked[name], whole[name], check_dtype=False, rtol=1e-9)
+
+    def test_motion_and_pause(self):
+        time_ns = np.array([0, 10, 20, 1020, 1030], dtype=np.int64) * 10**6
+        x = np.array([0, 10, 30, 30, 40])
+        y = np.zeros(5)
+        results = Mouse_Kinematics(pause_s=0.25).update(time_ns, x, y, np.array(['move'] * 5))
+
+        np.testing.assert_allclose(results['motion']['speed'], [np.nan, 1000, 2000, np.nan, 1000])
+        np.testing.assert_allclose(results['motion']['acceleration'], [np.nan, np.nan, 1e5, np.nan, np.nan])
+        assert results['pauses'].to_dict('records') == [
+            {'start_ns': 20 * 10**6, 'end_ns': 1020 * 10**6, 'duration_s': 1.0, 'x': 30.0, 'y': 0.0}]
+
+    def test_click_dwell_and_release_latency(self):
+        time_ns = np.array([0, 500, 580, 700], dtype=np.int64) * 10**6
+        event = np.array(['move', 'press', 'release', 'move'])
+        results = Mouse_Kinematics().update(time_ns, np.zeros(4), np.zeros(4), event)
+        np.testing.assert_allclose(results['dwell']['dwell_s'], [0.5])
+        np.testing.assert_allclose(results['click_to_move']['move_latency_s'], [0.12])
+
+    def test_release_waits_for_the_next_chunk(self):
+        kinematics = Mouse_Kinematics()
+        first = kinematics.update(np.array([0, 100]) * 10**6, np.zeros(2), np.zeros(2), np.array(['move', 'release']))
+        assert first['click_to_move'].empty
+        second = kinematics.update(np.array([300]) * 10**6, np.ones(1), np.ones(1), np.array(['move']))
+        np.testing.assert_allclose(second['click_to_move']['move_latency_s'], [0.2])
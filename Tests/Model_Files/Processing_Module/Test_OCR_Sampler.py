@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+from Model_Files.Processing_Module.OCR_Sampler import plan_event_samples, ocr_sample_frames, load_input_events, \
+    VIDEO_FPS
+
+
+SESSION = '2025-01-01_09-00-00_--_2025-01-01_09-10-00'
+START = pd.Timestamp('2025-01-01 09:00:00')
+FRAMES = int(600 * VIDEO_FPS)
+
+
+def _events(seconds, weight=1.0):
+    frames = np.asarray(seconds, dtype=np.float64) * VIDEO_FPS
+    return frames, np.full(frames.size, weight)
+
+
+@pytest.fixture
+def session(tmp_path):
+    folder = tmp_path / SESSION
+    folder.mkdir()
+    pd.DataFrame({'time': [START + pd.Timedelta(seconds=s) for s in (10, 10.2, 10.4)], 'key': 'a',
+                  'event': ['press', 'release', 'press']}).to_csv(folder / 'keyboard_log.csv', index=False)
+    pd.DataFrame({'time': [START + pd.Timedelta(seconds=s) for s in (300, 301)],
+                  'event': ['press', 'move']}).to_csv(folder / 'mouse_log.csv', index=False)
+    return str(folder)
+
+
+class Test_Plan_Event_Samples:
+
+    @pytest.mark.parametrize('budget', [1, 10, 200, 900])
+    def test_within_budget(self, budget):
+        event_frames, event_weights = _events(np.arange(30, 60, 0.25))
+        samples = plan_event_samples(FRAMES, event_frames, event_weights, budget)
+        assert samples[0] == 0
+        assert 1 <= samples.size <= budget
+        assert np.all(samples < FRAMES)
+
+    @pytest.mark.parametrize('min_gap_frames', [1, 3, 10])
+    def test_minimum_gap(self, min_gap_frames):
+        # A budget far above what the burst can hold at the minimum gap
+        event_frames, event_weights = _events(np.arange(30, 32, 0.05))
+        samples = plan_event_samples(FRAMES, event_frames, event_weights, budget=5000, idle_share=0.0,
+                                     min_gap_frames=min_gap_frames)
+        assert np.all(np.diff(samples) >= min_gap_frames)
+
+    def test_follows_input(self):
+        event_frames, event_weights = _events(np.arange(100, 110, 0.25))
+        samples = plan_event_samples(FRAMES, event_frames, event_weights, budget=200)
+        burst = (samples >= 100 * VIDEO_FPS) & (samples < 115 * VIDEO_FPS)
+        # 15 s of 600 s holds most of the event share of the budget
+        assert burst.sum() > 0.5 * samples.size
+
+    def test_idle_share_covers_quiet_stretches(self):
+        event_frames, event_weights = _events(np.arange(100, 110, 0.25))
+        samples = plan_event_samples(FRAMES, event_frames, event_weights, budget=200, idle_share=0.25)
+        quiet = samples[samples > 200 * VIDEO_FPS]
+        assert quiet.size >= 0.25 * 200 * 0.6
+        assert np.diff(quiet).max() <= 2 * FRAMES / (0.25 * 200)
+
+    def test_no_events_samples_evenly(self):
+        samples = plan_event_samples(FRAMES, np.empty(0), np.empty(0), budget=100)
+        assert samples.size == 100
+        assert np.ptp(np.diff(samples)) <= 1
+
+    def test_ignores_events_outside_capture(self):
+        event_frames, event_weights = _events([-5, 700])
+        samples = plan_event_samples(FRAMES, event_frames, event_weights, budget=100)
+        np.testing.assert_array_equal(samples, plan_event_samples(FRAMES, np.empty(0), np.empty(0), budget=100))
+
+    def test_empty_capture(self):
+        assert plan_event_samples(0, np.empty(0), np.empty(0), budget=10).size == 0
+
+
+class Test_OCR_Sample_Frames:
+
+    def test_fixed(self):
+        np.testing.assert_array_equal(ocr_sample_frames(None, 35, mode='fixed', frame_interval=10), [0, 10, 20, 30])
+
+    def test_events_budget(self, session):
+        samples = ocr_sample_frames(session, FRAMES, mode='events', samples_per_minute=30)
+        assert samples.size <= 30 * 10
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            ocr_sample_frames(None, 100, mode='sometimes')
+
+    def test_load_input_events(self, session):
+        frames, weights = load_input_events(session, time_offset_s=5.0)
+        # Releases are not weighted; moves are weighted lightly
+        assert sorted(weights.tolist()) == [0.02, 1.0, 1.0, 3.0]
+        np.testing.assert_allclose(np.sort(frames), np.array([5, 5.4, 295, 296]) * VIDEO_FPS)
+
+    def test_load_input_events_without_logs(self, tmp_path):
+        frames, weights = load_input_events(str(tmp_path))
+        assert frames.size == 0 and weights.size == 0
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from Model_Files.Processing_Module.OCR_Span_Tracker import OCR_Span_Tracker, bbox_rectangles, pairwise_iou, \
+    text_similarity
+
+
+def _box(x0, y0, x1, y1):
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1]]
+
+
+TITLE = _box(0, 0, 100, 20)
+BODY = _box(0, 50, 200, 80)
+
+
+def _spans(groups):
+    return [span for _, spans in groups for span in spans]
+
+
+class Test_Geometry:
+
+    def test_bbox_rectangles(self):
+        assert bbox_rectangles([TITLE]).tolist() == [[0, 0, 100, 20]]
+        assert bbox_rectangles([]).shape == (0, 4)
+
+    def test_pairwise_iou(self):
+        iou = pairwise_iou(bbox_rectangles([TITLE, BODY]), bbox_rectangles([TITLE, _box(50, 0, 150, 20)]))
+        assert iou[0, 0] == pytest.approx(1.0)
+        assert iou[0, 1] == pytest.approx(1 / 3)
+        assert np.all(iou[1] == 0)
+
+    def test_text_similarity(self):
+        assert text_similarity('Inbox', 'Inbox') == 1.0
+        assert text_similarity('Inbox (3)', 'Inbox (4)') > 0.8
+        assert text_similarity('Inbox', 'Settings') < 0.5
+
+
+class Test_OCR_Span_Tracker:
+
+    def test_merges_frames_within_gap(self):
+        tracker = OCR_Span_Tracker(max_gap=1.0)
+        groups = []
+        for timestamp in (0.0, 0.5, 1.5, 2.0):
+            groups += tracker.update(timestamp, [(TITLE, 'Inbox', 0.9)])
+        groups += tracker.finish()
+        spans = _spans(groups)
+        assert len(spans) == 1
+        assert (spans[0]['t_start'], spans[0]['t_end'], spans[0]['frames']) == (0.0, 2.0, 4)
+
+    def test_gap_longer_than_max_gap_splits(self):
+        tracker = OCR_Span_Tracker(max_gap=1.0)
+        groups = tracker.update(0.0, [(TITLE, 'Inbox', 0.9)])
+        groups += tracker.update(0.5, [])
+        # 1.5 s unseen closes the span before the text reappears
+        groups += tracker.update(2.0, [(TITLE, 'Inbox', 0.9)])
+        groups += tracker.finish()
+        spans = _spans(groups)
+        assert [(span['t_start'], span['t_end']) for span in spans] == [(0.0, 0.0), (2.0, 2.0)]
+
+    def test_keeps_most_confident_detection(self):
+        tracker = OCR_Span_Tracker()
+        tracker.update(0.0, [(TITLE, 'Inb0x (3)', 0.4)])
+        tracker.update(0.5, [(TITLE, 'Inbox (3)', 0.95)])
+        tracker.update(1.0, [(TITLE, 'Inbox (3', 0.6)])
+        span, = _spans(tracker.finish())
+        assert span['text'] == 'Inbox (3)'
+        assert span['max_conf'] == 0.95
+        assert span['frames'] == 3
+
+    def test_changed_text_opens_new_span(self):
+        tracker = OCR_Span_Tracker()
+        tracker.update(0.0, [(TITLE, 'Inbox', 0.9)])
+        tracker.update(0.5, [(TITLE, 'Settings', 0.9)])
+        spans = _spans(tracker.finish())
+        assert sorted(span['text'] for span in spans) == ['Inbox', 'Settings']
+
+    def test_moved_box_opens_new_span(self):
+        tracker = OCR_Span_Tracker()
+        tracker.update(0.0, [(TITLE, 'Inbox', 0.9)])
+        tracker.update(0.5, [(BODY, 'Inbox', 0.9)])
+        assert len(_spans(tracker.finish())) == 2
+
+    def test_each_detection_continues_one_span(self):
+        tracker = OCR_Span_Tracker()
+        tracker.update(0.0, [(TITLE, 'Inbox', 0.9)])
+        tracker.update(0.5, [(TITLE, 'Inbox', 0.9), (TITLE, 'Inbox', 0.8)])
+        spans = _spans(tracker.finish())
+        assert sorted(span['frames'] for span in spans) == [1, 2]
+
+    def test_releases_in_start_order(self):
+        tracker = OCR_Span_Tracker(max_gap=1.0)
+        groups = tracker.update(0.0, [(TITLE, 'Inbox', 0.9)])
+        groups += tracker.update(0.5, [(TITLE, 'Inbox', 0.9), (BODY, 'Hello', 0.9)])
+        # The body span closes first but may not be released before the older title span
+        for timestamp in (1.0, 2.0, 3.0):
+            groups += tracker.update(timestamp, [(TITLE, 'Inbox', 0.9)])
+        assert groups == []
+        groups += tracker.finish()
+        assert [t_start for t_start, _ in groups] == [0.0, 0.5]
+        assert [spans[0]['text'] for _, spans in groups] == ['Inbox', 'Hello']
+
+    def test_groups_spans_with_equal_start(self):
+        tracker = OCR_Span_Tracker()
+        tracker.update(0.0, [(TITLE, 'Inbox', 0.9), (BODY, 'Hello', 0.9)])
+        groups = tracker.finish()
+        assert len(groups) == 1
+        assert groups[0][0] == 0.0 and len(groups[0][1]) == 2
@@ -0,0 +1,91 @@
+import os
+import pytest
+from Model_Files.Processing_Module.OCR_Store import OCR_Writer, OCR_Reader, merge_outputs, records_path, index_path, \
+    PARTIAL_SUFFIX
+
+
+def _frames():
+    return [(0.0, [{'text': 'a', 'timestamp': 0.0}]), (0.5, []),
+            (1.0, [{'text': 'b', 'timestamp': 1.0}, {'text': 'c', 'timestamp': 1.0}]),
+            (2.0, [{'text': 'd', 'timestamp': 2.0}])]
+
+
+def _write(output_dir, frames, batch_size=100):
+    with OCR_Writer(output_dir, batch_size=batch_size) as writer:
+        for timestamp, records in frames:
+            writer.write_frame(timestamp, records)
+
+
+class Test_OCR_Writer:
+
+    def test_publishes_on_close(self, tmp_path):
+        writer = OCR_Writer(tmp_path)
+        writer.write_frame(0.0, [{'text': 'a'}])
+        assert not records_path(tmp_path).exists()
+        writer.close()
+        assert records_path(tmp_path).exists() and index_path(tmp_path).exists()
+        assert not os.path.exists(f'{records_path(tmp_path)}{PARTIAL_SUFFIX}')
+        # A second close does nothing
+        writer.close()
+
+    def test_abort_removes_partial_output(self, tmp_path):
+        writer = OCR_Writer(tmp_path)
+        writer.write_frame(0.0, [{'text': 'a'}])
+        writer.abort()
+        assert os.listdir(tmp_path) == []
+
+    def test_error_in_context_aborts(self, tmp_path):
+        with pytest.raises(RuntimeError):
+            with OCR_Writer(tmp_path) as writer:
+                writer.write_frame(0.0, [{'text': 'a'}])
+                raise RuntimeError('OCR failed')
+        assert os.listdir(tmp_path) == []
+
+    def test_abort_keeps_published_output(self, tmp_path):
+        _write(tmp_path, _frames())
+        OCR_Writer(tmp_path).abort()
+        assert len(OCR_Reader(tmp_path).read()) == 4
+
+    def test_frames_out_of_order(self, tmp_path):
+        with OCR_Writer(tmp_path) as writer:
+            writer.write_frame(1.0, [])
+            with pytest.raises(ValueError):
+                writer.write_frame(0.5, [])
+
+
+class Test_OCR_Reader:
+
+    @pytest.mark.parametrize('batch_size', [1, 100])
+    def test_range_reads(self, tmp_path, batch_size):
+        _write(tmp_path, _frames(), batch_size)
+        reader = OCR_Reader(tmp_path)
+        assert reader.timestamps.tolist() == [0.0, 0.5, 1.0, 2.0]
+        assert [r['text'] for r in reader.read()] == ['a', 'b', 'c', 'd']
+        assert [r['text'] for r in reader.read(0.5, 1.0)] == ['b', 'c']
+        assert [r['text'] for r in reader.read(t0=1.5)] == ['d']
+        assert reader.read(2.5, 3.0) == []
+
+    def test_frames_without_text_are_kept(self, tmp_path):
+        _write(tmp_path, _frames())
+        frames = list(OCR_Reader(tmp_path).iter_frames(0.5, 1.0))
+        assert [(t, [r['text'] for r in records]) for t, records in frames] == [(0.5, []), (1.0, ['b', 'c'])]
+
+    def test_missing_output(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            OCR_Reader(tmp_path)
+
+
+class Test_Merge_Outputs:
+
+    def test_parts_are_shifted_by_their_offset(self, tmp_path):
+        _write(tmp_path / 'part0', _frames()[:2])
+        _write(tmp_path / 'part1', _frames()[2:])
+        assert merge_outputs([(tmp_path / 'part0', 0.0), (tmp_path / 'missing', 5.0), (tmp_path / 'part1', 10.0)],
+                             tmp_path / 'merged')
+        reader = OCR_Reader(tmp_path / 'merged')
+        assert reader.timestamps.tolist() == [0.0, 0.5, 11.0, 12.0]
+        assert [r['timestamp'] for r in reader.read()] == [0.0, 11.0, 11.0, 12.0]
+
+    def test_nothing_to_merge(self, tmp_path):
+        assert not merge_outputs([(tmp_path / 'missing', 0.0)], tmp_path / 'merged')
+        assert not (tmp_path / 'merged').exists()
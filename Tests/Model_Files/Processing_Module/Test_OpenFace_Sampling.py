@@ -0,0 +1,99 @@
+import cv2
+import numpy as np
+import pandas as pd
+import pytest
+from Benchmarks.Synthetic import write_synthetic_avi
+from Model_Files.Processing_Module.OpenFace_Sampling import remap_openface_csv, merge_openface_segments, \
+    write_subsampled_input, _read_openface_csv, _write_openface_csv
+
+
+FPS = 10.0
+
+
+def _openface_csv(path, rows):
+    # rows: (frame, success, AU01_r, AU01_c, face_id) as OpenFace numbers its subsampled input
+    frame = pd.DataFrame(rows, columns=['frame', 'success', 'AU01_r', 'AU01_c', 'face_id'])
+    frame.insert(1, 'timestamp', (frame['frame'] - 1) / FPS)
+    _write_openface_csv(frame, path)
+    return path
+
+
+class Test_Remap_OpenFace_CSV:
+
+    def test_interpolates_between_tracked_samples(self, tmp_path):
+        path = _openface_csv(tmp_path / 'webcam_capture.csv',
+                             [(1, 1, 0.0, 0, 0), (2, 1, 3.0, 1, 0), (3, 1, 3.0, 1, 0)])
+        remap_openface_csv(path, stride=3, fps=FPS, frame_count=8)
+        dense = _read_openface_csv(path)
+
+        assert dense['frame'].tolist() == list(range(1, 9))
+        np.testing.assert_allclose(dense['timestamp'], np.arange(8) / FPS)
+        np.testing.assert_allclose(dense['AU01_r'], [0, 1, 2, 3, 3, 3, 3, 3])
+        # Presence is taken from the nearest sample, not blended
+        assert dense['AU01_c'].tolist() == [0, 0, 1, 1, 1, 1, 1, 1]
+
+    def test_copies_nearest_sample_across_tracking_failure(self, tmp_path):
+        path = _openface_csv(tmp_path / 'webcam_capture.csv',
+                             [(1, 1, 1.0, 1, 0), (2, 0, 0.0, 0, 0), (3, 1, 4.0, 1, 0)])
+        remap_openface_csv(path, stride=4, fps=FPS, frame_count=9)
+        dense = _read_openface_csv(path)
+
+        np.testing.assert_allclose(dense['AU01_r'], [1, 1, 0, 0, 0, 0, 4, 4, 4])
+        assert dense['success'].tolist() == [1, 1, 0, 0, 0, 0, 1, 1, 1]
+
+    def test_unsorted_rows(self, tmp_path):
+        path = _openface_csv(tmp_path / 'webcam_capture.csv', [(2, 1, 2.0, 1, 0), (1, 1, 0.0, 0, 0)])
+        remap_openface_csv(path, stride=2, fps=FPS, frame_count=3)
+        np.testing.assert_allclose(_read_openface_csv(path)['AU01_r'], [0, 1, 2])
+
+    def test_without_interpolation(self, tmp_path):
+        path = _openface_csv(tmp_path / 'webcam_capture.csv', [(1, 1, 0.0, 0, 0), (2, 1, 3.0, 1, 0)])
+        remap_openface_csv(path, stride=5, fps=FPS, frame_count=10, interpolate=False)
+        sparse = _read_openface_csv(path)
+        assert sparse['frame'].tolist() == [1, 6]
+        np.testing.assert_allclose(sparse['timestamp'], [0.0, 0.5])
+        np.testing.assert_allclose(sparse['AU01_r'], [0.0, 3.0])
+
+    def test_empty_csv_is_left_alone(self, tmp_path):
+        path = tmp_path / 'webcam_capture.csv'
+        path.write_text('frame, timestamp, success\n')
+        remap_openface_csv(path, stride=3, fps=FPS, frame_count=9)
+        assert path.read_text() == 'frame, timestamp, success\n'
+
+
+class Test_Merge_OpenFace_Segments:
+
+    def test_continues_frames_and_offsets_timestamps(self, tmp_path):
+        first = _openface_csv(tmp_path / 'part_0.csv', [(1, 1, 0.0, 0, 0), (2, 1, 1.0, 1, 0)])
+        second = _openface_csv(tmp_path / 'part_2.csv', [(1, 1, 2.0, 1, 0)])
+        merged = tmp_path / 'out' / 'webcam_capture.csv'
+        parts = [(first, FPS, 0.0, 2), (tmp_path / 'missing.csv', FPS, 0.2, 5), (second, 20.0, 1.0, 3)]
+
+        assert merge_openface_segments(parts, merged)
+        frame = _read_openface_csv(merged)
+        assert frame['frame'].tolist() == [1, 2, 8]
+        np.testing.assert_allclose(frame['timestamp'], [0.0, 0.1, 1.0])
+
+    def test_nothing_to_merge(self, tmp_path):
+        assert not merge_openface_segments([(tmp_path / 'missing.csv', FPS, 0.0, 10)], tmp_path / 'out.csv')
+
+
+class Test_Write_Subsampled_Input:
+
+    @pytest.mark.parametrize('method', ['proxy_video', 'image_sequence'])
+    def test_keeps_every_stride_th_frame(self, tmp_path, method):
+        video = write_synthetic_avi(str(tmp_path / 'webcam.avi'), 10, resolution=(64, 48), fps=FPS)
+        arguments, fps, frame_count = write_subsampled_input(video, str(tmp_path / 'input'), 3, method)
+        assert (fps, frame_count) == (FPS, 10)
+        if method == 'image_sequence':
+            assert arguments[0] == '-fdir'
+            assert len(list((tmp_path / 'input' / 'webcam_capture').iterdir())) == 4
+        else:
+            assert arguments[0] == '-f'
+            capture = cv2.VideoCapture(arguments[1])
+            assert int(capture.get(cv2.CAP_PROP_FRAME_COUNT)) == 4
+            capture.release()
+
+    def test_unknown_method(self, tmp_path):
+        with pytest.raises(ValueError):
+            write_subsampled_input(str(tmp_path / 'webcam.avi'), str(tmp_path), 3, 'frames')
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+from Model_Files.Processing_Module.OpenFace_Windows import OpenFace_Windows
+from Benchmarks.Synthetic import synthetic_openface_frame
+
+
+def _run(frame, chunk_rows, window_s=10.0):
+    windows = OpenFace_Windows(window_s, start_ns=0)
+    parts = [windows.update(frame.iloc[lo:lo + chunk_rows]) for lo in range(0, len(frame), chunk_rows)]
+    parts.append(windows.finish())
+    return pd.concat(parts, ignore_index=True)
+
+
+class Test_OpenFace_Windows:
+
+    @pytest.fixture
+    def frame(self):
+        return synthetic_openface_frame(4000, seed=2)
+
+    @pytest.mark.parametrize('chunk_rows', [97, 1000, 2880])
+    def test_chunk_invariance(self, frame, chunk_rows):
+        whole = _run(frame, len(frame))
+        pd.testing.assert_frame_equal(_run(frame, chunk_rows), whole, rtol=1e-9)
+
+    def test_windows_match_direct_statistics(self, frame):
+        windows = _run(frame, 500)
+        window = np.floor(frame['timestamp'] / 10.0)
+        tracked = frame[frame['success'] == 1].groupby(window[frame['success'] == 1])
+
+        assert windows['window_s'].tolist() == [index * 10.0 for index in sorted(window.unique())]
+        np.testing.assert_allclose(windows['frames'], frame.groupby(window).size())
+        np.testing.assert_allclose(windows['AU12_r_mean'], tracked['AU12_r'].mean())
+        np.testing.assert_allclose(windows['AU12_r_var'], tracked['AU12_r'].var())
+        np.testing.assert_allclose(windows['face_tracked'], tracked.size() / frame.groupby(window).size())
+
+    def test_windows_close_as_chunks_pass_them(self, frame):
+        windows = OpenFace_Windows(10.0)
+        closed = windows.update(frame.iloc[:400])
+        # 400 frames at 28.8 fps reach into the second window, which stays open
+        assert closed['window_s'].tolist() == [0.0]
+        assert windows.finish()['window_s'].tolist() == [10.0]
+
+    @pytest.mark.parametrize('split', [5, 10, 15])
+    def test_chunk_invariance_with_untracked_frames(self, split):
+        # One window whose second half was not tracked, so a chunk can add only untracked frames to it
+        frame = pd.DataFrame({
+            'timestamp': np.arange(20) * 0.1,
+            'success': (np.arange(20) < 10).astype(int),
+            'confidence': np.where(np.arange(20) < 10, 0.9, 0.0),
+            'AU01_r': np.arange(20, dtype=np.float64),
+            'AU45_r': 0.0,
+        })
+        whole = _run(frame, len(frame))
+        assert whole.loc[0, 'AU01_r_mean'] == 4.5
+        assert whole.loc[0, 'AU01_r_var'] == pytest.approx(55 / 6)
+        assert whole.loc[0, 'face_tracked'] == 0.5
+
+        windows = OpenFace_Windows(10.0, start_ns=0)
+        parts = [windows.update(frame.iloc[:split]), windows.update(frame.iloc[split:]), windows.finish()]
+        pd.testing.assert_frame_equal(pd.concat(parts, ignore_index=True), whole)
+
+    def test_untracked_chunk_before_tracked_frames(self):
+        frame = pd.DataFrame({
+            'timestamp': np.arange(20) * 0.1,
+            'success': (np.arange(20) >= 10).astype(int),
+            'confidence': 0.9,
+            'AU01_r': np.arange(20, dtype=np.float64),
+        })
+        pd.testing.assert_frame_equal(_run(frame, 10), _run(frame, 20))
@@ -0,0 +1,64 @@
+import itertools
+import pytest
+from Model_Files.Resource_Governor import Resource_Governor
+
+
+STAGES = ['ocr', 'openface', 'fusion', 'states']
+
+
+class Test_Resource_Governor:
+
+    def test_rejects_non_positive_weight(self):
+        with pytest.raises(ValueError):
+            Resource_Governor(total_cores=4, weights={'ocr': 0})
+
+    def test_no_demand(self):
+        assert Resource_Governor(total_cores=4).allocate({'ocr': 0}) == {}
+
+    @pytest.mark.parametrize('total_cores', [1, 2, 3, 4, 7, 16])
+    def test_shares_never_exceed_budget(self, total_cores):
+        governor = Resource_Governor(total_cores=total_cores, weights={'ocr': 3, 'openface': 2},
+                                     min_threads={'openface': 2})
+        for counts in itertools.product([0, 1, 3], repeat=len(STAGES)):
+            demand = dict(zip(STAGES, counts))
+            for running_counts in itertools.product([0, 1], repeat=len(STAGES)):
+                running = {name: min(r, demand[name]) for name, r in zip(STAGES, running_counts)}
+                allocation = governor.allocate(demand, running)
+
+                assert sum(share['cores'] for share in allocation.values()) <= total_cores
+                assert set(allocation) == {name for name, count in demand.items() if count > 0}
+                for name, share in allocation.items():
+                    # Tasks of one stage never use more threads together than the stage's cores
+                    assert share['concurrency'] * share['threads'] <= share['cores']
+                    assert share['concurrency'] <= demand[name]
+                    if share['cores']:
+                        assert share['concurrency'] >= 1 and share['threads'] >= 1
+
+    def test_uses_whole_budget(self):
+        allocation = Resource_Governor(total_cores=8).allocate({'ocr': 4, 'openface': 4})
+        assert sum(share['cores'] for share in allocation.values()) == 8
+
+    def test_split_follows_weight(self):
+        allocation = Resource_Governor(total_cores=8, weights={'ocr': 3}).allocate({'ocr': 1, 'openface': 1})
+        assert (allocation['ocr']['cores'], allocation['openface']['cores']) == (6, 2)
+        assert allocation['ocr'] == {'cores': 6, 'concurrency': 1, 'threads': 6}
+
+    def test_min_threads_limits_concurrency(self):
+        governor = Resource_Governor(total_cores=8, min_threads={'openface': 4})
+        assert governor.allocate({'openface': 5})['openface'] == {'cores': 8, 'concurrency': 2, 'threads': 4}
+        assert Resource_Governor(total_cores=8).allocate({'openface': 5})['openface']['concurrency'] == 5
+
+    def test_running_stages_keep_cores(self):
+        governor = Resource_Governor(total_cores=2, weights={'ocr': 5})
+        demand = {'ocr': 1, 'openface': 1, 'fusion': 1}
+
+        # By weight, ocr is funded first when nothing runs yet
+        assert governor.allocate(demand)['ocr']['cores'] == 1
+        allocation = governor.allocate(demand, {'openface': 1, 'fusion': 1})
+        assert allocation['ocr'] == {'cores': 0, 'concurrency': 0, 'threads': 0}
+        assert allocation['openface']['cores'] == 1 and allocation['fusion']['cores'] == 1
+
+    def test_freed_cores_go_to_remaining_stages(self):
+        governor = Resource_Governor(total_cores=4)
+        assert governor.allocate({'ocr': 2, 'openface': 2})['ocr']['cores'] == 2
+        assert governor.allocate({'ocr': 2, 'openface': 0})['ocr'] == {'cores': 4, 'concurrency': 2, 'threads': 2}
@@ -0,0 +1,163 @@
+import os
+import pytest
+from Model_Files.Session_Catalog import Session_Catalog, capture_sessions, add_saved_sessions, parse_session_name
+
+
+FIRST = '2025-01-01_09-00-00_--_2025-01-01_09-10-00'
+SECOND = '2025-01-02_09-00-00_--_2025-01-02_09-05-00'
+
+
+def _session(parent, name, *filenames):
+    folder = parent / name
+    folder.mkdir(parents=True, exist_ok=True)
+    for filename in filenames:
+        (folder / filename).write_text('time,event\n')
+    return folder
+
+
+def _touch_folder(folder, step_ns=10**9):
+    # Folder modification times may not change between writes made within the same tick
+    mtime_ns = os.stat(folder).st_mtime_ns + step_ns
+    os.utime(folder, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def data_folder(tmp_path):
+    _session(tmp_path, FIRST, 'keyboard_log.csv', 'screen_capture.avi')
+    _session(tmp_path / 'P01', SECOND, 'mouse_log.csv', 'webcam_capture.avi')
+    return tmp_path
+
+
+class Test_Parse_Session_Name:
+
+    def test_span(self):
+        start_ns, stop_ns = parse_session_name(FIRST)
+        assert stop_ns - start_ns == 600 * 10**9
+
+    @pytest.mark.parametrize('name', ['EasyOCR', '2025-01-01_09-00-00', 'a_--_b'])
+    def test_not_a_session(self, name):
+        assert parse_session_name(name) is None
+
+
+class Test_Rescan:
+
+    def test_finds_nested_sessions(self, data_folder):
+        with Session_Catalog(data_folder) as catalog:
+            assert catalog.rescan()['added'] == 2
+            assert catalog.sessions() == [str(data_folder / FIRST), str(data_folder / 'P01' / SECOND)]
+            assert catalog.sessions(modalities=['webcam']) == [str(data_folder / 'P01' / SECOND)]
+
+    def test_ignores_processing_output(self, data_folder):
+        # Output folders are named after their session but hold no recording
+        _session(data_folder / 'EasyOCR', FIRST, 'ocr_output.jsonl')
+        _session(data_folder / 'P01' / 'Openface', SECOND, 'webcam_capture.csv')
+        with Session_Catalog(data_folder) as catalog:
+            counts = catalog.rescan()
+        assert counts['added'] == 2
+        assert counts['unchanged'] == 0
+
+    def test_reports_unfinished_recordings(self, data_folder):
+        _session(data_folder / 'P01', '.recording_2025-01-03_09-00-00', 'keyboard_log.csv')
+        with Session_Catalog(data_folder) as catalog:
+            counts = catalog.rescan()
+            assert counts['unfinished'] == 1
+            assert len(catalog.sessions()) == 2
+
+    def test_incremental(self, data_folder):
+        with Session_Catalog(data_folder) as catalog:
+            catalog.rescan()
+            assert catalog.rescan()['unchanged'] == 2
+
+            (data_folder / FIRST / 'webcam_capture.avi').write_text('')
+            _touch_folder(data_folder / FIRST)
+            counts = catalog.rescan()
+            assert (counts['updated'], counts['unchanged']) == (1, 1)
+            assert str(data_folder / FIRST) in catalog.sessions(modalities=['webcam'])
+
+    def test_moved_session_is_updated(self, data_folder):
+        with Session_Catalog(data_folder) as catalog:
+            catalog.rescan()
+            os.renames(data_folder / FIRST, data_folder / 'P02' / FIRST)
+            assert catalog.rescan()['updated'] == 1
+            assert str(data_folder / 'P02' / FIRST) in catalog.sessions()
+
+    def test_removed_session_drops_its_stages(self, data_folder):
+        with Session_Catalog(data_folder) as catalog:
+            catalog.rescan()
+            catalog.set_stage(str(data_folder / FIRST), 'ocr', 'completed')
+            for filename in os.listdir(data_folder / FIRST):
+                os.remove(data_folder / FIRST / filename)
+            os.rmdir(data_folder / FIRST)
+
+            assert catalog.rescan()['removed'] == 1
+            assert catalog.stage_status(FIRST) == {}
+
+    def test_duplicate_name_is_catalogued_once(self, data_folder):
+        _session(data_folder / 'P02', SECOND, 'mouse_log.csv')
+        with Session_Catalog(data_folder) as catalog:
+            assert catalog.rescan()['added'] == 2
+            assert catalog.sessions() == [str(data_folder / FIRST), str(data_folder / 'P01' / SECOND)]
+
+
+class Test_Sessions:
+
+    def test_pending_stage(self, data_folder):
+        with Session_Catalog(data_folder) as catalog:
+            catalog.rescan()
+            catalog.set_stage(str(data_folder / FIRST), 'ocr', 'completed', 1.5)
+            catalog.set_stage(str(data_folder / 'P01' / SECOND), 'ocr', 'failed')
+
+            assert catalog.sessions(pending_stage='ocr') == [str(data_folder / 'P01' / SECOND)]
+            assert len(catalog.sessions(pending_stage='openface')) == 2
+            assert catalog.stage_status(FIRST) == {'ocr': 'completed'}
+
+    def test_stage_of_unknown_session_is_ignored(self, data_folder):
+        with Session_Catalog(data_folder) as catalog:
+            catalog.set_stage(FIRST, 'ocr', 'completed')
+            assert catalog.stage_status(FIRST) == {}
+
+    def test_filters(self, data_folder):
+        with Session_Catalog(data_folder) as catalog:
+            catalog.rescan()
+            assert catalog.sessions(min_duration_s=400) == [str(data_folder / FIRST)]
+            assert catalog.sessions(since='2025-01-02') == [str(data_folder / 'P01' / SECOND)]
+            assert len(catalog.sessions(any_modality=['keyboard', 'mouse'])) == 2
+
+    def test_unknown_modality(self, data_folder):
+        with Session_Catalog(data_folder) as catalog:
+            with pytest.raises(ValueError):
+                catalog.sessions(modalities=['audio'])
+
+
+class Test_Capture_Sessions:
+
+    def test_session_folder_is_returned_as_is(self, data_folder):
+        folder = str(data_folder / FIRST)
+        assert capture_sessions(folder, 'screen_capture') == [folder]
+        assert capture_sessions(folder, 'webcam_capture') == []
+
+    def test_data_folder_needs_explicit_rescan(self, data_folder):
+        assert capture_sessions(str(data_folder), 'webcam_capture') == []
+        assert capture_sessions(str(data_folder), 'webcam_capture', rescan=True) == \
+            [str(data_folder / 'P01' / SECOND)]
+
+    def test_leaves_out_completed_stage(self, data_folder):
+        with Session_Catalog(data_folder) as catalog:
+            catalog.rescan()
+            catalog.set_stage(FIRST, 'ocr', 'completed')
+        assert capture_sessions(str(data_folder), 'screen_capture') == []
+        # OpenFace has not run on it, so the webcam session is still pending
+        assert capture_sessions(str(data_folder), 'webcam_capture') == [str(data_folder / 'P01' / SECOND)]
+
+
+class Test_Add_Saved_Sessions:
+
+    def test_adds_without_rescan(self, data_folder):
+        assert add_saved_sessions(str(data_folder), [str(data_folder / 'P01' / SECOND)])
+        with Session_Catalog(data_folder) as catalog:
+            assert catalog.sessions() == [str(data_folder / 'P01' / SECOND)]
+
+    def test_unwritable_catalog_does_not_raise(self, tmp_path):
+        # A folder where the database file should be cannot be opened as one
+        (tmp_path / 'catalog.sqlite').mkdir()
+        assert not add_saved_sessions(str(tmp_path), [str(tmp_path / FIRST)])
@@ -0,0 +1,87 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from Model_Files.Session_Index import Session_Index, session_start_ns, to_ns
+
+
+SESSION = '2025-01-01_09-00-00_--_2025-01-01_09-10-00'
+START = pd.Timestamp('2025-01-01 09:00:00')
+
+
+def _at(seconds):
+    return (START + pd.Timedelta(seconds=seconds)).isoformat()
+
+
+@pytest.fixture
+def session(tmp_path):
+    folder = tmp_path / SESSION
+    folder.mkdir()
+    # Out of time order on purpose, with a key that needs quoting and a row without a time
+    (folder / 'keyboard_log.csv').write_text(
+        'time,key,event\n'
+        f'{_at(1)},a,press\n'
+        f'{_at(2)},",",press\n'
+        f'{_at(4)},b,press\n'
+        f'{_at(3)},c,press\n'
+        'not a time,d,press\n'
+        f'{_at(5)},e,press\n')
+    openface = tmp_path / 'Openface' / SESSION
+    openface.mkdir(parents=True)
+    (openface / 'webcam_capture.csv').write_text('frame, timestamp, success\n1, 0.5, 1\n2, 1.5, 1\n3, 2.5, 0\n')
+    ocr = tmp_path / 'EasyOCR' / SESSION
+    ocr.mkdir(parents=True)
+    (ocr / 'ocr_output.jsonl').write_text(''.join(
+        json.dumps({'timestamp': t, 'text': f'line {t}'}) + '\n' for t in (0.0, 2.0, 4.0)))
+    return str(folder)
+
+
+class Test_Session_Index:
+
+    def test_session_start(self, session):
+        assert session_start_ns(session) == START.value
+        assert to_ns(START) == START.value == to_ns(START.value)
+
+    def test_discovers_streams(self, session):
+        assert sorted(Session_Index(session).streams) == ['keyboard', 'ocr', 'openface']
+
+    def test_range_query_bounds_are_inclusive(self, session):
+        index = Session_Index(session)
+        frame = index.query('keyboard', _at(2), _at(4))
+        assert frame['key'].tolist() == [',', 'c', 'b']
+        np.testing.assert_array_equal(frame['time_ns'], [to_ns(_at(s)) for s in (2, 3, 4)])
+        assert index.count('keyboard', _at(2), _at(4)) == 3
+
+    def test_open_bounds_and_unparseable_times(self, session):
+        index = Session_Index(session)
+        assert index.query('keyboard')['key'].tolist() == ['a', ',', 'c', 'b', 'e']
+        assert index.count('keyboard', t1=_at(2)) == 2
+        assert index.count('keyboard', t0=_at(4.5)) == 1
+        assert index.time_range('keyboard') == (to_ns(_at(1)), to_ns(_at(5)))
+
+    def test_empty_range(self, session):
+        index = Session_Index(session)
+        assert index.count('keyboard', _at(6), _at(9)) == 0
+        assert index.query('keyboard', _at(4), _at(2)).empty
+
+    def test_relative_streams_on_the_session_timeline(self, session):
+        index = Session_Index(session)
+        np.testing.assert_array_equal(index.times('openface'), [to_ns(_at(s)) for s in (0.5, 1.5, 2.5)])
+        assert index.query('ocr', _at(1), _at(3))['text'].tolist() == ['line 2.0']
+        assert set(index.query_all(_at(1), _at(2))) == {'keyboard', 'ocr', 'openface'}
+
+    def test_persisted_and_refreshed_when_the_source_changes(self, session):
+        Session_Index(session)
+        assert os.path.exists(os.path.join(session, 'Index', 'manifest.json'))
+        with open(os.path.join(session, 'keyboard_log.csv'), 'a') as f:
+            f.write(f'{_at(6)},f,press\n')
+        assert Session_Index(session).query('keyboard', _at(6))['key'].tolist() == ['f']
+
+    def test_unknown_stream(self, session):
+        with pytest.raises(KeyError):
+            Session_Index(session).query('mouse')
+
+    def test_missing_session(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            Session_Index(str(tmp_path / SESSION))
@@ -0,0 +1,134 @@
+import os
+import sys
+import json
+import pytest
+from Model_Files.Resource_Governor import Resource_Governor
+from Model_Files.Stage_Scheduler import Stage, Stage_Scheduler, STATE_FILENAME
+
+
+# Stage targets run in their own process, so they live at module level and leave files behind
+
+
+def _touch(session, name):
+    with open(os.path.join(session, name), 'w'):
+        pass
+
+
+def extract(session):
+    _touch(session, 'extracted')
+
+
+def summarize(session):
+    # Fails unless the stage it depends on ran first
+    if not os.path.exists(os.path.join(session, 'extracted')):
+        sys.exit(2)
+    _touch(session, 'summarized')
+
+
+def crash(session):
+    sys.exit(1)
+
+
+def count_threads(session, threads):
+    _touch(session, f'threads_{threads.value if threads is not None else None}')
+
+
+def _sessions(tmp_path, count=2):
+    sessions = []
+    for i in range(count):
+        session = tmp_path / f'session_{i}'
+        session.mkdir()
+        sessions.append(str(session))
+    return sessions
+
+
+def _scheduler(tmp_path, stages, events=None, **kwargs):
+    return Stage_Scheduler(stages, str(tmp_path / STATE_FILENAME), max_workers=2,
+                           progress_callback=events.append if events is not None else None, **kwargs)
+
+
+class Test_Stage_Graph:
+
+    def test_unknown_dependency(self, tmp_path):
+        with pytest.raises(ValueError, match='unknown stage'):
+            _scheduler(tmp_path, [Stage('b', summarize, depends_on=['a'])])
+
+    def test_cycle(self, tmp_path):
+        with pytest.raises(ValueError, match='cycle'):
+            _scheduler(tmp_path, [Stage('a', extract, depends_on=['b']), Stage('b', summarize, depends_on=['a'])])
+
+
+class Test_Stage_Scheduler:
+
+    def test_dependencies_run_first(self, tmp_path):
+        sessions = _sessions(tmp_path)
+        events = []
+        # Declared out of order, so only the dependency keeps summarize waiting
+        timings = _scheduler(tmp_path, [Stage('summarize', summarize, depends_on=['extract']),
+                                        Stage('extract', extract, max_concurrency=2)], events).run(sessions)
+
+        assert timings['extract']['completed'] == 2 and timings['summarize']['completed'] == 2
+        for session in sessions:
+            name = os.path.basename(session)
+            order = [(e['status'], e['stage']) for e in events if e['session'] == name]
+            assert order.index(('completed', 'extract')) < order.index(('started', 'summarize'))
+            assert os.path.exists(os.path.join(session, 'summarized'))
+
+    def test_failure_skips_dependents_only(self, tmp_path):
+        sessions = _sessions(tmp_path, 1)
+        events = []
+        stages = [Stage('crash', crash), Stage('after_crash', extract, depends_on=['crash']),
+                  Stage('independent', summarize, depends_on=['extract']), Stage('extract', extract)]
+        timings = _scheduler(tmp_path, stages, events).run(sessions)
+
+        assert timings['crash']['failed'] == 1
+        assert timings['after_crash']['skipped'] == 1
+        assert timings['independent']['completed'] == 1
+        assert os.path.exists(os.path.join(sessions[0], 'summarized'))
+        skipped, = [e for e in events if e['status'] == 'skipped']
+        assert skipped['stage'] == 'after_crash' and skipped['reason'] == 'dependency failed'
+
+    def test_failure_propagates_transitively(self, tmp_path):
+        sessions = _sessions(tmp_path, 1)
+        stages = [Stage('crash', crash), Stage('b', extract, depends_on=['crash']),
+                  Stage('c', summarize, depends_on=['b'])]
+        timings = _scheduler(tmp_path, stages).run(sessions)
+        assert (timings['b']['skipped'], timings['c']['skipped']) == (1, 1)
+        assert os.listdir(sessions[0]) == []
+
+    def test_not_applicable_unblocks_dependents(self, tmp_path):
+        sessions = _sessions(tmp_path, 1)
+        stages = [Stage('crash', crash, applies_to=lambda session: False),
+                  Stage('extract', extract, depends_on=['crash'])]
+        timings = _scheduler(tmp_path, stages).run(sessions)
+        assert timings['crash'] == {'completed': 0, 'failed': 0, 'skipped': 0, 'total_s': 0.0, 'max_s': 0.0}
+        assert timings['extract']['completed'] == 1
+
+    def test_resumes_from_state(self, tmp_path):
+        sessions = _sessions(tmp_path, 1)
+        stages = [Stage('extract', extract), Stage('crash', crash, depends_on=['extract'])]
+        _scheduler(tmp_path, stages).run(sessions)
+
+        with open(tmp_path / STATE_FILENAME) as f:
+            state = json.load(f)
+        assert state['session_0::extract']['status'] == 'completed'
+        assert (state['session_0::crash']['status'], state['session_0::crash']['exitcode']) == ('failed', 1)
+
+        os.remove(os.path.join(sessions[0], 'extracted'))
+        events = []
+        timings = _scheduler(tmp_path, stages, events).run(sessions)
+        assert [(e['status'], e['stage']) for e in events][0] == ('resumed', 'extract')
+        assert timings['extract']['completed'] == 0 and timings['crash']['failed'] == 1
+        assert not os.path.exists(os.path.join(sessions[0], 'extracted'))
+
+        timings = _scheduler(tmp_path, stages).run(sessions, force=True)
+        assert timings['extract']['completed'] == 1
+
+    def test_thread_allowance(self, tmp_path):
+        sessions = _sessions(tmp_path, 1)
+        stages = [Stage('count', count_threads, takes_threads=True)]
+        _scheduler(tmp_path, stages, governor=Resource_Governor(total_cores=3)).run(sessions)
+        assert os.listdir(sessions[0]) == ['threads_3']
+
+        _scheduler(tmp_path, stages).run(sessions, force=True)
+        assert sorted(os.listdir(sessions[0])) == ['threads_3', 'threads_None']
@@ -0,0 +1,54 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from Recording_Module.Session_Replay import iter_replay_events
+from Benchmarks.Synthetic import write_synthetic_session
+
+
+def _write_logs(folder, keyboard_times, mouse_times):
+    os.makedirs(folder, exist_ok=True)
+    pd.DataFrame({'time': keyboard_times, 'key': 'a', 'event': 'press'}).to_csv(
+        os.path.join(folder, 'keyboard_log.csv'), index=False)
+    pd.DataFrame({'time': mouse_times, 'x': 1, 'y': 2, 'event': 'move'}).to_csv(
+        os.path.join(folder, 'mouse_log.csv'), index=False)
+
+
+class Test_Iter_Replay_Events:
+
+    @pytest.fixture
+    def session(self, tmp_path):
+        return write_synthetic_session(str(tmp_path), duration_s=20)
+
+    @pytest.mark.parametrize('chunk_rows', [1, 7, 100000])
+    def test_time_ordered_and_complete(self, session, chunk_rows):
+        events = list(iter_replay_events(session, chunk_rows=chunk_rows))
+        times = np.array([event.time_ns for event in events])
+        assert (np.diff(times) >= 0).all()
+
+        rows = {stream: len(pd.read_csv(os.path.join(session, f'{stream}_log.csv'))) for stream in ('keyboard', 'mouse')}
+        assert len(events) == sum(rows.values())
+        assert {stream: sum(event.stream == stream for event in events) for stream in rows} == rows
+
+    def test_chunk_size_does_not_change_the_stream(self, session):
+        assert list(iter_replay_events(session, chunk_rows=3)) == list(iter_replay_events(session))
+
+    @pytest.mark.parametrize('chunk_rows', [1, 2, 100])
+    def test_equal_times_keep_the_order_of_streams(self, tmp_path, chunk_rows):
+        times = ['2025-01-01 09:00:00', '2025-01-01 09:00:01', '2025-01-01 09:00:01', '2025-01-01 09:00:02']
+        _write_logs(str(tmp_path), times[:3], times[1:])
+
+        events = list(iter_replay_events(str(tmp_path), chunk_rows=chunk_rows))
+        assert [event.stream for event in events] == ['keyboard', 'keyboard', 'keyboard', 'mouse', 'mouse', 'mouse']
+
+        events = list(iter_replay_events(str(tmp_path), streams=('mouse', 'keyboard'), chunk_rows=chunk_rows))
+        assert [event.stream for event in events] == ['keyboard', 'mouse', 'mouse', 'keyboard', 'keyboard', 'mouse']
+
+    def test_fields_missing_from_a_log_are_none(self, tmp_path):
+        _write_logs(str(tmp_path), ['2025-01-01 09:00:00'], ['2025-01-01 09:00:01'])
+        keyboard, mouse = iter_replay_events(str(tmp_path))
+        assert (keyboard.key, keyboard.x, keyboard.button) == ('a', None, None)
+        assert (mouse.key, mouse.x, mouse.y) == (None, 1, 2)
+
+    def test_only_requested_streams(self, session):
+        assert {event.stream for event in iter_replay_events(session, streams=('keyboard',))} == {'keyboard'}
@@ -1,9 +1,9 @@
 import tkinter as tk
 import os
 import sys
+import threading
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from Recording_Module.Central_Data_Controller import Central_Data_Controller
 
 class BaseUI:
     """
@@ -25,10 +25,54 @@ class BaseUI:
             os.makedirs(self.default_data_dir)
         
         # Data-handling objects
-        self.central_data_controller = Central_Data_Controller()
+        self._central_data_controller = None
+        self._controller_lock = threading.Lock()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         
         # Setup status box first
         self._setup_status_box()
+
+        # The controller is built in the background once the first window is drawn
+        self.root.after_idle(self._prepare_controller)
+
+    @property
+    def central_data_controller(self):
+        # Usually ready by the first click; otherwise this waits for the background build, or
+        # builds it here, raising its error, if that failed
+        return self._build_controller()
+
+    def _prepare_controller(self):
+        # The recorders import cv2, mss, pyautogui, pandas and pynput, and the controller
+        # warms up the handler processes, which would freeze the window for seconds on the Tk thread
+        def build():
+            try:
+                self._build_controller()
+            except Exception as e:
+                print(f"Could not prepare the data controller: {e}")
+        threading.Thread(target=build, daemon=True).start()
+
+    def _build_controller(self):
+        with self._controller_lock:
+            if self._central_data_controller is None:
+                from Recording_Module.Central_Data_Controller import Central_Data_Controller
+                from Model_Files.Live_Segment_Processor import Live_Segment_Processor, recording_config
+                from Model_Files.Session_Catalog import add_saved_sessions
+
+                # The recorder knows nothing of the model; the app connects the two
+                config = recording_config()
+                self._central_data_controller = Central_Data_Controller(
+                    segment_seconds=config.get("segment_seconds"),
+                    live_processor_factory=Live_Segment_Processor if config.get("live_processing") else None,
+                    on_sessions_saved=add_saved_sessions,
+                    start_method=config.get("start_method"),
+                )
+        return self._central_data_controller
+
+    def _on_close(self):
+        # Handler processes end with the window instead of being left to interpreter exit
+        if self._central_data_controller is not None:
+            self._central_data_controller.shutdown()
+        self.root.destroy()
     
     def _setup_status_box(self):
         """
@@ -2,7 +2,7 @@ import tkinter as tk
 from tkinter import Checkbutton, BooleanVar, filedialog
 import os
 import time
-import threading
+import queue
 
 class DataUI:
     """
@@ -39,6 +39,13 @@ class DataUI:
         self.recording_start_time = None
         self.recording_timer_job = None
         self.recording_timer_label = None
+
+        # Progress events from the controller's control thread, shown on the Tk thread
+        self.control_events = queue.Queue()
+
+        # The start request of the current recording, which is all the Tk thread knows of
+        # it; the controller's own state is only changed on its control thread
+        self.recording_future = None
         
         self._setup_ui()
 
@@ -167,69 +174,109 @@ class DataUI:
         - Updates UI status and starts the recording timer
         - Handles any errors during the recording start process
         """
-        recording_modes_selected = False
-        
-        # Clear any previous handlers to avoid duplicates
-        self.app.central_data_controller.active_handlers = []
+        # Collected here and handed to the controller, which applies them on its control
+        # thread once any post-processing of the last recording is done with its handlers
+        handlers = []
         
         if self.record_keyboard_var.get():
-            self.app.central_data_controller.active_handlers.append('k')
-            recording_modes_selected = True
+            handlers.append('k')
         
         if self.record_mouse_var.get():
-            self.app.central_data_controller.active_handlers.append('m')
-            recording_modes_selected = True
+            handlers.append('m')
 
         if self.record_screen_var.get():
-            self.app.central_data_controller.active_handlers.append('s')
-            recording_modes_selected = True
+            handlers.append('s')
 
         if self.record_webcam_var.get():
-            self.app.central_data_controller.active_handlers.append('w')
-            recording_modes_selected = True
+            handlers.append('w')
 
-        if not recording_modes_selected:
+        if not handlers:
             self.app.update_status("No recording modes selected", "red")
             return
 
-        try:
-            self.app.update_status("Starting recording...", "orange")
-            self.parent_frame.update()  # Force UI update
-            
-            self.app.central_data_controller.start_recording()
-            self.app.update_status("Recording Started", "blue")
-            
-            # Start the timer
-            self._start_timer()
-            
-        except Exception as e:
-            self.app.update_status(f"Error: {str(e)}", "red")
-            print(f"Error in start_recording: {e}")
+        if self._recording_in_progress():
+            self.app.update_status("A recording is already in progress", "orange")
+            return
+
+        self.app.update_status("Starting recording...", "orange")
+
+        # Handlers start on the controller's control thread, the window stays responsive
+        self.app.central_data_controller.progress_callback = self.control_events.put
+        future = self.app.central_data_controller.start_recording_async(self.location_entry.get(), handlers)
+        self.recording_future = future
+        self._watch_control(future, lambda _: self._on_recording_started(future), "start_recording")
+
+    def _on_recording_started(self, future):
+        if future is not self.recording_future:
+            # Stopped before the handlers finished starting
+            return
+        self.app.update_status("Recording Started", "blue")
+        self._start_timer()
+
+    def _recording_in_progress(self):
+        # A start still queued or running counts, so a stop clicked meanwhile waits for it
+        future = self.recording_future
+        return future is not None and not (future.done() and future.exception() is not None)
     
     def _end_recording(self):
         """
         Stop all active recordings and save the recorded data.
         Updates the UI status and stops the recording timer.
         """
-        if len(self.app.central_data_controller.active_handlers) > 0:
+        if self._recording_in_progress():
             self.app.update_status("Processing recordings", "yellow")
-            self.app.central_data_controller.stop_recording(self.location_entry.get())
-            
+
             # Stop the timer
             self._stop_timer()
 
-            # Start processing in a background thread
-            threading.Thread(
-                target=self._run_post_processing_thread,
-                daemon=True
-            ).start()
+            # Handlers stop on the controller's control thread once the start request has
+            # finished, the window stays responsive
+            start_future, self.recording_future = self.recording_future, None
+            future = self.app.central_data_controller.stop_recording_async(self.location_entry.get(), after=start_future)
+            self._watch_control(future, self._on_recording_stopped, "stop_recording")
 
         else:
+            self.recording_future = None
             self.app.update_status("No recording was in progress", "orange")
-    
-    def _run_post_processing_thread(self):
-        self.app.central_data_controller._process_recordings()
-        self.parent_frame.after(0, lambda: self.app.update_status("Recording Ended", "green"))
+
+    def _on_recording_stopped(self, _):
+        future = self.app.central_data_controller.process_recordings_async()
+        self._watch_control(future, lambda _: self.app.update_status("Recording Ended", "green"), "process_recordings")
+
+    def _show_control_progress(self):
+        """
+        Show the latest recording control event sent by the controller.
+        """
+        event = None
+        while True:
+            try:
+                event = self.control_events.get_nowait()
+            except queue.Empty:
+                break
+        if event is not None and event['status'] != 'completed':
+            subject = event['handler'] or event.get('folder', '')
+            self.app.update_status(f"{event['step'].capitalize()}: {subject} {event['status']}", "yellow")
+
+    def _watch_control(self, future, on_success, name):
+        """
+        Poll a controller future from the Tk thread, showing progress until it finishes.
+
+        Args:
+            future (concurrent.futures.Future): Handle returned by the controller
+            on_success (callable): Called with the future's result on the Tk thread
+            name (str): Operation name for error messages
+        """
+        self._show_control_progress()
+        if not future.done():
+            self.parent_frame.after(100, self._watch_control, future, on_success, name)
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            self.app.update_status(f"Error: {str(e)}", "red")
+            print(f"Error in {name}: {e}")
+            return
+        on_success(result)
 
     def _start_timer(self):
         """
@@ -2,8 +2,8 @@ import tkinter as tk
 from tkinter import filedialog, BooleanVar, Checkbutton
 import os
 import multiprocessing
+import queue
 import json
-from Model_Files.Model import Model
 
 class ModelUI:
     """
@@ -173,9 +173,12 @@ class ModelUI:
             # Update status to show model creation is starting
             self.app.update_status("Creating Model", "#8A2BE2")  # Violet color
             
-            # Create model instance
+            # Create model instance; the model stack (torch, easyocr) is only imported when needed
+            from Model_Files.Model import Model
             model = Model()
             model.data_folder = data_folder
+            model.progress_queue = multiprocessing.Queue()
+            self.progress_queue = model.progress_queue
             
             # Create and start the process directly with generate_model
             process = multiprocessing.Process(target=model.generate_model)
@@ -233,11 +236,26 @@ class ModelUI:
             self.app.update_status(error_msg, "red")
             print(error_msg)
     
+    def _show_stage_progress(self):
+        """
+        Show the latest pipeline stage event sent by the model process.
+        """
+        event = None
+        while self.progress_queue is not None:
+            try:
+                event = self.progress_queue.get_nowait()
+            except queue.Empty:
+                break
+        if event is not None:
+            self.app.update_status(f"Creating Model: {event['stage']} {event['status']} for {event['session']}", "#8A2BE2")
+
     def _monitor_process_completion(self):
         """
-        Monitor the model creation process and update status when complete.
+        Monitor the model creation process, showing stage progress and
+        updating status when complete.
         """
         if hasattr(self, 'model_process') and self.model_process is not None:
+            self._show_stage_progress()
             if self.model_process.is_alive():
                 # Process is still running, check again in 1 second
                 self.parent_frame.after(1000, self._monitor_process_completion)
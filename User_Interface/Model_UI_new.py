@@ -2,9 +2,9 @@ import tkinter as tk
 from tkinter import filedialog, BooleanVar, Checkbutton
 import os
 import multiprocessing
+import queue
 import json
 from Base_UI import BaseUI
-from Model_Files.Model import Model
 
 class ModelUI(BaseUI):
     """
@@ -29,6 +29,7 @@ class ModelUI(BaseUI):
         
         # Initialize process reference
         self.model_process = None
+        self.progress_queue = None
         
         # Setup the UI
         self._setup_ui()
@@ -157,9 +158,12 @@ class ModelUI(BaseUI):
             # Update status to show model creation is starting
             self.update_status("Creating Model", "#8A2BE2")  # Violet color
             
-            # Create model instance
+            # Create model instance; the model stack (torch, easyocr) is only imported when needed
+            from Model_Files.Model import Model
             model = Model()
             model.data_folder = data_folder
+            model.progress_queue = multiprocessing.Queue()
+            self.progress_queue = model.progress_queue
             
             # Create and start the process directly with generate_model
             process = multiprocessing.Process(target=model.generate_model)
@@ -171,6 +175,9 @@ class ModelUI(BaseUI):
             # Store the process reference for later management
             self.model_process = process
             
+            # Monitor process completion
+            self._monitor_process_completion()
+            
         except Exception as e:
             # Handle any errors in the main thread
             error_msg = f"Error starting model creation: {str(e)}"
@@ -211,6 +218,39 @@ class ModelUI(BaseUI):
             self.update_status(error_msg, "red")
             print(error_msg)
 
+    def _show_stage_progress(self):
+        """
+        Show the latest pipeline stage event sent by the model process.
+        """
+        event = None
+        while self.progress_queue is not None:
+            try:
+                event = self.progress_queue.get_nowait()
+            except queue.Empty:
+                break
+        if event is not None:
+            self.update_status(f"Creating Model: {event['stage']} {event['status']} for {event['session']}", "#8A2BE2")
+
+    def _monitor_process_completion(self):
+        """
+        Monitor the model creation process, showing stage progress and
+        updating status when complete.
+        """
+        if hasattr(self, 'model_process') and self.model_process is not None:
+            self._show_stage_progress()
+            if self.model_process.is_alive():
+                # Process is still running, check again in 1 second
+                self.root.after(1000, self._monitor_process_completion)
+            else:
+                # Process has completed
+                if self.model_process.exitcode == 0:
+                    # Process completed successfully
+                    self.update_status("Model Created", "#00BFFF")  # Light blue/cyan color
+                else:
+                    # Process completed with error
+                    self.update_status("Model Creation Failed", "red")
+                print("Model generation process completed.")
+
 
 if __name__ == "__main__":
     """
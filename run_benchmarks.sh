@@ -0,0 +1,2 @@
+#!/bin/bash
+poetry run python Benchmarks/Run_Benchmarks.py "$@"
\ No newline at end of file
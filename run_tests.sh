@@ -17,6 +17,9 @@ print_help() {
     echo "                      screen_handler      - Tests the Screen Handler"
     echo "                      keyboard_handler    - Tests the Keyboard Handler"
     echo "                      mouse_handler       - Tests the Mouse Handler"
+    echo "                      session_replay      - Tests the Session Replay"
+    echo "                      model_files         - Tests the Model Files"
+    echo "                      processing_module   - Tests the Processing Module"
     echo ""
     echo "  -help               Show this help message"
     echo ""
@@ -77,6 +80,15 @@ while [ $i -le $# ]; do
                 mouse_handler)
                     poetry run python -m pytest Tests/Recording_Module/Recorders/Test_Keyboard_Mouse_Handler.py::Test_Mouse_Handler
                     ;;
+                session_replay)
+                    poetry run python -m pytest Tests/Recording_Module/Test_Session_Replay.py
+                    ;;
+                model_files)
+                    poetry run python -m pytest Tests/Model_Files/
+                    ;;
+                processing_module)
+                    poetry run python -m pytest Tests/Model_Files/Processing_Module/
+                    ;;
                 *)
                     echo "Error: Unknown option '$OPTION'"
                     print_help